@@ -1,12 +1,13 @@
 # backend/app/api/routes/catalog/brands.py
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.core.db import get_db
 from app.models.brand import Brand
 from app.models.perfume import Perfume
 from app.models.base import uuid_bytes_to_hex, uuid_hex_to_bytes
+from app.services.catalog.pagination import NEXT_CURSOR_HEADER, PERFUME_POPULAR, PERFUME_RECENT, page
 
 router = APIRouter(prefix="/catalog", tags=["Catalog"])
 
@@ -88,11 +89,13 @@ def get_brand(
 # ────────────────────────────────
 @router.get("/brands/{brand_id}/perfumes")
 def list_brand_perfumes(
+    response: Response,
     brand_id: str = Path(..., description="hex 형식 UUID"),
     gender: str | None = Query(None, description="men|women|unisex"),
     sort: str | None = Query("recent", description="정렬 기준 (popular|recent)"),
     limit: int = Query(30, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor (있으면 offset 무시)"),
     db: Session = Depends(get_db),
 ):
     try:
@@ -108,16 +111,15 @@ def list_brand_perfumes(
     if gender:
         qy = qy.filter(Perfume.gender == gender)
 
-    if sort == "popular":
-        qy = qy.order_by(
-            Perfume.view_count.desc(),
-            Perfume.wish_count.desc(),
-            Perfume.id.desc(),
-        )
-    else:  # recent
-        qy = qy.order_by(Perfume.created_at.desc(), Perfume.id.desc())
+    # (brand_id, 정렬 키...) 복합 인덱스로 브랜드 안에서 바로 범위 스캔
+    keyset = PERFUME_POPULAR if sort == "popular" else PERFUME_RECENT
+    qy = keyset.apply(qy, cursor)
+    if not cursor:
+        qy = qy.offset(offset)
 
-    items = qy.offset(offset).limit(limit).all()
+    items, has_more = page(qy.limit(limit + 1).all(), limit)
+    if has_more:
+        response.headers[NEXT_CURSOR_HEADER] = keyset.encode_row(items[-1])
     return [
         {
             "id": uuid_bytes_to_hex(p.id),
@@ -1,16 +1,19 @@
 # backend/app/api/routes/catalog/filters.py
 from __future__ import annotations
 from collections import Counter
-from typing import Iterable
+from typing import Iterable, Tuple
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
+from app.core.config import CatalogConfig
 from app.core.db import get_db
+from app.models.accord import Accord
+from app.models.note import Note
 from app.models.perfume import Perfume
 
 router = APIRouter(prefix="/catalog", tags=["Catalog"])
 
-def _iter_note_names(perf: Perfume) -> Iterable[str]:
+def _iter_note_names(perf) -> Iterable[str]:
     # general_notes: ["Lemon", ...]
     if perf.general_notes:
         for n in perf.general_notes:
@@ -31,42 +34,54 @@ def _iter_note_names(perf: Perfume) -> Iterable[str]:
     yield from extract(perf.middle_notes)
     yield from extract(perf.base_notes)
 
-def _iter_accords(perf: Perfume) -> Iterable[str]:
+def _iter_accords(perf) -> Iterable[str]:
     if perf.main_accords:
         for a in perf.main_accords:
             if isinstance(a, str) and a:
                 yield a
 
+def _top_occurrence(db: Session, model, q: str | None, limit: int):
+    """accord/note.occurrence (taxonomy 가 동기화 때 갱신) 인덱스 순서대로 상위 limit 개"""
+    qy = db.query(model.name, model.occurrence).filter(model.occurrence > 0)
+    if q:
+        qy = qy.filter(model.name.ilike(f"%{q}%"))
+    rows = qy.order_by(model.occurrence.desc(), model.name.asc()).limit(limit).all()
+    return [{"name": name, "occurrence": cnt} for name, cnt in rows]
+
+def _json_counts(db: Session, accords: bool, notes: bool) -> Tuple[Counter, Counter]:
+    """CATALOG_TAXONOMY_FILTERS=0 (백필 전) 용: 향수 JSON 컬럼을 전부 읽어 집계"""
+    acc_counter: Counter[str] = Counter()
+    note_counter: Counter[str] = Counter()
+    cols = [Perfume.id]
+    if accords:
+        cols.append(Perfume.main_accords)
+    if notes:
+        cols += [Perfume.general_notes, Perfume.top_notes, Perfume.middle_notes, Perfume.base_notes]
+    for perf in db.query(*cols):
+        # perf 는 컬럼 이름으로 접근하는 Row
+        if accords:
+            acc_counter.update(_iter_accords(perf))
+        if notes:
+            note_counter.update(_iter_note_names(perf))
+    return acc_counter, note_counter
+
+def _top_counts(counter: Counter, q: str | None, limit: int):
+    items = counter.most_common()
+    if q:
+        q_lower = q.lower()
+        items = [it for it in items if q_lower in it[0].lower()]
+    return [{"name": name, "occurrence": cnt} for name, cnt in items[:limit]]
+
 @router.get("/notes")
 def list_notes(
     q: str | None = Query(None, min_length=1, description="노트명 부분검색"),
     limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
-    """저장된 Perfume에서 노트 이름을 수집/집계해서 상위 노트 반환"""
-    notes_counter: Counter[str] = Counter()
-
-    for perf in db.query(Perfume.id, Perfume.general_notes, Perfume.top_notes,
-                         Perfume.middle_notes, Perfume.base_notes).all():
-        # perf는 named tuple 형태(컬럼 선택) -> dict 접근 불가, 필드명 접근
-        fake = Perfume()  # 간단히 컨테이너로만 사용
-        fake.general_notes = perf.general_notes
-        fake.top_notes = perf.top_notes
-        fake.middle_notes = perf.middle_notes
-        fake.base_notes = perf.base_notes
-        for name in _iter_note_names(fake):
-            notes_counter[name] += 1
-
-    items = notes_counter.most_common()
-    if q:
-        q_lower = q.lower()
-        items = [it for it in items if q_lower in it[0].lower()]
-
-    items = items[:limit]
-    return [
-        {"name": name, "occurrence": cnt}
-        for name, cnt in items
-    ]
+    """노트별 등장 횟수(note.occurrence) 상위 노트 반환"""
+    if CatalogConfig.TAXONOMY_FILTERS:
+        return _top_occurrence(db, Note, q, limit)
+    return _top_counts(_json_counts(db, accords=False, notes=True)[1], q, limit)
 
 @router.get("/accords")
 def list_accords(
@@ -74,60 +89,25 @@ def list_accords(
     limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
-    """저장된 Perfume에서 main_accords를 집계해서 상위 계열 반환"""
-    acc_counter: Counter[str] = Counter()
-
-    for perf in db.query(Perfume.id, Perfume.main_accords).all():
-        # perf.main_accords 는 ["sweet","floral",...] 형태
-        if perf.main_accords:
-            for a in perf.main_accords:
-                if isinstance(a, str) and a:
-                    acc_counter[a] += 1
-
-    items = acc_counter.most_common()
-    if q:
-        q_lower = q.lower()
-        items = [it for it in items if q_lower in it[0].lower()]
-
-    items = items[:limit]
-    return [
-        {"name": name, "occurrence": cnt}
-        for name, cnt in items
-    ]
+    """계열별 등장 횟수(accord.occurrence) 상위 계열 반환"""
+    if CatalogConfig.TAXONOMY_FILTERS:
+        return _top_occurrence(db, Accord, q, limit)
+    return _top_counts(_json_counts(db, accords=True, notes=False)[0], q, limit)
 
 @router.get("/filters/summary")
 def filters_summary(
     topk: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
 ):
-    """프론트 필터 화면에 쓸 요약치: 상위 accords, 상위 notes"""
-    acc_counter: Counter[str] = Counter()
-    note_counter: Counter[str] = Counter()
-
-    # 한 번에 필요한 컬럼만 조회
-    for perf in db.query(
-        Perfume.id, Perfume.main_accords, Perfume.general_notes,
-        Perfume.top_notes, Perfume.middle_notes, Perfume.base_notes
-    ).all():
-        # accords
-        if perf.main_accords:
-            for a in perf.main_accords:
-                if isinstance(a, str) and a:
-                    acc_counter[a] += 1
-
-        # notes
-        fake = Perfume()
-        fake.general_notes = perf.general_notes
-        fake.top_notes = perf.top_notes
-        fake.middle_notes = perf.middle_notes
-        fake.base_notes = perf.base_notes
-        for n in _iter_note_names(fake):
-            note_counter[n] += 1
-
-    top_accords = [{"name": n, "occurrence": c} for n, c in acc_counter.most_common(topk)]
-    top_notes = [{"name": n, "occurrence": c} for n, c in note_counter.most_common(topk)]
-
+    """프론트 필터 화면에 쓸 요약치: 상위 accords, 상위 notes (앱 실행마다 호출 → 인덱스 조회 두 번)"""
+    if CatalogConfig.TAXONOMY_FILTERS:
+        return {
+            "top_accords": _top_occurrence(db, Accord, None, topk),
+            "top_notes": _top_occurrence(db, Note, None, topk),
+        }
+
+    acc_counter, note_counter = _json_counts(db, accords=True, notes=True)
     return {
-        "top_accords": top_accords,
-        "top_notes": top_notes,
+        "top_accords": _top_counts(acc_counter, None, topk),
+        "top_notes": _top_counts(note_counter, None, topk),
     }
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import func
 from app.core.db import get_db
+from app.core.config import CatalogConfig
+from app.services.catalog.search_backend import SEARCH_CAPPED_HEADER, get_search_backend, match_perfumes, relevance_expr
+from app.services.catalog.fuzzy_index import get_fuzzy_backend
+from app.services.catalog.count_cache import CountCache, count_total, get_count_cache
+from app.services.catalog.taxonomy import accord_filters, note_filters
+from app.services.catalog.view_counter import get_view_counter
+from app.services.catalog.pagination import NEXT_CURSOR_HEADER, PERFUME_POPULAR, PERFUME_RECENT, page
 from app.models.perfume import Perfume
+from app.models.perfume_neighbor import PerfumeNeighbor
 from app.models.base import uuid_bytes_to_hex, uuid_hex_to_bytes, try_uuid_hex_to_bytes
 from app.models.recent_view import RecentView
 from app.api.deps import get_current_user_id, get_current_user_optional
@@ -70,28 +78,32 @@ def get_perfume(
             raise HTTPException(status_code=400, detail="invalid id format: hex uuid 또는 fragella_id 사용")
         raise HTTPException(status_code=404, detail="perfume not found")
 
-    if track_view:
-        p.view_count = int(p.view_count or 0) + 1
+    # 조회수는 write-behind 버퍼에 모았다가 주기적으로 일괄 반영 (services/catalog/view_counter)
+    #  → 인기 향수 행에 요청마다 잠금 걸리는 UPDATE 를 하지 않음. 응답에는 반영 전 증분을 더해서 보여줌
+    counter = get_view_counter()
+    pending_views = counter.add(p.id) if track_view else counter.pending(p.id)
 
-        if user_id_bytes:
-            existing_view = (
-                db.query(RecentView)
-                .filter(RecentView.user_id == user_id_bytes, RecentView.perfume_id == p.id)
-                .first()
-            )
+    if track_view and user_id_bytes:
+        existing_view = (
+            db.query(RecentView)
+            .filter(RecentView.user_id == user_id_bytes, RecentView.perfume_id == p.id)
+            .first()
+        )
 
-            if existing_view:
-                existing_view.viewed_at = datetime.now()
-            else:
-                db.add(RecentView(user_id=user_id_bytes, perfume_id=p.id))
+        if existing_view:
+            existing_view.viewed_at = datetime.now()
+        else:
+            db.add(RecentView(user_id=user_id_bytes, perfume_id=p.id))
 
         db.commit()
-        db.refresh(p)
 
-    return _serialize_perfume(p)
+    out = _serialize_perfume(p)
+    out["view_count"] = int(p.view_count or 0) + pending_views
+    return out
 
 @router.get("/perfumes")
 def list_perfumes(
+    response: Response,
     brand_id: str | None = Query(None, description="hex 형식 UUID"),
     gender: str | None = Query(None, description="men / women / unisex"),
     q: str | None = Query(None, min_length=2, description="이름/브랜드 검색"),
@@ -100,6 +112,7 @@ def list_perfumes(
     sort: str | None = Query(None, description="popular|recent"),
     limit: int = Query(30, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor (있으면 offset 무시)"),
     current_user: User | None = Depends(get_current_user_optional),
     db: Session = Depends(get_db),
 ):
@@ -109,33 +122,31 @@ def list_perfumes(
         query = query.filter(Perfume.brand_id == uuid_hex_to_bytes(brand_id))
     if gender:
         query = query.filter(Perfume.gender == gender)
+    capped = False
     if q:
-        like = f"%{q}%"
-        query = query.filter(or_(Perfume.name.ilike(like), Perfume.brand_name.ilike(like)))
-
-    # 어코드 필터
+        # 검색 일치 조건을 WHERE 에 두고 아래 keyset 정렬 그대로 (fulltext 는 상한 없음, search_backend 참고)
+        text = match_perfumes(get_search_backend(), db, q, with_scores=False)
+        if text.where is None:
+            return []
+        query = query.filter(text.where)
+        capped = text.capped
+
+    # 어코드/노트 필터: perfume_accord / perfume_note 인덱스 조회 (taxonomy 참고)
     if accords:
-        for acc in [a.strip() for a in accords.split(",") if a.strip()]:
-            query = query.filter(func.json_contains(Perfume.main_accords, f'["{acc}"]'))
-
-    # 노트 필터
+        query = query.filter(*accord_filters(accords.split(",")))
     if notes:
-        for nt in [n.strip() for n in notes.split(",") if n.strip()]:
-            query = query.filter(
-                or_(
-                    func.json_search(Perfume.top_notes, "one", nt) != None,
-                    func.json_search(Perfume.middle_notes, "one", nt) != None,
-                    func.json_search(Perfume.base_notes, "one", nt) != None,
-                    func.json_search(Perfume.general_notes, "one", nt) != None,
-                )
-            )
-
-    if sort == "popular":
-        query = query.order_by(Perfume.view_count.desc(), Perfume.wish_count.desc(), Perfume.id.desc())
-    else:
-        query = query.order_by(Perfume.created_at.desc(), Perfume.id.desc())
-
-    items = query.offset(offset).limit(limit).all()
+        query = query.filter(*note_filters(notes.split(",")))
+
+    keyset = PERFUME_POPULAR if sort == "popular" else PERFUME_RECENT
+    query = keyset.apply(query, cursor)
+    if not cursor:
+        query = query.offset(offset)
+
+    items, has_more = page(query.limit(limit + 1).all(), limit)
+    if has_more:
+        response.headers[NEXT_CURSOR_HEADER] = keyset.encode_row(items[-1])
+    if capped:
+        response.headers[SEARCH_CAPPED_HEADER] = "1"
     return [
         {
             "id": uuid_bytes_to_hex(p.id),
@@ -151,21 +162,8 @@ def list_perfumes(
 
 
 # ─────────────────────────────────────────
-# 유사 향수 추천 (간단한 교집합 기반)
+# 유사 향수 추천 (어코드/노트 Jaccard 가중합, services/catalog/similarity)
 # ─────────────────────────────────────────
-def _jaccard(a: list | None, b: list | None) -> float:
-    A = set(a or [])
-    B = set(b or [])
-    if not A and not B:
-        return 0.0
-    return len(A & B) / max(1, len(A | B))
-
-def _extract_note_names(notes: list | None) -> list[str]:
-    if not notes:
-        return []
-    # notes는 [{"name": "...", "imageUrl": "..."}, ...] 형태이므로 'name' 키 값만 추출
-    return [n.get("name") for n in notes if isinstance(n, dict) and n.get("name")]
-
 @router.get("/perfumes/{perfume_id}/similar")
 def similar_perfumes(
     perfume_id: str = Path(..., description="기준 향수 hex UUID"),
@@ -176,38 +174,25 @@ def similar_perfumes(
     if not base:
         raise HTTPException(404, "base perfume not found")
 
-    # 후보군: 같은 성별 우선, 최근/인기순 섞어서 상위 300개 정도에서 계산
-    candidates = (
-        db.query(Perfume)
-          .filter(Perfume.id != base.id)
-          .filter(Perfume.gender == base.gender if base.gender else True)
-          .order_by(Perfume.view_count.desc(), Perfume.created_at.desc())
-          .limit(300)
+    # 오프라인 배치(build_perfume_neighbors)가 전체 카탈로그에서 미리 구한 top-K: PK (perfume_id, rank) 조회 한 번
+    scored = (
+        db.query(PerfumeNeighbor.score, Perfume)
+          .join(Perfume, Perfume.id == PerfumeNeighbor.neighbor_id)
+          .filter(PerfumeNeighbor.perfume_id == base.id)
+          .order_by(PerfumeNeighbor.rank.asc())
+          .limit(limit)
           .all()
     )
+    if not scored:
+        # 배치 이후 추가된 향수: 인메모리 희소 행렬로 전체 카탈로그 대비 즉석 계산 (numpy/scipy 는 여기서 처음 import)
+        from app.services.catalog import similarity
+
+        hits = similarity.similar_on_demand(base, limit)
+        found = {p.id: p for p in db.query(Perfume).filter(Perfume.id.in_([pid for pid, _ in hits]))} if hits else {}
+        scored = [(score, found[pid]) for pid, score in hits if pid in found]
 
-    base_acc = base.main_accords or []
-    base_top = _extract_note_names(base.top_notes)
-    base_mid = _extract_note_names(base.middle_notes)
-    base_base = _extract_note_names(base.base_notes)
-    base_any = (base.general_notes or []) + base_top + base_mid + base_base
-
-    scored = []
-    for p in candidates:
-        p_top = _extract_note_names(p.top_notes)
-        p_any_notes = _extract_note_names(p.top_notes) + _extract_note_names(p.middle_notes) + _extract_note_names(p.base_notes)
-
-        s_acc = _jaccard(base_acc, p.main_accords)
-        s_top = _jaccard(base_top, p_top)
-        s_any = _jaccard(base_any, (p.general_notes or []) + p_any_notes)
-        score = 0.6 * s_acc + 0.2 * s_top + 0.2 * s_any
-        if score <= 0:
-            continue
-        scored.append((score, p))
-
-    scored.sort(key=lambda x: x[0], reverse=True)
     out = []
-    for score, p in scored[:limit]:
+    for score, p in scored:
         item = _serialize_perfume(p)
         item["similarity"] = round(float(score), 4)
         out.append(item)
@@ -219,17 +204,18 @@ def similar_perfumes(
 
 @router.get("/perfumes/popular")
 def popular_perfumes(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor (있으면 offset 무시)"),
     db: Session = Depends(get_db),
 ):
-    items = (
-        db.query(Perfume)
-          .order_by(Perfume.view_count.desc(), Perfume.wish_count.desc(), Perfume.id.desc())
-          .offset(offset)
-          .limit(limit)
-          .all()
-    )
+    query = PERFUME_POPULAR.apply(db.query(Perfume), cursor)
+    if not cursor:
+        query = query.offset(offset)
+    items, has_more = page(query.limit(limit + 1).all(), limit)
+    if has_more:
+        response.headers[NEXT_CURSOR_HEADER] = PERFUME_POPULAR.encode_row(items[-1])
     return [_serialize_perfume(p) for p in items]
 
 @router.get("/perfumes/search")
@@ -242,16 +228,37 @@ def search_perfumes(
     sort: str | None = Query("relevance", description="relevance|popular|recent"),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor (popular|recent 정렬, 있으면 offset 무시)"),
     include_total: bool = Query(False, description="총 개수 count() 포함 여부"),
+    approx: bool = Query(False, description="include_total 시 후보가 많으면 표본 추정 (total_exact=false)"),
+    fuzzy: bool = Query(False, description="오타 허용 검색"),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_id), # 💡 선택적 사용자 의존성 추가 (공개 접근 명시)
 ):
+    keyset = {"popular": PERFUME_POPULAR, "recent": PERFUME_RECENT}.get(sort)
+    if cursor and keyset is None:
+        # relevance 점수는 검색 결과(hits)에 따라 달라져 커서로 이어 붙일 수 없음 → offset 사용
+        raise HTTPException(status_code=400, detail="cursor는 sort=popular|recent 에서만 사용 가능")
+
     query = db.query(Perfume)
 
-    # 텍스트 필터
+    # 텍스트 필터: 검색 백엔드(FULLTEXT/BM25, fuzzy=true 면 오타 허용 인덱스) 일치 조건 안에서만 나머지 필터/정렬
+    # fulltext/bm25 는 일치 전체(상한 없음), fuzzy 는 점수 상위 SEARCH_MAX_HITS 개까지 (넘으면 hits_capped=true)
+    hits = []
+    hits_capped = False
     if q:
-        like = f"%{q}%"
-        query = query.filter(or_(Perfume.name.ilike(like), Perfume.brand_name.ilike(like)))
+        backend = get_fuzzy_backend() if fuzzy else get_search_backend()
+        text = match_perfumes(backend, db, q, with_scores=keyset is None)
+        if text.where is None:
+            return {
+                "total": 0 if include_total else None,
+                "total_exact": True if include_total else None,
+                "hits_capped": False,
+                "items": [],
+                "next_cursor": None,
+            }
+        query = query.filter(text.where)
+        hits, hits_capped = text.hits, text.capped
 
     # 브랜드 필터
     if brand_id:
@@ -261,36 +268,43 @@ def search_perfumes(
     if gender:
         query = query.filter(Perfume.gender == gender)
 
-    # 어코드 필터(JSON 배열에 요소 포함)
-    # MySQL: JSON_CONTAINS(main_accords, '["woody"]')
-    if accords:
-        for acc in [a.strip() for a in accords.split(",") if a.strip()]:
-            query = query.filter(func.json_contains(Perfume.main_accords, f'["{acc}"]'))
+    # 여기까지는 perfume 컬럼 조건, 아래 어코드/노트는 조인 테이블 서브쿼리 (근사 개수에서 구분)
+    base_query = query
+    accord_list = [a.strip() for a in (accords or "").split(",") if a.strip()]
+    note_list = [n.strip() for n in (notes or "").split(",") if n.strip()]
 
-    # 노트 필터(top/middle/base/general 중 하나라도 매칭)
-    # MySQL: JSON_SEARCH(path, 'one', 'Bergamot') IS NOT NULL
-    if notes:
-        for nt in [n.strip() for n in notes.split(",") if n.strip()]:
-            query = query.filter(
-                or_(
-                    func.json_search(Perfume.top_notes, 'one', nt) != None,
-                    func.json_search(Perfume.middle_notes, 'one', nt) != None,
-                    func.json_search(Perfume.base_notes, 'one', nt) != None,
-                    func.json_search(Perfume.general_notes, 'one', nt) != None,
-                )
+    # 어코드 필터: 모두 포함 / 노트 필터: 각 노트가 top/middle/base/general 중 어디든
+    # perfume_accord(accord_id, perfume_id), perfume_note(note_id, perfume_id) 인덱스 조회 (taxonomy 참고)
+    predicates = accord_filters(accord_list) + note_filters(note_list)
+    if predicates:
+        query = query.filter(*predicates)
+
+    total = total_exact = None
+    if include_total:
+        # 필터 조합별로 짧게 캐시 → 페이지를 넘길 때마다 count 하지 않음 (커서 조건/정렬 붙이기 전 전체 개수)
+        cache = get_count_cache()
+        key = CountCache.key(q=q, fuzzy=fuzzy, brand_id=brand_id, gender=gender, accords=accord_list, notes=note_list)
+        cached = cache.get(key, need_exact=not approx)
+        if cached is None:
+            cached = count_total(
+                base_query,
+                predicates,
+                approx=approx,
+                threshold=CatalogConfig.COUNT_APPROX_THRESHOLD,
+                sample_size=CatalogConfig.COUNT_SAMPLE_SIZE,
             )
+            cache.put(key, cached)
+        total, total_exact = cached
 
     # 정렬
-    if sort == "popular":
-        query = query.order_by(Perfume.view_count.desc(), Perfume.wish_count.desc(), Perfume.id.desc())
-    elif sort == "recent":
-        query = query.order_by(Perfume.created_at.desc(), Perfume.id.desc())
+    if keyset is not None:
+        query = keyset.apply(query, cursor)
     else:
         # relevance: 간단 가중치 점수(이름/브랜드 매치 + 인기 보정)
         if q:
+            # 백엔드 점수(0~10 정규화, 이름 일치 > 브랜드 일치) + 인기 보정
             score = (
-                func.if_(Perfume.name.ilike(f"%{q}%"), 10, 0) +
-                func.if_(Perfume.brand_name.ilike(f"%{q}%"), 5, 0) +
+                relevance_expr(Perfume.id, hits) +
                 func.least(Perfume.view_count, 100) * 0.01 +
                 func.least(Perfume.wish_count, 100) * 0.02
             )
@@ -301,14 +315,14 @@ def search_perfumes(
             )
         query = query.order_by(score.desc(), Perfume.created_at.desc(), Perfume.id.desc())
 
-    total = None
-    if include_total:
-        # count()는 비싸므로 요청 시에만 수행
-        total = query.count()
-
-    items = query.offset(offset).limit(limit).all()
+    if not cursor:
+        query = query.offset(offset)
+    items, has_more = page(query.limit(limit + 1).all(), limit)
     return {
         "total": total,
+        "total_exact": total_exact,
+        "hits_capped": hits_capped,
+        "next_cursor": keyset.encode_row(items[-1]) if has_more and keyset is not None else None,
         "items": [
             {
                 "id": uuid_bytes_to_hex(p.id),
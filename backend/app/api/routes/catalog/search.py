@@ -2,14 +2,18 @@
 from __future__ import annotations
 from typing import List, Tuple
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import func
 
 from app.core.db import get_db
 from app.models.perfume import Perfume
 from app.models.brand import Brand
 from app.models.base import uuid_bytes_to_hex
+from app.core.config import CatalogConfig
+from app.services.catalog.search_backend import SEARCH_CAPPED_HEADER, get_search_backend, match_perfumes
+from app.services.catalog.fuzzy_index import get_fuzzy_backend
+from app.services.catalog.suggest_index import get_suggest_index
 
 router = APIRouter(prefix="/catalog", tags=["Catalog"])
 
@@ -32,24 +36,26 @@ def _perfume_item(p: Perfume):
 
 @router.get("/search")
 def search_perfumes(
+    response: Response,
     q: str | None = Query(None, min_length=2, description="이름/브랜드명 부분검색"),
     gender: str | None = Query(None, description="men / women / unisex"),
     sort: str | None = Query("recent", description="recent | popular"),
     limit: int = Query(30, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    fuzzy: bool = Query(False, description="오타 허용 검색"),
     db: Session = Depends(get_db),
 ):
     query = db.query(Perfume)
 
     if q:
-        like = f"%{q}%"
-        # lower(...) like lower(...) 구현
-        query = query.filter(
-            or_(
-                func.lower(Perfume.name).like(func.lower(like)),
-                func.lower(Perfume.brand_name).like(func.lower(like)),
-            )
-        )
+        # 검색 백엔드(FULLTEXT/BM25) 일치 조건 안에서만 필터/정렬. fuzzy 는 상한이 있어 잘리면 헤더로 알림
+        backend = get_fuzzy_backend() if fuzzy else get_search_backend()
+        text = match_perfumes(backend, db, q, with_scores=False)
+        if text.where is None:
+            return []
+        query = query.filter(text.where)
+        if text.capped:
+            response.headers[SEARCH_CAPPED_HEADER] = "1"
     if gender:
         query = query.filter(Perfume.gender == gender)
 
@@ -101,51 +107,52 @@ def search_all(
     type: str = Query("all", regex="^(all|perfumes|brands)$"),
     gender: str | None = Query(None, description="men|women|unisex (향수 검색에만 적용)"),
     limit: int = Query(20, ge=1, le=50, description="총 반환 상한(엔티티별 분배)"),
+    fuzzy: bool = Query(False, description="오타 허용 검색 (점수 = 유사도)"),
     db: Session = Depends(get_db),
 ):
     perfumes_out: List[dict] = []
     brands_out: List[dict] = []
 
-    # 향수 후보
+    backend = get_fuzzy_backend() if fuzzy else get_search_backend()
+
+    # 향수 후보: 백엔드 점수순 id → 한 번에 조회
     if type in ("all", "perfumes"):
-        pq = (
-            db.query(Perfume)
-              .filter(
-                  or_(
-                      Perfume.name.ilike(f"%{q}%"),
-                      Perfume.brand_name.ilike(f"%{q}%"),
-                  )
-              )
-        )
-        if gender:
-            pq = pq.filter(Perfume.gender == gender)
-
-        perfume_candidates: List[Perfume] = (
-            pq.order_by(Perfume.view_count.desc(), Perfume.created_at.desc(), Perfume.id.desc())
-              .limit(min(200, limit * 5))
-              .all()
-        )
-        scored = [(_score_perfume(p, q), p) for p in perfume_candidates]
-        scored.sort(key=lambda x: x[0], reverse=True)
-        perfumes_out = [_perfume_item(p) | {"score": round(float(s), 3)} for s, p in scored[:limit]]
+        # 성별 필터는 조회 단계에서 걸리므로 그만큼 넉넉히 받아 둠
+        n_hits = CatalogConfig.SEARCH_MAX_HITS if gender else min(200, limit * 5)
+        rel = dict(backend.search_perfumes(db, q, n_hits))
+        perfume_candidates: List[Perfume] = []
+        if rel:
+            pq = db.query(Perfume).filter(Perfume.id.in_(list(rel)))
+            if gender:
+                pq = pq.filter(Perfume.gender == gender)
+            perfume_candidates = pq.all()
+        # fuzzy 모드는 부분 문자열 점수가 의미 없으므로 유사도(0~1)를 그대로 점수로 사용
+        scored = [(rel[p.id] if fuzzy else _score_perfume(p, q), rel[p.id], p) for p in perfume_candidates]
+        scored.sort(key=lambda x: (x[0], x[1], x[2].view_count or 0), reverse=True)
+        perfumes_out = [_perfume_item(p) | {"score": round(float(s), 3)} for s, _, p in scored[:limit]]
 
     # 브랜드 후보(+ 향수 수)
     if type in ("all", "brands"):
-        pc = (
-            db.query(Perfume.brand_id.label("bid"), func.count(Perfume.id).label("cnt"))
-              .group_by(Perfume.brand_id)
-              .subquery()
-        )
-        bq = (
-            db.query(Brand, func.coalesce(pc.c.cnt, 0).label("perfume_count"))
-              .outerjoin(pc, pc.c.bid == Brand.id)
-              .filter(Brand.name.ilike(f"%{q}%"))
-              .order_by(func.coalesce(pc.c.cnt, 0).desc(), Brand.name.asc())
-              .limit(min(100, limit * 3))
-              .all()
-        )
-        scored_b: List[Tuple[float, Brand, int]] = [(_score_brand(b, q), b, cnt) for (b, cnt) in bq]
-        scored_b.sort(key=lambda x: x[0], reverse=True)
+        rel_b = dict(backend.search_brands(db, q, min(100, limit * 3)))
+        bq = []
+        if rel_b:
+            brand_ids = list(rel_b)
+            pc = (
+                db.query(Perfume.brand_id.label("bid"), func.count(Perfume.id).label("cnt"))
+                  .filter(Perfume.brand_id.in_(brand_ids))
+                  .group_by(Perfume.brand_id)
+                  .subquery()
+            )
+            bq = (
+                db.query(Brand, func.coalesce(pc.c.cnt, 0).label("perfume_count"))
+                  .outerjoin(pc, pc.c.bid == Brand.id)
+                  .filter(Brand.id.in_(brand_ids))
+                  .all()
+            )
+        scored_b: List[Tuple[float, Brand, int]] = [
+            (rel_b[b.id] if fuzzy else _score_brand(b, q), b, cnt) for (b, cnt) in bq
+        ]
+        scored_b.sort(key=lambda x: (x[0], rel_b[x[1].id], x[2]), reverse=True)
         # all 모드면 perfumes와 균형을 위해 brands는 절반 정도만
         take_n = max(1, limit // 2 if type == "all" else limit)
         brands_out = [_brand_min(b, perfume_count=cnt) | {"score": round(float(s), 3)} for (s, b, cnt) in scored_b[:take_n]]
@@ -166,47 +173,7 @@ def search_all(
 def suggest(
     q: str = Query(..., min_length=2),
     limit: int = Query(8, ge=1, le=20),
-    db: Session = Depends(get_db),
 ):
-    # 향수명 후보: 이름별 그룹핑 후 인기/최신 순 정렬
-    pq_rows = (
-        db.query(
-            Perfume.name.label("name"),
-            func.max(Perfume.view_count).label("v"),
-            func.max(Perfume.created_at).label("c"),
-        )
-        .filter(Perfume.name.ilike(f"%{q}%"))
-        .group_by(Perfume.name)
-        .order_by(func.max(Perfume.view_count).desc(), func.max(Perfume.created_at).desc())
-        .limit(50)
-        .all()
-    )
-    perfume_names = [r.name for r in pq_rows]
-
-    # 브랜드명 후보: 단순 이름 매치
-    bq_rows = (
-        db.query(Brand.name.label("name"))
-        .filter(Brand.name.ilike(f"%{q}%"))
-        .order_by(Brand.name.asc())
-        .limit(50)
-        .all()
-    )
-    brand_names = [r.name for r in bq_rows]
-
-    def _score_text(s: str) -> float:
-        s_low = (s or "").lower()
-        q_low = q.lower()
-        if s_low.startswith(q_low):
-            return 1.0
-        if q_low in s_low:
-            return 0.6
-        return 0.0
-
-    candidates = [("perfume", n, _score_text(n)) for n in perfume_names] + \
-                 [("brand", n, _score_text(n)) for n in brand_names]
-
-    candidates.sort(key=lambda x: x[2], reverse=True)
-    items = [{"type": typ, "name": name, "score": round(float(sc), 3)}
-             for typ, name, sc in candidates[:limit]]
-
-    return {"q": q, "items": items}
\ No newline at end of file
+    # 인메모리 인덱스(향수명 + 브랜드명)에서 접두 일치 → 부분 일치, 각각 인기순. DB 조회 없음
+    items = get_suggest_index().lookup(q, limit)
+    return {"q": q, "items": items}
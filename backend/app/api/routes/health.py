@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from app.core.db import ping as db_ping
-from app.services.vision.detector import get_detector
+from app.services.vision.remote import vision_readiness
 from app.core.config import settings
 
 router = APIRouter(prefix="/api/v1", tags=["Health"])
@@ -8,11 +8,12 @@ router = APIRouter(prefix="/api/v1", tags=["Health"])
 @router.get("/health")
 def health():
     db_ok = db_ping()
-    detector = get_detector()
-    vision_ready = detector.ready()
+    # vision 은 상태만 확인 (지연 로딩 전이면 not_loaded, 워커 모드면 워커 ping). 여기서 모델을 올리지 않음
+    vision = vision_readiness()
+    vision_ok = vision["status"] in ("ready", "not_loaded")
     return {
-        "ok": bool(db_ok and vision_ready),
+        "ok": bool(db_ok and vision_ok),
         "app": {"name": settings.APP_NAME, "env": settings.APP_ENV},
         "db": {"ok": db_ok},
-        "vision": {"ready": vision_ready},
+        "vision": {"ready": vision["status"] == "ready", **vision},
     }
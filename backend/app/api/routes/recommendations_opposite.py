@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from typing import Dict, Any, List
 
-import random
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
@@ -41,44 +40,19 @@ def _normalize_pref_accords(raw: Any) -> Dict[str, float]:
 
 
 # -----------------------------------------
-# 헬퍼: accord 기반 유사도 (0 ~ 1)
+# 헬퍼: 간단 인기 점수 (0 ~ 1 근처, 전체 향수 벡터)
 # -----------------------------------------
-def _accord_similarity(
-    pref_accords: Dict[str, float],
-    perfume_accords: List[str] | None,
-) -> float:
-    """
-    아주 단순한 accord 기반 취향 유사도.
-    - pref_accords: {"citrus": 1.2, "woody": 0.8, ...}
-    - perfume_accords: ["citrus", "green", ...]
-    """
-    if not pref_accords or not perfume_accords:
-        return 0.0
-
-    accords_set = set(perfume_accords)
-    inter_weight = sum(
-        w for name, w in pref_accords.items() if name in accords_set
-    )
-    total_weight = sum(pref_accords.values()) or 1.0
-    return float(inter_weight / total_weight)
-
-
-# -----------------------------------------
-# 헬퍼: 간단 인기 점수 (0 ~ 1 근처)
-# -----------------------------------------
-def _popularity_score(p: Perfume) -> float:
-    v = float(p.view_count or 0)
-    w = float(p.wish_count or 0)
-    pc = float(p.purchase_count or 0)
+def _popularity_scores(m):
+    import numpy as np
 
     # 대략적인 스케일링 (상한선을 둬서 너무 큰 값은 잘라냄)
     raw = (
-        0.01 * min(v, 5000)
-        + 0.03 * min(w, 2000)
-        + 0.1 * min(pc, 500)
+        0.01 * np.minimum(m.view_count, 5000)
+        + 0.03 * np.minimum(m.wish_count, 2000)
+        + 0.1 * np.minimum(m.purchase_count, 500)
     )
     # 0~1 정도로 눌러주기
-    return float(max(0.0, min(1.0, raw / 5.0)))
+    return np.clip(raw / 5.0, 0.0, 1.0)
 
 
 # -----------------------------------------
@@ -115,51 +89,53 @@ def recommend_opposite_style(
             "items": [],
         }
 
-    # 3) 후보 향수 로딩 (너무 많으면 부담이니 적당히 자름)
-    candidates: List[Perfume] = (
-        db.query(Perfume)
-        .order_by(Perfume.view_count.desc(), Perfume.id.desc())
-        .limit(600)
-        .all()
-    )
+    # 3) 전체 카탈로그를 인메모리 특성 행렬로 한 번에 점수화
+    import numpy as np
 
-    scored: List[dict] = []
+    from app.services.catalog import similarity  # numpy/scipy 는 첫 호출 때 import
 
-    for p in candidates:
-        accords = p.main_accords or []
-        sim = _accord_similarity(pref_accords, accords)  # 0 ~ 1
-        distance = 1.0 - sim  # 0 ~ 1, 클수록 "반대"
+    m = similarity.get_feature_matrix()
 
-        # 사용자의 취향과 너무 비슷한 애들은 제외
-        if distance < 0.4:
-            continue
+    # 취향 유사도: Σ 겹친 선호 accords 가중치 / Σ 선호 가중치 (0 ~ 1)
+    sim = m.weighted_overlap("accord", pref_accords)
+    distance = 1.0 - sim  # 0 ~ 1, 클수록 "반대"
+
+    # 사용자의 취향과 너무 비슷한 애들은 제외
+    keep = distance >= 0.4
 
-        pop = _popularity_score(p)
+    pop = _popularity_scores(m)
 
-        # 랜덤성 조금 섞기
-        jitter = random.uniform(-0.05, 0.05)
+    # 랜덤성 조금 섞기
+    jitter = np.random.uniform(-0.05, 0.05, len(m))
 
-        final_score = 0.7 * distance + 0.3 * pop + jitter
-        final_score = float(max(0.0, min(1.0, final_score)))
+    final_score = np.clip(0.7 * distance + 0.3 * pop + jitter, 0.0, 1.0).round(3)
 
-        scored.append(
+    # 4) 점수 기준으로 상위 limit 개 → 해당 향수만 조회
+    top = m.top_k(final_score, limit, keep)
+    found = {
+        p.id: p
+        for p in db.query(Perfume).filter(Perfume.id.in_([m.ids[i] for i, _ in top]))
+    } if top else {}
+
+    items: List[dict] = []
+    for i, score in top:
+        p = found.get(m.ids[i])
+        if p is None:  # 행렬 빌드 이후 삭제된 향수
+            continue
+        items.append(
             {
                 "id": uuid_bytes_to_hex(p.id),
                 "name": p.name,
                 "brand_name": p.brand_name,
                 "image_url": p.image_url,
                 "gender": p.gender,
-                "similarity": round(float(sim), 3),
-                "distance": round(float(distance), 3),
-                "popularity": round(float(pop), 3),
-                "score": round(final_score, 3),
+                "similarity": round(float(sim[i]), 3),
+                "distance": round(float(distance[i]), 3),
+                "popularity": round(float(pop[i]), 3),
+                "score": round(float(score), 3),
             }
         )
 
-    # 4) 점수 기준으로 정렬 후 상위 limit 개
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    items = scored[:limit]
-
     return {
         "items": items,
     }
@@ -1,6 +1,7 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.db import get_db
@@ -23,11 +24,7 @@ from app.services.weather_service import (
     adjust_weights_by_temp,
 )
 from app.services.user_preference_service import get_or_build_user_preference
-from app.services.seasonal_recommendation_service import (
-    season_score_map,
-    calc_stability,
-    ADJACENT_MAP,
-)
+from app.services.seasonal_recommendation_service import ADJACENT_MAP
 
 router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 
@@ -35,23 +32,6 @@ router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 # ---------------------------------------------------------------------
 # 헬퍼 함수들
 # ---------------------------------------------------------------------
-def _parse_occasion_scores(occasion_ranking: Any) -> Dict[str, float]:
-    """
-    Perfume.occasion_ranking JSON -> {occasion_name: score} 맵으로 변환
-    """
-    if not occasion_ranking:
-        return {}
-
-    out: Dict[str, float] = {}
-    for item in occasion_ranking:
-        name = item.get("name")
-        score = item.get("score", 0.0)
-        if not name:
-            continue
-        out[name] = float(score or 0.0)
-    return out
-
-
 def _normalize_pref_accords(raw: Any) -> Dict[str, float]:
     """
     user_preference.preferred_accords 가
@@ -68,100 +48,95 @@ def _normalize_pref_accords(raw: Any) -> Dict[str, float]:
     return {}
 
 
-def _accord_similarity(
-    pref_accords: Dict[str, float],
-    perfume_accords: List[str] | None,
-) -> float:
-    """
-    아주 단순한 accord 기반 취향 유사도.
-    - pref_accords: {"citrus": 1.2, "woody": 0.8, ...}
-    - perfume_accords: ["citrus", "green", ...]
-    """
-    if not pref_accords or not perfume_accords:
-        return 0.0
-
-    accords_set = set(perfume_accords)
-    inter_weight = sum(
-        w for name, w in pref_accords.items() if name in accords_set
-    )
-    total_weight = sum(pref_accords.values()) or 1.0
-    return float(inter_weight / total_weight)
-
-
-def _calc_season_score(
-    season: str,
-    scores: Dict[str, float],
-    weight_override: Dict[str, float],
-) -> tuple[float, float, float, float]:
+def _season_scores(m, season: str, weight_override: Dict[str, float]):
     """
-    계절 점수 + 안정성 기반 score 계산
-    (기존 seasonal_recommendation_service 의 로직을 여기서 간략히 재사용)
+    계절 점수 + 안정성 기반 score (전체 향수 벡터)
+    (seasonal_recommendation_service 의 계산을 특성 행렬의 계절 열로 한 번에)
     """
     from app.services.seasonal_recommendation_service import SEASONS
 
     adj1, adj2 = ADJACENT_MAP[season]
-
-    current = scores.get(season, 0.0)
-    a1 = scores.get(adj1, 0.0)
-    a2 = scores.get(adj2, 0.0)
-    stability = calc_stability(scores)
+    col = {s: i for i, s in enumerate(SEASONS)}
 
     w = weight_override
-    base = (
-        current * w["current"]
-        + a1 * w["adj1"]
-        + a2 * w["adj2"]
-        + stability * w["stability"]
+    return (
+        m.season[:, col[season]] * w["current"]
+        + m.season[:, col[adj1]] * w["adj1"]
+        + m.season[:, col[adj2]] * w["adj2"]
+        + m.stability * w["stability"]
     )
 
-    return float(current), float(a1), float(stability), float(base)
 
-
-def _calc_weather_boost(
-    temp: float,
-    humidity: int,
-    accords: List[str] | None,
-) -> float:
+def _weather_boosts(m, temp: float, humidity: int):
     """
-    날씨 기반 보정값 (별도 점수가 아니라 보정용 weight)
-    대략 -0.2 ~ +0.2 범위에서 움직이도록 제한.
+    날씨 기반 보정값 (별도 점수가 아니라 보정용 weight, 전체 향수 벡터)
+    대략 -0.2 ~ +0.2 범위에서 움직이도록 제한 후 0 ~ 1 로 리스케일.
     """
-    if accords is None:
-        accords = []
-    acc_set = set(accords)
+    import numpy as np
 
-    boost = 0.0
+    boost = np.zeros(len(m))
+    has = lambda *names: m.has_any("accord", names)
 
     # 더운 날씨: 시원/상쾌 계열 ↑, 무거운/달달 계열 ↓
     if temp >= 26:
-        if {"citrus", "green", "aquatic"}.intersection(acc_set):
-            boost += 0.15
-        if {"amber", "sweet", "vanilla", "spicy"}.intersection(acc_set):
-            boost -= 0.10
+        boost += 0.15 * has("citrus", "green", "aquatic")
+        boost -= 0.10 * has("amber", "sweet", "vanilla", "spicy")
 
     # 추운 날씨: 우디/앰버/스파이시 계열 ↑, 너무 상큼한 계열 ↓
     elif temp <= 8:
-        if {"amber", "woody", "spicy", "vanilla"}.intersection(acc_set):
-            boost += 0.15
-        if {"citrus", "green", "aquatic"}.intersection(acc_set):
-            boost -= 0.05
+        boost += 0.15 * has("amber", "woody", "spicy", "vanilla")
+        boost -= 0.05 * has("citrus", "green", "aquatic")
 
     # 습도 높을 때: 너무 달달/파우더리 ↓, 깨끗/시트러스 ↑
     if humidity >= 70:
-        if {"citrus", "green"}.intersection(acc_set):
-            boost += 0.05
-        if {"sweet", "gourmand", "powdery"}.intersection(acc_set):
-            boost -= 0.05
+        boost += 0.05 * has("citrus", "green")
+        boost -= 0.05 * has("sweet", "gourmand", "powdery")
 
-    # 안전 범위로 클램핑
-    if boost > 0.2:
-        boost = 0.2
-    if boost < -0.2:
-        boost = -0.2
+    # 안전 범위로 클램핑 후 -0.2 ~ +0.2 -> 0 ~ 1 로 리스케일
+    return (np.clip(boost, -0.2, 0.2) + 0.2) / 0.4
 
-    # -0.2 ~ +0.2 -> 0 ~ 1 로 리스케일
-    normalized = (boost + 0.2) / 0.4
-    return float(normalized)
+
+def _score_today(
+    season: str,
+    weight_override: Dict[str, float],
+    occasion: str,
+    pref_accords_map: Dict[str, float],
+    temp: float,
+    humidity: int,
+    limit: int,
+) -> List[Tuple[bytes, float]]:
+    """
+    전체 카탈로그를 인메모리 특성 행렬(services/catalog/similarity)로 한 번에 점수화 → 상위 limit 개 (id, 점수).
+    첫 호출은 행렬 빌드(카탈로그 전체 로딩)까지 하므로 라우트에서 스레드풀로 호출
+    """
+    from app.services.catalog import similarity  # numpy/scipy 는 첫 호출 때 import
+
+    m = similarity.get_feature_matrix()
+
+    # 계절 점수
+    season_score = _season_scores(m, season, weight_override)
+
+    # 상황 점수
+    occasion_score = m.occasion.get(occasion, 0.0)
+
+    # 취향 유사도 (비로그인 = 0): Σ 겹친 선호 accords 가중치 / Σ 선호 가중치
+    pref_sim = m.weighted_overlap("accord", pref_accords_map) if pref_accords_map else 0.0
+
+    # 날씨 보정 점수
+    weather_boost = _weather_boosts(m, temp=temp, humidity=humidity)
+
+    # 최종 점수
+    #   - 로그인 유저: pref_sim 이 0~1
+    #   - 비로그인 유저: pref_sim = 0 이라서 자연스럽게 "사용자 선호도 비중 제외"
+    final_score = (
+        0.55 * pref_sim
+        + 0.25 * season_score
+        + 0.15 * occasion_score
+        + 0.05 * weather_boost
+    ).round(3)
+
+    # 점수 기준 내림차순 상위 limit 개 (동점은 인기순)
+    return [(m.ids[i], score) for i, score in m.top_k(final_score, limit)]
 
 
 # ---------------------------------------------------------------------
@@ -207,70 +182,30 @@ async def recommend_today(
     if user_pref is not None and getattr(user_pref, "preferred_accords", None):
         pref_accords_map = _normalize_pref_accords(user_pref.preferred_accords)
 
-    # 5. 추천 후보 향수 로딩 (너무 많으면 부담이니 상위 N개만)
-    #    정렬 기준은 아무거나 가능. 여기서는 일단 인기순 + id 역순.
-    candidates: List[Perfume] = (
-        db.query(Perfume)
-        .order_by(Perfume.view_count.desc(), Perfume.id.desc())
-        .limit(400)
-        .all()
+    # 5~6. 전체 카탈로그 점수화 + 상위 limit 개 (행렬 빌드/numpy 연산이라 이벤트 루프 밖 스레드에서)
+    top = await run_in_threadpool(
+        _score_today, season, weight_override, occasion, pref_accords_map, temp, humidity, limit
     )
-
-    results: List[Dict[str, Any]] = []
-
-    for p in candidates:
-        # 5-1. 계절 점수
-        season_scores = season_score_map(p.season_ranking)
-        _, _, stability, season_score = _calc_season_score(
-            season,
-            season_scores,
-            weight_override,
-        )
-
-        # 5-2. 상황 점수
-        occ_scores = _parse_occasion_scores(p.occasion_ranking)
-        occasion_score = occ_scores.get(occasion, 0.0)
-
-        # 5-3. 취향 유사도 (비로그인 = 0)
-        pref_sim = 0.0
-        if pref_accords_map:
-            pref_sim = _accord_similarity(
-                pref_accords_map,
-                p.main_accords or [],
-            )
-
-        # 5-4. 날씨 보정 점수
-        weather_boost = _calc_weather_boost(
-            temp=temp,
-            humidity=humidity,
-            accords=p.main_accords or [],
-        )
-
-        # 5-5. 최종 점수 계산
-        #   - 로그인 유저: pref_sim 이 0~1
-        #   - 비로그인 유저: pref_sim = 0 이라서 자연스럽게 "사용자 선호도 비중 제외"
-        final_score = (
-            0.55 * pref_sim
-            + 0.25 * float(season_score)
-            + 0.15 * float(occasion_score)
-            + 0.05 * float(weather_boost)
-        )
-
-        results.append(
+    found = {
+        p.id: p
+        for p in db.query(Perfume).filter(Perfume.id.in_([pid for pid, _ in top]))
+    } if top else {}
+    items: List[Dict[str, Any]] = []
+    for pid, score in top:
+        p = found.get(pid)
+        if p is None:  # 행렬 빌드 이후 삭제된 향수
+            continue
+        items.append(
             {
                 "id": uuid_bytes_to_hex(p.id),
                 "name": p.name,
                 "brand_name": p.brand_name,
                 "image_url": p.image_url,
                 "gender": p.gender,
-                "score": round(float(final_score), 3),
+                "score": round(float(score), 3),
             }
         )
 
-    # 6. 점수 기준 내림차순 정렬 후 limit 만큼 잘라내기
-    results.sort(key=lambda x: x["score"], reverse=True)
-    items = results[:limit]
-
     # 7. 응답
     return {
         "context": {
@@ -11,6 +11,7 @@ from sqlalchemy import func
 from app.core.db import get_db
 from app.models.perfume import Perfume
 from app.models.base import uuid_bytes_to_hex
+from app.services.catalog.pagination import Keyset, page
 
 router = APIRouter(
     prefix="/recommendations",
@@ -30,10 +31,20 @@ def _trending_score_expr():
     )
 
 
+# 점수는 정수 카운터의 DECIMAL 가중합이라 커서에 문자열로 넣었다 돌려받아도 정확히 같은 값으로 비교됨
+_TRENDING = Keyset(
+    "trending",
+    (_trending_score_expr(), "dec"),
+    (Perfume.created_at, "dt"),
+    (Perfume.id, "uuid"),
+)
+
+
 @router.get("/trending")
 def get_trending_perfumes(
     limit: int = Query(20, ge=1, le=50),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor (있으면 offset 무시)"),
     db: Session = Depends(get_db),
 ):
     """
@@ -45,13 +56,10 @@ def get_trending_perfumes(
     score_expr = _trending_score_expr().label("trending_score")
 
     # Perfume + 계산된 trending_score 같이 조회
-    rows = (
-        db.query(Perfume, score_expr)
-        .order_by(score_expr.desc(), Perfume.created_at.desc(), Perfume.id.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
+    query = _TRENDING.apply(db.query(Perfume, score_expr), cursor)
+    if not cursor:
+        query = query.offset(offset)
+    rows, has_more = page(query.limit(limit + 1).all(), limit)
 
     items: list[Dict[str, Any]] = []
     for p, s in rows:
@@ -69,4 +77,9 @@ def get_trending_perfumes(
             }
         )
 
-    return {"items": items}
+    next_cursor = None
+    if has_more:
+        p, s = rows[-1]
+        next_cursor = _TRENDING.encode([s, p.created_at, p.id])
+
+    return {"items": items, "next_cursor": next_cursor}
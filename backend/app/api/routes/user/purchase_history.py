@@ -1,6 +1,6 @@
 # backend/app/api/routes/user/purchase_history.py
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session, joinedload
 from datetime import datetime
 
@@ -10,9 +10,13 @@ from app.models.perfume import Perfume
 from app.models.user import User
 from app.models.base import uuid_hex_to_bytes, uuid_bytes_to_hex
 from app.api.deps import get_current_user_id
+from app.services.catalog.pagination import NEXT_CURSOR_HEADER, Keyset, page
 
 router = APIRouter(tags=["User"])
 
+# 최근 추가순. (user_id, created_at, id) 인덱스로 사용자별 범위 스캔
+_PURCHASES = Keyset("recent", (PurchaseHistory.created_at, "dt"), (PurchaseHistory.id, "int"))
+
 
 def _serialize_purchase(row: PurchaseHistory):
     p = row.perfume
@@ -32,21 +36,27 @@ def _serialize_purchase(row: PurchaseHistory):
 
 @router.get("/purchase-history")
 def get_purchase_history(
+    response: Response,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor (있으면 offset 무시)"),
     uid: User = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     if uid is None:
         raise HTTPException(401, "Authentication required")
 
-    rows = (
+    query = (
         db.query(PurchaseHistory)
         .options(joinedload(PurchaseHistory.perfume))
         .filter(PurchaseHistory.user_id == uid.id)
-        .order_by(PurchaseHistory.created_at.desc())
-        .offset(offset).limit(limit).all()
     )
+    query = _PURCHASES.apply(query, cursor)
+    if not cursor:
+        query = query.offset(offset)
+    rows, has_more = page(query.limit(limit + 1).all(), limit)
+    if has_more:
+        response.headers[NEXT_CURSOR_HEADER] = _PURCHASES.encode_row(rows[-1])
 
     results = [r for r in [_serialize_purchase(x) for x in rows] if r is not None]
     return results
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session, joinedload
 from app.core.db import get_db
 from app.models.wishlist import Wishlist
@@ -7,10 +7,14 @@ from app.models.perfume import Perfume
 from app.models.user import User
 from app.models.base import uuid_hex_to_bytes, uuid_bytes_to_hex
 from app.api.deps import get_current_user_id
+from app.services.catalog.pagination import NEXT_CURSOR_HEADER, Keyset, page
 from datetime import datetime
 
 router = APIRouter(tags=["User"])
 
+# 최근 추가순. (user_id, created_at, id) 인덱스로 사용자별 범위 스캔
+_WISHLIST = Keyset("recent", (Wishlist.created_at, "dt"), (Wishlist.id, "int"))
+
 def _serialize_perfume_for_wishlist(w: Wishlist):
     """Wishlist 항목을 직렬화하며 Perfume 정보를 포함합니다."""
     p = w.perfume
@@ -30,8 +34,10 @@ def _serialize_perfume_for_wishlist(w: Wishlist):
 
 @router.get("/wishlist")
 def get_wishlist(
+    response: Response,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor (있으면 offset 무시)"),
     uid: User = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
@@ -40,13 +46,17 @@ def get_wishlist(
 
     user_id_to_filter = uid.id 
 
-    rows = (
+    query = (
         db.query(Wishlist)
         .options(joinedload(Wishlist.perfume))
         .filter(Wishlist.user_id == user_id_to_filter)
-        .order_by(Wishlist.created_at.desc())
-        .offset(offset).limit(limit).all()
     )
+    query = _WISHLIST.apply(query, cursor)
+    if not cursor:
+        query = query.offset(offset)
+    rows, has_more = page(query.limit(limit + 1).all(), limit)
+    if has_more:
+        response.headers[NEXT_CURSOR_HEADER] = _WISHLIST.encode_row(rows[-1])
     
     results = [w for w in [_serialize_perfume_for_wishlist(r) for r in rows] if w is not None]
     return results
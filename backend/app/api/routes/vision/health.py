@@ -1,14 +1,19 @@
 from fastapi import APIRouter
-from app.services.vision.detector import get_detector
+from app.services.vision.remote import vision_readiness
 from app.core.config import VisionConfig
 
 router = APIRouter()
 
 @router.get("/api/v1/vision/health")
 def vision_health():
+    # 상태만 확인 (in-process 는 첫 스캔 때 로드, 워커 모드는 워커 ping). 여기서 모델을 올리지 않음
+    vision = vision_readiness()
+    ready = vision["status"] == "ready"
     return {
-        "status": "ok" if detector.ready() else "warming_up",
+        "status": "ok" if ready else "warming_up",
+        "mode": vision["mode"],
+        "detail": vision["status"],
         "device": VisionConfig.DEVICE,
-        "model_loaded": detector.ready(),
+        "model_loaded": ready,
         "ocr_ready": True  # 7단계에서 실제 OCR 준비 상태로 교체
     }
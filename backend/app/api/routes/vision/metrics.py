@@ -0,0 +1,26 @@
+# backend/app/api/routes/vision/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.services.vision.errors import ScanError
+from app.services.vision.metrics import render_prometheus
+from app.services.vision.remote import get_vision_client
+
+router = APIRouter(tags=["vision"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def vision_metrics():
+    """
+    Vision 파이프라인 메트릭 (Prometheus text format).
+    시리즈마다 process="api"|"worker" 라벨. 워커 모드면 워커 시리즈를 같은 메트릭 블록에 합침
+    """
+    worker = None
+    client = get_vision_client()
+    if client is not None:
+        try:
+            worker = client.metric_samples()
+        except ScanError:
+            pass
+    text = render_prometheus("api", worker)
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
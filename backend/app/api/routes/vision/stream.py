@@ -0,0 +1,141 @@
+# backend/app/api/routes/vision/stream.py
+"""
+WebSocket 스캔 세션: WS /api/v1/vision/scan/ws
+
+클라이언트 → 서버
+- 텍스트(JSON): 세션 설정 {"guide_box": {...}, "user_query": "...", "deadline_ms": 1500} (언제든 갱신 가능)
+- 바이너리: 카메라 프레임 (JPEG/PNG 바이트)
+
+서버 → 클라이언트
+- {"type": "frame", "seq": n, "result": {...}, "session": {...}}  프레임별 결과 (/vision/scan 응답과 동일 구조)
+- {"type": "busy"} / {"type": "error", "error": {...}}              해당 프레임은 버려짐
+- {"type": "result", "final": {...}, "session": {...}}              합의 도달 → 세션 종료
+
+처리가 밀리면 아직 처리 안 된 프레임은 가장 최신 것 하나만 남기고 버린다.
+전송은 수신 태스크/처리 루프가 함께 하므로 send_lock 으로 직렬화.
+
+vision 워커 모드(VISION_WORKER_SOCKET)에서는 세션 상태(추적/투표)를 워커로 넘길 수 없어 지원하지 않음:
+{"type": "error", "error": {"code": "UNSUPPORTED_IN_WORKER_MODE"}} 후 close code 4501
+(API 프로세스에 cv2/YOLO/Tesseract 를 올리지 않도록 in-process 파이프라인으로 대신 돌리지 않음)
+"""
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.core.config import VisionConfig
+from app.services.vision.executor import get_scan_executor, ScanQueueFull
+from app.services.vision.errors import ScanError
+from app.services.vision.lazy import run_scan, session as vision_session
+from app.services.vision.remote import get_vision_client
+from app.services.vision.recognition_log import get_recognition_log_writer, build_record
+
+router = APIRouter(tags=["vision"])
+
+_MAGIC = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n")
+_CLOSE_UNSUPPORTED = 4501
+
+
+@router.websocket("/scan/ws")
+async def scan_ws(ws: WebSocket):
+    await ws.accept()
+    if get_vision_client() is not None:
+        await ws.send_json(
+            {
+                "type": "error",
+                "error": {"code": "UNSUPPORTED_IN_WORKER_MODE", "message": "Use POST /vision/scan in worker mode"},
+            }
+        )
+        await ws.close(code=_CLOSE_UNSUPPORTED)
+        return
+
+    send_lock = asyncio.Lock()
+
+    async def send(msg):
+        async with send_lock:
+            await ws.send_json(msg)
+
+    session = vision_session.new_session()
+    mailbox = {"frame": None, "closed": False}
+    wake = asyncio.Event()
+
+    async def receiver():
+        try:
+            while True:
+                msg = await ws.receive()
+                if msg["type"] == "websocket.disconnect":
+                    break
+                data = msg.get("bytes")
+                if data is not None:
+                    if len(data) > VisionConfig.MAX_IMAGE_BYTES or not data.startswith(_MAGIC):
+                        await send(
+                            {"type": "error", "error": {"code": "INVALID_FILE", "message": "JPEG/PNG ≤ MAX_IMAGE_BYTES"}}
+                        )
+                        continue
+                    if mailbox["frame"] is not None:
+                        session.dropped += 1  # 처리 못 한 이전 프레임은 버림
+                    mailbox["frame"] = data
+                    wake.set()
+                elif msg.get("text"):
+                    try:
+                        session.configure(json.loads(msg["text"]))
+                    except Exception:
+                        await send(
+                            {"type": "error", "error": {"code": "INVALID_MESSAGE", "message": "JSON expected"}}
+                        )
+        except WebSocketDisconnect:
+            pass
+        finally:
+            mailbox["closed"] = True
+            wake.set()
+
+    recv_task = asyncio.create_task(receiver())
+    seq = 0
+    try:
+        while True:
+            await wake.wait()
+            wake.clear()
+            frame, mailbox["frame"] = mailbox["frame"], None
+            if frame is None:
+                if mailbox["closed"]:
+                    break
+                continue
+
+            seq += 1
+            t0 = time.time()
+            deadline_ms = session.deadline_ms if session.deadline_ms is not None else VisionConfig.SCAN_DEADLINE_MS
+            try:
+                queue_ms, result = await get_scan_executor().run(
+                    run_scan,
+                    frame,
+                    session.guide_box,
+                    session.user_query,
+                    f"ws-{seq}",
+                    deadline_ms,
+                    t0,
+                    session,
+                )
+            except ScanQueueFull:
+                await send({"type": "busy", "seq": seq})
+                continue
+            except ScanError as e:
+                await send({"type": "error", "seq": seq, "error": {"code": e.code, "message": e.message}})
+                continue
+
+            result["timing"]["queue_ms"] = queue_ms
+            result["timing"]["total_ms"] = int((time.time() - t0) * 1000)
+            final = session.vote(result)
+            await send({"type": "frame", "seq": seq, "result": result, "session": session.summary()})
+
+            if final is not None:
+                if VisionConfig.RECOG_LOG_ENABLED:
+                    get_recognition_log_writer().enqueue(build_record(result))
+                await send({"type": "result", "final": final, "session": session.summary()})
+                async with send_lock:
+                    await ws.close()
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        recv_task.cancel()
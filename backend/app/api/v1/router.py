@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 from app.api.routes.vision.scan import router as vision_router
 from app.api.routes.vision.health import router as vision_health_router
+from app.api.routes.vision.stream import router as vision_stream_router
+from app.api.routes.vision.metrics import router as vision_metrics_router
 from app.api.routes.health import router as health_router
 from app.api.routes.catalog.brands import router as brands_router
 from app.api.routes.catalog.perfumes import router as perfumes_router
@@ -24,6 +26,8 @@ api_v1 = APIRouter()
 api_v1.include_router(health_router)
 api_v1.include_router(vision_health_router, prefix="/vision", tags=["Vision"])
 api_v1.include_router(vision_router, prefix="/vision", tags=["Vision"])
+api_v1.include_router(vision_stream_router, prefix="/vision", tags=["Vision"])
+api_v1.include_router(vision_metrics_router, prefix="/vision", tags=["Vision"])
 
 # Catalog
 api_v1.include_router(brands_router, tags=["Catalog"])
@@ -57,10 +57,76 @@ class VisionConfig:
 
     # 품질 임계(경험치, 필요시 조정)
     MIN_BLUR = float(os.getenv("MIN_BLUR", "30.0"))
+    # MIN_BLUR 는 원본 해상도 기준. 축소 디코드(1/f) 이미지의 Laplacian 분산은 대략 f^지수 배로 커지므로
+    # 품질 blur 값을 f^지수 로 나눠 원본 기준으로 맞춤 (흐린 영상은 최대 f^4, 선명한 영상은 그보다 작게 커짐)
+    BLUR_SCALE_EXP = float(os.getenv("VISION_BLUR_SCALE_EXP", "2.0"))
     MIN_BRIGHTNESS = float(os.getenv("MIN_BRIGHTNESS", "0.15"))
 
     MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", "3000000"))
+
+    # letterbox 리사이즈 보간 방식 (nearest | linear | cubic | area)
+    LETTERBOX_INTERP = os.getenv("VISION_LETTERBOX_INTERP", "cubic")
+
+    # JPEG 축소 디코드: 긴 변이 이 값 이상 남는 범위에서 1/2, 1/4, 1/8 로 디코드 (0 = 끔)
+    DECODE_TARGET_SIDE = int(os.getenv("VISION_DECODE_TARGET_SIDE", "1280"))
+    # 축소 이미지에서 OCR ROI 높이가 이 값보다 작으면 원본 해상도로 다시 디코드해서 OCR
+    # 기본값은 DECODE_TARGET_SIDE 의 40% (축소 이미지 긴 변이 target 이상이라 보통 ROI 는 이보다 큼 → 재디코드 드묾)
+    # 재디코드 비율: vision_path_total{path="ocr_full_decode"} / {path="ocr_reduced"}
+    OCR_MIN_ROI_PX = int(os.getenv("VISION_OCR_MIN_ROI_PX", str(int(DECODE_TARGET_SIDE * 0.4))))
+    # OCR 토큰 정리: 이 IoU 이상 겹치는 박스는 중복으로 보고 하나만 / 같은 줄로 묶을 y 중심 허용오차(정규화)
+    OCR_DEDUP_IOU = float(os.getenv("VISION_OCR_DEDUP_IOU", "0.5"))
+    OCR_LINE_TOL = float(os.getenv("VISION_OCR_LINE_TOL", "0.02"))
+
+    # 스캔 파이프라인 executor: 동시 실행 수 / 대기열 길이 / 가득 찼을 때 Retry-After(초)
+    SCAN_WORKERS = int(os.getenv("VISION_SCAN_WORKERS", "2"))
+    SCAN_QUEUE = int(os.getenv("VISION_SCAN_QUEUE", "8"))
+    SCAN_RETRY_AFTER_S = int(os.getenv("VISION_SCAN_RETRY_AFTER_S", "1"))
+
+    # 스캔 시간 예산 기본값(ms). 클라이언트가 deadline_ms 를 안 보내면 사용 (0 = 예산 없음)
+    SCAN_DEADLINE_MS = int(os.getenv("VISION_SCAN_DEADLINE_MS", "1800"))
+
+    # WebSocket 스캔 세션: 합의에 필요한 최종 후보 횟수 / 움직임 임계(썸네일 평균 차, 0~1) / 누적 OCR 토큰 상한
+    STREAM_CONSENSUS_FRAMES = int(os.getenv("VISION_STREAM_CONSENSUS_FRAMES", "3"))
+    STREAM_MOTION_TH = float(os.getenv("VISION_STREAM_MOTION_TH", "0.04"))
+    STREAM_MAX_TOKENS = int(os.getenv("VISION_STREAM_MAX_TOKENS", "200"))
+
+    # 로깅: 레벨 + 상세(DEBUG) 로그를 남길 요청 비율(0~1)
+    LOG_LEVEL = os.getenv("VISION_LOG_LEVEL", "INFO")
+    LOG_SAMPLE_RATE = float(os.getenv("VISION_LOG_SAMPLE_RATE", "0.01"))
+
+    # 동일 업로드 재전송 결과 캐시: 최대 항목 수(0 = 끔) / TTL(초)
+    RESULT_CACHE_SIZE = int(os.getenv("VISION_RESULT_CACHE_SIZE", "256"))
+    RESULT_CACHE_TTL_S = float(os.getenv("VISION_RESULT_CACHE_TTL_S", "60"))
+
+    # image_recognition_log 배치 기록: 배치 크기 / 최대 대기(초) / 큐 상한(넘치면 버림)
+    MODEL_VERSION = os.getenv("VISION_MODEL_VERSION", "perfume_seg")
+    RECOG_LOG_ENABLED = os.getenv("VISION_RECOG_LOG", "1") == "1"
+    RECOG_LOG_BATCH = int(os.getenv("VISION_RECOG_LOG_BATCH", "50"))
+    RECOG_LOG_FLUSH_S = float(os.getenv("VISION_RECOG_LOG_FLUSH_S", "2"))
+    RECOG_LOG_QUEUE = int(os.getenv("VISION_RECOG_LOG_QUEUE", "1000"))
+
+    # 텍스트 기반 재탐지: 시도할 해상도(싼 것부터) / 이 점수 이상이면 다음 tier 안 감 /
+    # 새 ROI가 기존 OCR ROI에 이 비율 이상 덮이면 OCR 재실행 없이 기존 토큰 재사용
+    REDETECT_TIERS = tuple(
+        int(s) for s in os.getenv("VISION_REDETECT_TIERS", "640,1280").split(",") if s.strip()
+    )
+    REDETECT_ACCEPT_SCORE = float(os.getenv("VISION_REDETECT_ACCEPT_SCORE", "0.3"))
+    REDETECT_REUSE_COVERAGE = float(os.getenv("VISION_REDETECT_REUSE_COVERAGE", "0.9"))
+
+    # 별도 vision 워커 프로세스 (python -m app.services.vision.worker): Unix 소켓 경로(빈 값 = API 프로세스 안에서 실행) /
+    # 응답 대기 시간(초) / 워커의 동시 스캔 수
+    WORKER_SOCKET = os.getenv("VISION_WORKER_SOCKET", "")
+    WORKER_TIMEOUT_S = float(os.getenv("VISION_WORKER_TIMEOUT_S", "10"))
+    WORKER_THREADS = int(os.getenv("VISION_WORKER_THREADS", "2"))
+
+    # 디버그 오버레이 캡처: 저장 폴더 / 샘플링 비율(0 = 헤더로 요청한 것만) / 링버퍼 상한(파일 수, MB) / 대기 큐
     DEBUG_DIR = os.getenv("VISION_DEBUG_DIR", "backend/app/assets/debug")
+    DEBUG_SAMPLE_RATE = float(os.getenv("VISION_DEBUG_SAMPLE_RATE", "0"))
+    DEBUG_MAX_FILES = int(os.getenv("VISION_DEBUG_MAX_FILES", "200"))
+    DEBUG_MAX_MB = float(os.getenv("VISION_DEBUG_MAX_MB", "200"))
+    DEBUG_QUEUE = int(os.getenv("VISION_DEBUG_QUEUE", "16"))
+    # X-Vision-Debug 헤더 공유 비밀값. 비어 있으면 헤더 무시 (익명 클라이언트가 캐시 우회/강제 실행에 쓰지 못하게)
+    DEBUG_TOKEN = os.getenv("VISION_DEBUG_TOKEN", "")
 
     BOTTLE_MODEL_PT_PATH = _abs(os.getenv("BOTTLE_MODEL_PT_PATH", ""))
 
@@ -69,4 +135,36 @@ class VisionConfig:
     PRODUCTS_JSON = os.getenv("PRODUCTS_JSON", "backend/app/assets/dicts/products.json")
 
 
+class CatalogConfig:
+    # 카탈로그 인메모리 인덱스(자동완성 등): 변경 확인 주기(초). 확인은 백그라운드에서 개수/updated_at 만 조회
+    INDEX_TTL_S = float(os.getenv("CATALOG_INDEX_TTL_S", "300"))
+
+    # 텍스트 검색 백엔드: fulltext(MySQL ngram FULLTEXT) | bm25(인메모리)
+    # 최대 일치 수: relevance 정렬 점수에 쓰는 상위 hits 수. fuzzy 검색은 일치 자체가 이 수로 잘림 (hits_capped / X-Search-Capped)
+    SEARCH_BACKEND = os.getenv("CATALOG_SEARCH_BACKEND", "fulltext")
+    SEARCH_MAX_HITS = int(os.getenv("CATALOG_SEARCH_MAX_HITS", "1000"))
+
+    # 오타 허용 검색(fuzzy=true): 최소 유사도(0~100, rapidfuzz WRatio) / n-gram 으로 추린 뒤 점수 계산할 최대 후보 수
+    FUZZY_MIN_SCORE = float(os.getenv("CATALOG_FUZZY_MIN_SCORE", "70"))
+    FUZZY_MAX_CANDIDATES = int(os.getenv("CATALOG_FUZZY_MAX_CANDIDATES", "300"))
+
+    # 검색 include_total: 필터 조합별 개수 캐시(초, 항목 수) / approx=true 일 때 후보가 이보다 많으면 표본 추정, 표본 크기
+    COUNT_CACHE_TTL_S = float(os.getenv("CATALOG_COUNT_CACHE_TTL_S", "30"))
+    COUNT_CACHE_SIZE = int(os.getenv("CATALOG_COUNT_CACHE_SIZE", "1024"))
+    COUNT_APPROX_THRESHOLD = int(os.getenv("CATALOG_COUNT_APPROX_THRESHOLD", "5000"))
+    COUNT_SAMPLE_SIZE = int(os.getenv("CATALOG_COUNT_SAMPLE_SIZE", "1000"))
+
+    # 어코드/노트 필터 + 필터 목록(facets)을 정규화 테이블(perfume_accord, perfume_note)로. 0 이면 기존 JSON 컬럼
+    # 기본 0: 테이블이 비어 있으면 필터 결과가 전부 비므로 python -m app.scripts.backfill_taxonomy 실행 후 1 로 켬
+    TAXONOMY_FILTERS = os.getenv("CATALOG_TAXONOMY_FILTERS", "0") == "1"
+
+    # 유사 향수: perfume_neighbor 에 저장할 향수당 이웃 수 / 배치 계산 시 한 번에 점수 낼 향수 수 (블록 × 카탈로그 float64)
+    SIMILAR_TOP_K = int(os.getenv("CATALOG_SIMILAR_TOP_K", "50"))
+    SIMILAR_BLOCK = int(os.getenv("CATALOG_SIMILAR_BLOCK", "256"))
+
+    # 상세 조회수 write-behind: 모은 증분을 DB 에 반영하는 주기(초, 0 이면 요청마다 바로) / UPDATE 한 번에 넣을 향수 수
+    VIEW_FLUSH_INTERVAL_S = float(os.getenv("CATALOG_VIEW_FLUSH_INTERVAL_S", "5"))
+    VIEW_FLUSH_BATCH = int(os.getenv("CATALOG_VIEW_FLUSH_BATCH", "500"))
+
+
 settings = Settings()
@@ -6,6 +6,8 @@ from app.api.v1.router import api_v1
 from app.api.routes.health import router as health_router
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import auth
+from app.services.vision.recognition_log import get_recognition_log_writer
+from app.services.catalog.view_counter import get_view_counter
 
 app = FastAPI(title="Nozify API", version="1.0.0")
 app.add_middleware(
@@ -14,8 +16,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Search-Capped"],  # 목록 API 커서 페이지네이션 / 검색 일치 상한
 )
 
+@app.on_event("shutdown")
+async def _flush_vision_logs():
+    # 남은 인식 로그 배치 기록
+    await get_recognition_log_writer().close()
+
+@app.on_event("shutdown")
+def _flush_view_counts():
+    # 버퍼에 남은 상세 조회수 반영
+    get_view_counter().close()
+
 # 헬스체크
 @app.get("/health")
 def health():
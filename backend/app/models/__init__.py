@@ -25,6 +25,7 @@ from .seasonal_recommendation import SeasonalRecommendation
 from .image_recognition_log import ImageRecognitionLog
 from .accord import Accord
 from .perfume_accord import PerfumeAccord
+from .perfume_neighbor import PerfumeNeighbor
 
 from .system_log import SystemLog
 from .api_usage import APIUsage
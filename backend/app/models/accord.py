@@ -1,6 +1,6 @@
 # backend/app/models/accord.py
 from __future__ import annotations
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Integer, String, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base, TimestampMixin
 
@@ -11,6 +11,10 @@ class Accord(Base, TimestampMixin):
     name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     name_korean: Mapped[str | None] = mapped_column(String(50))
     description: Mapped[str | None] = mapped_column(Text)
-    occurrence: Mapped[int | None] = mapped_column(Integer)
+    occurrence: Mapped[int | None] = mapped_column(Integer)  # perfume_accord 링크 수 (taxonomy 가 갱신)
 
     perfumes = relationship("PerfumeAccord", back_populates="accord")
+
+    __table_args__ = (
+        Index("ix_accord_occurrence", "occurrence"),
+    )
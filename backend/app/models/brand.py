@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, UniqueConstraint
+from sqlalchemy import Column, Integer, String, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 from sqlalchemy.dialects.mysql import BINARY
@@ -6,7 +6,10 @@ import uuid
 
 class Brand(Base):
     __tablename__ = "brand"
-    __table_args__ = (UniqueConstraint("name", name="uq_brand_name"),)
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_brand_name"),
+        Index("ft_brand_name", "name", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+    )
 
     id = Column(BINARY(16), primary_key=True, default=lambda: uuid.uuid4().bytes, index=True) 
     
@@ -2,16 +2,17 @@
 from __future__ import annotations
 from sqlalchemy import Integer, String, Text, ForeignKey, Numeric, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.mysql import JSON
+from sqlalchemy.dialects.mysql import JSON, BINARY
 from .base import Base, TimestampMixin
 
 class ImageRecognitionLog(Base, TimestampMixin):
     __tablename__ = "image_recognition_log"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int | None] = mapped_column(ForeignKey("user.id", ondelete="SET NULL"))
-    recognized_perfume_id: Mapped[int | None] = mapped_column(ForeignKey("perfume.id", ondelete="SET NULL"))
-    actual_perfume_id: Mapped[int | None] = mapped_column(ForeignKey("perfume.id", ondelete="SET NULL"))
+    # user/perfume PK가 BINARY(16) 이므로 FK도 BINARY(16) (migration aec81abb98d9 와 동일)
+    user_id: Mapped[bytes | None] = mapped_column(BINARY(16), ForeignKey("user.id", ondelete="SET NULL"))
+    recognized_perfume_id: Mapped[bytes | None] = mapped_column(BINARY(16), ForeignKey("perfume.id", ondelete="SET NULL"))
+    actual_perfume_id: Mapped[bytes | None] = mapped_column(BINARY(16), ForeignKey("perfume.id", ondelete="SET NULL"))
 
     image_url: Mapped[str | None] = mapped_column(Text)
     confidence_score: Mapped[float | None] = mapped_column(Numeric(5, 4))
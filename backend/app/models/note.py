@@ -1,5 +1,5 @@
 # backend/app/models/note.py
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
@@ -10,6 +10,7 @@ class Note(Base):
     name = Column(String(100), unique=True, nullable=False)
     family = Column(String(50), nullable=True)       # 플로럴, 시트러스 등
     alias = Column(String(100), nullable=True)       # 다른 표기 보조
+    occurrence = Column(Integer, nullable=False, default=0, server_default="0")  # perfume_note 링크 수 (taxonomy 가 갱신)
 
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(
@@ -20,3 +21,7 @@ class Note(Base):
     )
 
     perfumes = relationship("PerfumeNote", back_populates="note", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_note_occurrence", "occurrence"),
+    )
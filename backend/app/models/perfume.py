@@ -9,6 +9,12 @@ class Perfume(Base):
     __table_args__ = (
         UniqueConstraint("external_source", "external_id", name="uq_perfume_external"),
         Index("ix_perfume_brand_id", "brand_id"),
+        # 목록 정렬(popular|recent) 커서 페이지네이션용 복합 인덱스
+        Index("ix_perfume_popular", "view_count", "wish_count", "id"),
+        Index("ix_perfume_recent", "created_at", "id"),
+        Index("ix_perfume_brand_popular", "brand_id", "view_count", "wish_count", "id"),
+        Index("ix_perfume_brand_recent", "brand_id", "created_at", "id"),
+        Index("ft_perfume_name_brand", "name", "brand_name", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
     )
 
     # --- 기본 키 및 외래 키 ---
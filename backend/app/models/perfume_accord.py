@@ -1,6 +1,6 @@
 # backend/app/models/perfume_accord.py
 from __future__ import annotations
-from sqlalchemy import Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Integer, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base
 
@@ -16,4 +16,5 @@ class PerfumeAccord(Base):
 
     __table_args__ = (
         UniqueConstraint("perfume_id", "accord_id", name="uq_perfume_accord"),
+        Index("ix_perfume_accord_accord_perfume", "accord_id", "perfume_id"),  # 어코드 필터
     )
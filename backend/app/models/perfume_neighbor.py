@@ -0,0 +1,24 @@
+# backend/app/models/perfume_neighbor.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Integer, Float, ForeignKey, DateTime, func
+from sqlalchemy.dialects.mysql import BINARY
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from .base import Base
+
+class PerfumeNeighbor(Base):
+    """향수별 유사 향수 top-K (오프라인 배치 결과, app.scripts.build_perfume_neighbors)"""
+    __tablename__ = "perfume_neighbor"
+
+    # PK (perfume_id, rank) → 조회는 PK 범위 스캔 한 번
+    perfume_id: Mapped[bytes] = mapped_column(
+        BINARY(16), ForeignKey("perfume.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    neighbor_id: Mapped[bytes] = mapped_column(
+        BINARY(16), ForeignKey("perfume.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    neighbor = relationship("Perfume", foreign_keys=[neighbor_id])
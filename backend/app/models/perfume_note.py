@@ -1,5 +1,5 @@
 # backend/app/models/perfume_note.py
-from sqlalchemy import Column, Integer, ForeignKey, Enum, Float, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Float, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 import enum
 from .base import Base, TimestampMixin
@@ -9,6 +9,7 @@ class NoteRole(str, enum.Enum):
     top = "top"
     middle = "middle"
     base = "base"
+    general = "general"  # general_notes (단계 구분 없는 노트)
 
 class PerfumeNote(Base):
     __tablename__ = "perfume_note"
@@ -22,6 +23,7 @@ class PerfumeNote(Base):
 
     __table_args__ = (
         UniqueConstraint("perfume_id", "note_id", "role", name="uq_perfume_note_role"),
+        Index("ix_perfume_note_note_perfume", "note_id", "perfume_id"),  # 노트 필터
     )
 
     perfume = relationship("Perfume", back_populates="notes")
@@ -33,4 +33,5 @@ class PurchaseHistory(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_purchase_user_date", "user_id", "purchase_date"),
         Index("ix_purchase_perfume", "perfume_id"),
+        Index("ix_purchase_user_created", "user_id", "created_at", "id"),
     )
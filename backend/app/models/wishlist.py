@@ -20,4 +20,5 @@ class Wishlist(Base, TimestampMixin):
         UniqueConstraint("user_id", "perfume_id", name="uq_wishlist_user_perfume"),
         Index("ix_wishlist_user", "user_id"),
         Index("ix_wishlist_perfume", "perfume_id"),
+        Index("ix_wishlist_user_created", "user_id", "created_at", "id"),
     )
@@ -33,6 +33,11 @@
 # | device_orientation  | enum          | 아니오 | portrait 또는 landscape. 회전 보정 힌트 |
 # | request_id          | string        | 아니오 | 클라이언트 생성 요청 ID(로그 상관키)           |
 # | ts                  | int(ms)       | 아니오 | 클라이언트 캡처 시각(밀리초, 로깅용)            |
+# | deadline_ms         | int(ms)       | 아니오 | 처리 시간 예산. 없으면 VISION_SCAN_DEADLINE_MS. 0이면 무제한 |
+#
+# 선택 헤더
+# - X-Vision-Debug: <VISION_DEBUG_TOKEN> → 이 요청은 결과 캐시를 거치지 않고, 상세 로그 + 디버그 오버레이 캡처 (지원 대응용)
+#   서버에 VISION_DEBUG_TOKEN 이 없거나 값이 다르면 헤더는 무시됨
 #
 # 검증 규칙
 # - 파일 MIME 검사 필수: image/jpeg, image/png만 허용
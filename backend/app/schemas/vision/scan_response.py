@@ -35,10 +35,13 @@
 # | timing.detect_ms        | int            | 병 탐지/세그멘테이션                            |
 # | timing.ocr_ms           | int            | OCR                                       |
 # | timing.match_ms         | int            | 매칭                                        |
+# | timing.queue_ms         | int            | vision executor 대기 시간                     |
 # | timing.total_ms         | int            | 총 소요                                      |
 # | request_id              | string         | 요청과 동일 ID 에코                            |
 # | debug                   | object or null | 디버그 경로(디버그 모드일 때만)                  |
-# | debug.overlay_path      | string         | 디버그 합성 이미지 저장 경로(선택)                |
+# | debug.capture           | string or null | 디버그 오버레이 파일 이름(VISION_DEBUG_DIR, 캡처된 경우만) |
+# | debug.budget            | object         | deadline_ms, remaining_ms, skipped(건너뛴 단계), downgraded |
+# | debug.cache             | enum           | miss, hit(동일 업로드 캐시), shared(처리 중 요청 결과 공유), bypass(X-Vision-Debug) |
 #
 # [판정 규칙(서버 내 기준값)]
 # - bottle.score ≥ THRESH_BOTTLE_SCORE
@@ -59,6 +62,8 @@
 #
 # 추가 규칙
 # - 파일 오류: 400, 내부 추론 예외: 500, 타임아웃: 504 권장
+# - 스캔 대기열 포화: 503 + Retry-After 헤더 (error.code = SCAN_BUSY)
+# - vision 워커 모드(VISION_WORKER_SOCKET): 워커 연결 실패 503 (VISION_WORKER_UNAVAILABLE), 응답 지연 504 (VISION_WORKER_TIMEOUT)
 # - 에러에도 request_id는 반드시 반환
 #
 # E. Health 체크(참고)
@@ -0,0 +1,37 @@
+# app/scripts/backfill_taxonomy.py
+"""
+Perfume JSON(main_accords, *_notes) → accord/perfume_accord/note/perfume_note 백필 + occurrence 재계산.
+여러 번 실행해도 같은 결과 (바뀐 링크만 추가/삭제). 이후에는 Fragella 동기화가 향수마다 갱신한다.
+
+    python -m app.scripts.backfill_taxonomy [--batch 500]
+    python -m app.scripts.backfill_taxonomy --counts-only   # occurrence 만 링크 테이블 기준으로 맞춤 (주기 실행용)
+
+첫 백필이 끝난 뒤 CATALOG_TAXONOMY_FILTERS=1 로 바꿔야 필터/필터 목록이 정규화 테이블을 사용한다.
+"""
+import argparse
+
+from app.core.config import CatalogConfig
+from app.core.db import SessionLocal
+from app.services.catalog.taxonomy import backfill_taxonomy, reconcile_occurrences
+
+
+def run(batch: int = 500, counts_only: bool = False):
+    db = SessionLocal()
+    try:
+        if not counts_only:
+            n = backfill_taxonomy(db, batch_size=batch)
+            print(f"backfill done: {n} perfumes")
+            if not CatalogConfig.TAXONOMY_FILTERS:
+                print("CATALOG_TAXONOMY_FILTERS=1 로 설정하면 어코드/노트 필터가 정규화 테이블을 사용합니다")
+        reconcile_occurrences(db)
+        print("occurrence reconciled")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--batch", type=int, default=500)
+    ap.add_argument("--counts-only", action="store_true")
+    args = ap.parse_args()
+    run(args.batch, args.counts_only)
@@ -0,0 +1,166 @@
+# app/scripts/bench_scan.py
+"""
+오프라인 스캔 리플레이 벤치마크 (HTTP 없이 /vision/scan 과 같은 run_scan 파이프라인 실행)
+
+사용법 (backend/ 에서):
+    python -m app.scripts.bench_scan <이미지 폴더> [--concurrency 4] [--repeat 1] [--deadline-ms 0] [--out run.json]
+
+정답 라벨:
+- <폴더>/labels.json : {"파일명.jpg": "<product_id hex>", ...}
+- 없으면 상위 폴더 이름을 product_id 로 사용 (<폴더>/<product_id>/*.jpg)
+
+출력(JSON): 단계별 p50/p95/p99(ms), 처리량(img/s), top-1/top-3/final 정확도, 최대 RSS(MB)
+- latency_ms       : 응답 timing 의 굵은 단계 (detect/ocr/quality/match/total) + wall
+- budget_stages_ms : debug.budget.stages_ms 의 세부 단계 (decode, decode_full, ocr_rotated, redetect@<size>, ocr_rerun ...)
+                     조건부 단계라 실행된 이미지만 집계, n = 실행 횟수
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.services.vision.pipeline import run_scan, ScanError
+
+_EXTS = (".jpg", ".jpeg", ".png")
+_STAGES = ("detect_ms", "ocr_ms", "quality_ms", "match_ms", "total_ms")
+
+
+def _load_samples(root: str) -> List[Tuple[str, Optional[str]]]:
+    labels: Dict[str, str] = {}
+    labels_path = os.path.join(root, "labels.json")
+    if os.path.exists(labels_path):
+        with open(labels_path, encoding="utf-8") as f:
+            labels = json.load(f)
+
+    samples = []
+    for dirpath, _, files in os.walk(root):
+        for name in sorted(files):
+            if not name.lower().endswith(_EXTS):
+                continue
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, root)
+            expected = labels.get(rel) or labels.get(name)
+            if expected is None and dirpath != root:
+                expected = os.path.basename(dirpath)
+            samples.append((path, expected.replace("-", "").lower() if expected else None))
+    return samples
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    data = sorted(values)
+    k = (len(data) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(data) - 1)
+    return round(data[lo] + (data[hi] - data[lo]) * (k - lo), 2)
+
+
+def _summary(values: List[float]) -> Dict[str, Optional[float]]:
+    return {"p50": _percentile(values, 0.50), "p95": _percentile(values, 0.95), "p99": _percentile(values, 0.99)}
+
+
+def _peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def _run_one(path: str, expected: Optional[str], deadline_ms: int) -> Dict:
+    with open(path, "rb") as f:
+        content = f.read()
+    t = time.perf_counter()
+    try:
+        result = run_scan(content, None, None, os.path.basename(path), deadline_ms)
+    except ScanError as e:
+        return {"path": path, "error": e.code, "wall_ms": (time.perf_counter() - t) * 1000}
+    wall_ms = (time.perf_counter() - t) * 1000
+
+    budget = result.get("debug", {}).get("budget", {})
+    cands = [c["product_id"] for c in (result["match"].get("candidates") or [])]
+    final = result["match"].get("final")
+    return {
+        "path": path,
+        "expected": expected,
+        "timing": result["timing"],
+        "wall_ms": wall_ms,
+        "top1": bool(expected) and cands[:1] == [expected],
+        "top3": bool(expected) and expected in cands[:3],
+        "final": bool(expected) and final is not None and final["product_id"] == expected,
+        "skipped": budget.get("skipped", []),
+        "budget_stages": budget.get("stages_ms", {}),
+    }
+
+
+def run(root: str, concurrency: int = 1, repeat: int = 1, deadline_ms: int = 0) -> Dict:
+    samples = _load_samples(root) * max(1, repeat)
+    if not samples:
+        raise SystemExit(f"no images under {root}")
+
+    # 모델/사전 로딩은 측정에서 제외 (첫 샘플로 워밍업)
+    _run_one(samples[0][0], samples[0][1], deadline_ms)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        rows = list(pool.map(lambda s: _run_one(s[0], s[1], deadline_ms), samples))
+    elapsed = time.perf_counter() - t0
+
+    ok = [r for r in rows if "error" not in r]
+    labelled = [r for r in ok if r["expected"]]
+    stages = {}
+    for key in _STAGES:
+        stages[key.replace("_ms", "")] = _summary([float(r["timing"].get(key, 0)) for r in ok])
+    stages["wall"] = _summary([r["wall_ms"] for r in rows])
+
+    # 세부 단계: 이미지마다 실행 여부가 다르므로 실행된 것만 모아서 집계
+    per_stage: Dict[str, List[float]] = {}
+    for r in ok:
+        for name, ms in r["budget_stages"].items():
+            per_stage.setdefault(name, []).append(float(ms))
+    budget_stages = {name: {"n": len(vals), **_summary(vals)} for name, vals in sorted(per_stage.items())}
+
+    skipped: Dict[str, int] = {}
+    for r in ok:
+        for s in r["skipped"]:
+            skipped[s] = skipped.get(s, 0) + 1
+
+    def _acc(key):
+        return round(sum(1 for r in labelled if r[key]) / len(labelled), 4) if labelled else None
+
+    return {
+        "images": len(rows),
+        "errors": len(rows) - len(ok),
+        "concurrency": concurrency,
+        "deadline_ms": deadline_ms,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_ips": round(len(rows) / elapsed, 3) if elapsed > 0 else None,
+        "latency_ms": stages,
+        "budget_stages_ms": budget_stages,
+        "accuracy": {"labelled": len(labelled), "top1": _acc("top1"), "top3": _acc("top3"), "final": _acc("final")},
+        "skipped_stages": skipped,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay labelled bottle photos through the scan pipeline")
+    ap.add_argument("root", help="이미지 폴더")
+    ap.add_argument("--concurrency", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=1, help="전체 샘플 반복 횟수")
+    ap.add_argument("--deadline-ms", type=int, default=0, help="스캔 시간 예산 (0 = 없음)")
+    ap.add_argument("--out", help="결과 JSON 저장 경로 (없으면 stdout)")
+    args = ap.parse_args(argv)
+
+    report = run(args.root, args.concurrency, args.repeat, args.deadline_ms)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
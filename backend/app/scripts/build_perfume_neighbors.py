@@ -0,0 +1,28 @@
+# app/scripts/build_perfume_neighbors.py
+"""
+전체 카탈로그 유사 향수 top-K 계산 → perfume_neighbor 교체 (Fragella 동기화 후 / 주기 실행).
+
+    python -m app.scripts.build_perfume_neighbors [--k 50] [--block 256]
+"""
+import argparse
+
+from app.core.config import CatalogConfig
+from app.core.db import SessionLocal
+from app.services.catalog.similarity import rebuild_neighbors
+
+
+def run(k: int, block: int):
+    db = SessionLocal()
+    try:
+        n = rebuild_neighbors(db, k=k, block=block)
+        print(f"neighbors done: {n} perfumes, k={k}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--k", type=int, default=CatalogConfig.SIMILAR_TOP_K)
+    ap.add_argument("--block", type=int, default=CatalogConfig.SIMILAR_BLOCK)
+    args = ap.parse_args()
+    run(args.k, args.block)
@@ -0,0 +1,118 @@
+# app/scripts/import_profile.py
+"""
+라우터별 import 비용 리포트 (python -X importtime 기반)
+
+사용법 (backend/ 에서):
+    python -m app.scripts.import_profile [--top 8] [--module app.main ...] [--json]
+
+- 기본 대상: app/api/v1/router.py 가 import 하는 라우터 모듈 전부 + app.main
+- 모듈마다 새 인터프리터에서 `-X importtime -c "import <모듈>"` 을 실행해서
+  누적(cumulative) import 시간, 끌려온 무거운 패키지(numpy, cv2, onnxruntime, torch, ...), 가장 비싼 하위 import 를 출력
+- 공통 비용(fastapi, sqlalchemy 등)도 모듈마다 포함된 값이므로 "이 라우터만 import 하면 드는 시간"으로 읽으면 됨
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+HEAVY = ("numpy", "cv2", "onnxruntime", "torch", "ultralytics", "pytesseract", "rapidfuzz", "scipy", "PIL")
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def router_modules() -> List[str]:
+    """api/v1/router.py 의 from app.api.routes... import 대상 모듈 (순서 유지, 중복 제거)"""
+    path = os.path.join(_BACKEND_DIR, "app", "api", "v1", "router.py")
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    mods: List[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("app.api.routes"):
+            for alias in node.names:
+                # from app.api.routes import auth → 서브모듈, from app.api.routes.x import router → 모듈 자체
+                name = node.module if alias.name == "router" else f"{node.module}.{alias.name}"
+                if name not in mods:
+                    mods.append(name)
+    return mods
+
+
+def profile(module: str) -> Dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append({
+                "self_us": int(m.group(1)),
+                "cumulative_us": int(m.group(2)),
+                "depth": len(m.group(3)) // 2,
+                "name": m.group(4),
+            })
+
+    own = next((r for r in reversed(rows) if r["name"] == module), None)
+    heavy = sorted({r["name"].split(".")[0] for r in rows if r["name"].split(".")[0] in HEAVY})
+    return {
+        "module": module,
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 and proc.stderr.strip() else None,
+        "cumulative_ms": round(own["cumulative_us"] / 1000, 1) if own else None,
+        "total_ms": round(sum(r["self_us"] for r in rows) / 1000, 1),
+        "modules": len(rows),
+        "heavy": heavy,
+        "_rows": rows,
+    }
+
+
+def top_imports(rows: List[Dict], n: int) -> List[Dict]:
+    """최상위 패키지 단위로 누적 시간이 큰 import (자기 자신/내부 app.* 제외)"""
+    best: Dict[str, int] = {}
+    for r in rows:
+        if r["name"].startswith("app."):
+            continue
+        top = r["name"].split(".")[0]
+        best[top] = max(best.get(top, 0), r["cumulative_us"])
+    ranked = sorted(best.items(), key=lambda kv: -kv[1])[:n]
+    return [{"package": k, "cumulative_ms": round(v / 1000, 1)} for k, v in ranked]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Per-router import-time report")
+    ap.add_argument("--module", action="append", help="대상 모듈 (여러 번 가능, 기본: 모든 라우터 + app.main)")
+    ap.add_argument("--top", type=int, default=5, help="모듈별로 보여줄 비싼 패키지 수")
+    ap.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    args = ap.parse_args(argv)
+
+    modules = args.module or (router_modules() + ["app.main"])
+    report = []
+    for mod in modules:
+        r = profile(mod)
+        r["top"] = top_imports(r.pop("_rows"), args.top)
+        report.append(r)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    width = max(len(r["module"]) for r in report)
+    print(f"{'module'.ljust(width)}  {'cum_ms':>8}  {'mods':>5}  heavy / top imports")
+    for r in sorted(report, key=lambda r: -(r["cumulative_ms"] or 0)):
+        if not r["ok"]:
+            print(f"{r['module'].ljust(width)}  {'ERR':>8}  {'':>5}  {r['error']}")
+            continue
+        top = ", ".join(f"{t['package']}={t['cumulative_ms']}" for t in r["top"])
+        heavy = ",".join(r["heavy"]) or "-"
+        print(f"{r['module'].ljust(width)}  {r['cumulative_ms']:>8}  {r['modules']:>5}  [{heavy}] {top}")
+
+
+if __name__ == "__main__":
+    main()
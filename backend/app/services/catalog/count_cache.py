@@ -0,0 +1,109 @@
+# backend/app/services/catalog/count_cache.py
+"""
+검색 include_total 용 총 개수 캐시 + 근사 개수.
+- 키: 정규화한 필터 조합 (q, fuzzy, brand_id, gender, accords, notes). 정렬/페이지와 무관 → 페이지 넘길 때 재계산 안 함
+- 짧은 TTL 의 LRU. 여러 요청 스레드에서 호출되므로 락 사용
+- approx: 비싼 조건(JSON/조인 필터) 적용 전 후보 수가 threshold 를 넘으면 표본으로 비율만 재서 추정
+  Perfume.id 는 uuid4 라 id 순서 = 무작위 순서 → id 오름차순 앞 N 개가 균등 표본
+- 캐시에 정확한 값이 있으면 approx 요청에도 그대로 쓰고, 근사값은 정확한 값 요청에 쓰지 않음
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Tuple
+
+from app.core.config import CatalogConfig
+from app.models.perfume import Perfume
+from .suggest_index import normalize_name
+
+Total = Tuple[int, bool]  # (개수, 정확한 값 여부)
+
+
+def _csv_key(values: Optional[Iterable[str]]) -> list:
+    return sorted({v.strip() for v in (values or []) if v and v.strip()})
+
+
+class CountCache:
+    def __init__(self, max_entries: int = 1024, ttl_s: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._data: "OrderedDict[str, Tuple[float, Total]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        q: Optional[str] = None,
+        fuzzy: bool = False,
+        brand_id: Optional[str] = None,
+        gender: Optional[str] = None,
+        accords: Optional[Sequence[str]] = None,
+        notes: Optional[Sequence[str]] = None,
+    ) -> str:
+        return json.dumps(
+            [
+                normalize_name(q or ""),
+                bool(fuzzy) and bool(q),
+                (brand_id or "").replace("-", "").lower(),
+                gender or "",
+                _csv_key(accords),
+                _csv_key(notes),
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+    def get(self, key: str, need_exact: bool) -> Optional[Total]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            if need_exact and not value[1]:
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Total) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+def count_total(base_query, predicates: Sequence, approx: bool, threshold: int, sample_size: int) -> Total:
+    """
+    base_query: 인덱스로 거를 수 있는 조건만 붙인 쿼리 (검색 hits, brand_id, gender)
+    predicates: 행마다 계산해야 하는 비싼 조건들 (accords/notes)
+    """
+    if not predicates:
+        return base_query.count(), True
+    if not approx:
+        return base_query.filter(*predicates).count(), True
+
+    base = base_query.count()
+    if base <= max(threshold, sample_size):
+        return base_query.filter(*predicates).count(), True
+
+    # 후보 중 id 오름차순 sample_size 번째 id 까지가 표본 → 표본에서 조건 통과 비율 × 후보 수
+    pivot = (
+        base_query.with_entities(Perfume.id)
+        .order_by(Perfume.id.asc())
+        .offset(sample_size - 1)
+        .limit(1)
+        .scalar()
+    )
+    matched = base_query.filter(Perfume.id <= pivot, *predicates).count()
+    return int(round(base * matched / sample_size)), False
+
+
+@lru_cache(maxsize=1)
+def get_count_cache() -> CountCache:
+    return CountCache(max_entries=CatalogConfig.COUNT_CACHE_SIZE, ttl_s=CatalogConfig.COUNT_CACHE_TTL_S)
@@ -0,0 +1,96 @@
+# backend/app/services/catalog/fuzzy_index.py
+"""
+오타 허용 카탈로그 검색 (fuzzy=true).
+- 정규화는 비전 매처와 같은 text_normalize.normalize_text (대문자, 특수문자 제거, 공백 정리)
+- 향수 문서 = "브랜드 이름 + 향수 이름", 브랜드 문서 = 브랜드 이름
+- 1) 3-gram 포스팅으로 겹치는 gram 이 많은 후보만 max_candidates 개 추림 (너무 흔한 gram 은 건너뜀)
+  2) 후보에만 rapidfuzz WRatio 적용 → 카탈로그가 커져도 점수 계산 수는 상한 고정
+search_backend.SearchBackend 와 같은 (id, score) 인터페이스라 라우트에서 백엔드 대신 그대로 쓴다.
+"""
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import CatalogConfig
+from app.models.brand import Brand
+from app.models.perfume import Perfume
+from app.services.text_normalize import normalize_text
+from .index_cache import CatalogIndex
+from .search_backend import Hit, SearchBackend
+
+_COMMON_RATIO = 0.2  # 문서의 20% 이상에 나오는 gram 은 후보 추림에 쓰지 않음
+
+
+def _trigrams(s: str) -> set:
+    padded = f" {s} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyNameIndex:
+    def __init__(self, ids: Sequence[bytes], texts: Sequence[str]):
+        """ids 순서 = 동점일 때 우선순위 (인기순으로 넣음)"""
+        self.ids = list(ids)
+        self.norms = [normalize_text(t or "") for t in texts]
+        self.postings: Dict[str, List[int]] = {}
+        for i, norm in enumerate(self.norms):
+            for g in _trigrams(norm):
+                self.postings.setdefault(g, []).append(i)
+        self._common = max(50, int(len(self.norms) * _COMMON_RATIO))
+
+    def _candidates(self, nq: str, max_candidates: int) -> List[int]:
+        lists = [p for p in (self.postings.get(g) for g in _trigrams(nq)) if p]
+        rare = [p for p in lists if len(p) <= self._common]
+        counts: Counter = Counter()
+        for p in rare or sorted(lists, key=len)[:3]:
+            counts.update(p)
+        return [i for i, _ in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:max_candidates]]
+
+    def search(self, q: str, limit: int, min_score: float, max_candidates: int) -> List[Hit]:
+        from rapidfuzz import fuzz, process
+
+        nq = normalize_text(q or "")
+        if not nq:
+            return []
+        cand = self._candidates(nq, max_candidates)
+        found = process.extract(
+            nq,
+            {i: self.norms[i] for i in cand},
+            scorer=fuzz.WRatio,
+            limit=None,
+            score_cutoff=min_score,
+        )
+        found.sort(key=lambda r: (-r[1], r[2]))
+        return [(self.ids[i], round(score / 100.0, 4)) for _, score, i in found[:limit]]
+
+
+def _build_fuzzy(db: Session) -> Tuple[FuzzyNameIndex, FuzzyNameIndex]:
+    perfumes = (
+        db.query(Perfume.id, Perfume.name, Perfume.brand_name)
+        .order_by(Perfume.view_count.desc(), Perfume.id.desc())
+        .all()
+    )
+    brands = db.query(Brand.id, Brand.name).order_by(Brand.name.asc()).all()
+    return (
+        FuzzyNameIndex([p.id for p in perfumes], [f"{p.brand_name or ''} {p.name or ''}" for p in perfumes]),
+        FuzzyNameIndex([b.id for b in brands], [b.name for b in brands]),
+    )
+
+
+_FUZZY = CatalogIndex("search_fuzzy", _build_fuzzy, ttl_s=CatalogConfig.INDEX_TTL_S)
+
+
+class FuzzyBackend(SearchBackend):
+    name = "fuzzy"
+
+    def search_perfumes(self, db: Session, q: str, limit: int) -> List[Hit]:
+        return _FUZZY.get()[0].search(q, limit, CatalogConfig.FUZZY_MIN_SCORE, CatalogConfig.FUZZY_MAX_CANDIDATES)
+
+    def search_brands(self, db: Session, q: str, limit: int) -> List[Hit]:
+        return _FUZZY.get()[1].search(q, limit, CatalogConfig.FUZZY_MIN_SCORE, CatalogConfig.FUZZY_MAX_CANDIDATES)
+
+
+@lru_cache(maxsize=1)
+def get_fuzzy_backend() -> FuzzyBackend:
+    return FuzzyBackend()
@@ -0,0 +1,98 @@
+# backend/app/services/catalog/index_cache.py
+"""
+카탈로그(향수/브랜드)에서 만드는 인메모리 인덱스 공용 캐시.
+- 첫 사용 때 한 번 동기 빌드, 이후에는 만들어 둔 인덱스를 그대로 반환 (요청 경로에서 DB 안 감)
+- ttl_s 마다 백그라운드 스레드에서 카탈로그 시그니처(개수 + 최근 updated_at)를 확인해 바뀌었으면 재빌드
+- 같은 프로세스에서 카탈로그를 바꿨으면 invalidate_catalog_indexes() 로 즉시 재빌드 예약
+"""
+import logging
+import threading
+import time
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+from app.models.brand import Brand
+from app.models.perfume import Perfume
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_REGISTRY: List["CatalogIndex"] = []
+
+
+def catalog_signature(db: Session) -> Tuple:
+    p_cnt, p_max = db.query(func.count(Perfume.id), func.max(Perfume.updated_at)).one()
+    b_cnt = db.query(func.count(Brand.id)).scalar()
+    return (p_cnt, p_max, b_cnt)
+
+
+class CatalogIndex(Generic[T]):
+    def __init__(self, name: str, build: Callable[[Session], T], ttl_s: float = 300.0):
+        self.name = name
+        self._build = build
+        self.ttl_s = ttl_s
+        self._value: Optional[T] = None
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._built_at = 0.0
+        self._force = False
+        self._lock = threading.Lock()
+        self._refreshing = False
+        _REGISTRY.append(self)
+
+    def get(self) -> T:
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    self._rebuild(force=True)
+        elif self._force or time.monotonic() - self._checked_at >= self.ttl_s:
+            self._refresh_async()
+        return self._value
+
+    def invalidate(self) -> None:
+        self._force = True
+
+    @property
+    def built_at(self) -> float:
+        return self._built_at
+
+    def _rebuild(self, force: bool) -> None:
+        db = SessionLocal()
+        try:
+            sig = catalog_signature(db)
+            if force or sig != self._signature or self._value is None:
+                self._force = False
+                value = self._build(db)
+                self._value, self._signature = value, sig
+                self._built_at = time.time()
+        finally:
+            db.close()
+            self._checked_at = time.monotonic()
+
+    def _refresh_async(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+            force = self._force
+            self._checked_at = time.monotonic()  # 확인 중에 다른 요청이 또 띄우지 않도록
+
+        def _run():
+            try:
+                self._rebuild(force)
+            except Exception as e:
+                logger.warning("[CatalogIndex] %s refresh failed: %s", self.name, e)
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=_run, name=f"catalog-index-{self.name}", daemon=True).start()
+
+
+def invalidate_catalog_indexes() -> None:
+    """카탈로그 변경 후 호출. 다음 사용 시 백그라운드에서 재빌드"""
+    for idx in _REGISTRY:
+        idx.invalidate()
@@ -0,0 +1,95 @@
+# backend/app/services/catalog/pagination.py
+"""
+목록 API 커서(keyset) 페이지네이션.
+- 커서 = 마지막 행의 정렬 키 값들을 JSON → base64url 로 감싼 불투명 문자열 (클라이언트는 그대로 돌려주기만)
+- 다음 페이지 = "정렬 키 튜플이 커서보다 뒤" 조건 + LIMIT → offset 처럼 앞 행을 읽고 버리지 않음
+- 정렬은 모두 내림차순 + 마지막 키는 유일(id)이라 순서가 항상 결정적
+- 복합 인덱스(ix_perfume_popular, ix_perfume_recent ...)가 ORDER BY 와 같은 순서라 인덱스 범위 스캔으로 끝남
+- offset 은 호환용으로 그대로 두고, cursor 가 있으면 offset 은 무시
+"""
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+from app.models.perfume import Perfume
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# 키 종류별 (JSON 으로 인코딩, 디코딩)
+_CODECS = {
+    "int": (lambda v: int(v or 0), int),
+    "dec": (lambda v: str(v if v is not None else 0), Decimal),
+    "dt": (lambda v: v.isoformat() if v is not None else None, datetime.fromisoformat),
+    "uuid": (lambda v: v.hex(), bytes.fromhex),
+}
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+class Keyset:
+    def __init__(self, name: str, *keys: Tuple[Any, str]):
+        """keys: (컬럼 또는 SQL 식, 종류) — ORDER BY 순서대로, 마지막은 유일 키"""
+        self.name = name
+        self.keys = keys
+
+    def order_by(self) -> List[Any]:
+        return [col.desc() for col, _ in self.keys]
+
+    def encode(self, values: Sequence[Any]) -> str:
+        k = [_CODECS[kind][0](v) for (_, kind), v in zip(self.keys, values)]
+        return _b64encode(json.dumps({"s": self.name, "k": k}, separators=(",", ":")).encode())
+
+    def encode_row(self, obj: Any) -> str:
+        """정렬 키가 모두 모델 컬럼일 때: 행 객체에서 바로 커서 생성"""
+        return self.encode([getattr(obj, col.key) for col, _ in self.keys])
+
+    def decode(self, cursor: str) -> List[Any]:
+        try:
+            data = json.loads(_b64decode(cursor))
+            if data.get("s") != self.name or len(data["k"]) != len(self.keys):
+                raise ValueError("cursor sort mismatch")
+            return [_CODECS[kind][1](v) for (_, kind), v in zip(self.keys, data["k"])]
+        except (ValueError, KeyError, TypeError, AttributeError, InvalidOperation):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+
+    def after(self, cursor: str):
+        """
+        (k1, k2, ..., kn) < (v1, v2, ..., vn) 를 OR 체인으로 전개.
+        MySQL 은 행 생성자 비교보다 이 형태에서 인덱스 범위를 더 안정적으로 잡음
+        """
+        values = self.decode(cursor)
+        terms = []
+        for i, ((col, _), v) in enumerate(zip(self.keys, values)):
+            eqs = [c == pv for (c, _), pv in zip(self.keys[:i], values[:i])]
+            terms.append(and_(*eqs, col < v))
+        return or_(*terms)
+
+    def apply(self, query, cursor: Optional[str]):
+        """정렬 + (cursor 가 있으면) 커서 이후 조건"""
+        if cursor:
+            query = query.filter(self.after(cursor))
+        return query.order_by(*self.order_by())
+
+
+def page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], bool]:
+    """limit + 1 개를 읽은 결과에서 (이번 페이지, 다음 페이지 존재 여부)"""
+    rows = list(rows)
+    return rows[:limit], len(rows) > limit
+
+
+# 카탈로그 공용 정렬 (ORDER BY 는 기존과 동일)
+PERFUME_POPULAR = Keyset(
+    "popular", (Perfume.view_count, "int"), (Perfume.wish_count, "int"), (Perfume.id, "uuid")
+)
+PERFUME_RECENT = Keyset("recent", (Perfume.created_at, "dt"), (Perfume.id, "uuid"))
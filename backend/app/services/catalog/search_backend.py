@@ -0,0 +1,229 @@
+# backend/app/services/catalog/search_backend.py
+"""
+카탈로그 텍스트 검색 백엔드 (CATALOG_SEARCH_BACKEND 로 선택).
+- fulltext : MySQL ngram FULLTEXT 인덱스 (ft_perfume_name_brand, ft_brand_name) 에 MATCH ... AGAINST
+- bm25     : FULLTEXT 를 못 쓰는 배포용. 인메모리 2-gram BM25 (카탈로그 변경 시 재빌드, index_cache 참고)
+
+두 백엔드 모두 (id, score) 목록을 점수 내림차순으로 돌려주고, 라우트는 그 id 들로 한 번에 조회(hydrate)한다.
+검색 비용은 테이블 크기가 아니라 일치하는 결과 수에 비례.
+
+목록 필터(match_perfumes): 백엔드가 perfume_filter 로 상한 없는 WHERE 조건을 주면 그걸로 거르고
+(fulltext = MATCH ... AGAINST 를 WHERE 에 두고 keyset ORDER BY 그대로), 점수 hits 는 relevance 정렬에만 씀.
+조건을 못 주는 백엔드(fuzzy)는 SEARCH_MAX_HITS 개 id 목록으로 거르고 상한에 닿았으면 capped 로 알림.
+"""
+import math
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import case, desc
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.core.config import CatalogConfig
+from app.models.brand import Brand
+from app.models.perfume import Perfume
+from .index_cache import CatalogIndex
+from .suggest_index import normalize_name
+
+Hit = Tuple[bytes, float]
+
+
+# 목록 응답(리스트)에서 검색 일치가 SEARCH_MAX_HITS 로 잘렸을 때 붙이는 헤더
+SEARCH_CAPPED_HEADER = "X-Search-Capped"
+
+
+class SearchBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def search_perfumes(self, db: Session, q: str, limit: int) -> List[Hit]:
+        ...
+
+    @abstractmethod
+    def search_brands(self, db: Session, q: str, limit: int) -> List[Hit]:
+        ...
+
+    def perfume_filter(self, db: Session, q: str) -> Optional[Any]:
+        """일치 향수 전체(상한 없음)를 거르는 WHERE 조건. 못 만드는 백엔드는 None"""
+        return None
+
+
+# -------------------------------------------------
+# MySQL ngram FULLTEXT
+# -------------------------------------------------
+def _boolean_phrase(q: str) -> str:
+    # 불리언 모드 연산자 무력화 후 구문 검색 → ngram 이 순서대로 모두 있는 행만 (ILIKE '%q%' 와 유사)
+    cleaned = " ".join(q.replace('"', " ").split())
+    return f'"{cleaned}"'
+
+
+class FulltextBackend(SearchBackend):
+    name = "fulltext"
+
+    def _search(self, db: Session, model, columns, q: str, limit: int) -> List[Hit]:
+        m = match(*columns, against=_boolean_phrase(q)).in_boolean_mode()
+        rows = (
+            db.query(model.id, m.label("score"))
+            .filter(m)
+            .order_by(desc("score"))
+            .limit(limit)
+            .all()
+        )
+        return [(r.id, float(r.score)) for r in rows]
+
+    def search_perfumes(self, db: Session, q: str, limit: int) -> List[Hit]:
+        return self._search(db, Perfume, (Perfume.name, Perfume.brand_name), q, limit)
+
+    def search_brands(self, db: Session, q: str, limit: int) -> List[Hit]:
+        return self._search(db, Brand, (Brand.name,), q, limit)
+
+    def perfume_filter(self, db: Session, q: str):
+        return match(Perfume.name, Perfume.brand_name, against=_boolean_phrase(q)).in_boolean_mode()
+
+
+# -------------------------------------------------
+# 인메모리 BM25 (문자 2-gram)
+# -------------------------------------------------
+def _gram_list(s: str, n: int = 2) -> List[str]:
+    return [s[i : i + n] for i in range(len(s) - n + 1)] or ([s] if s else [])
+
+
+class BM25Field:
+    """필드 하나(예: 향수 이름)의 2-gram 역색인 + BM25 통계"""
+
+    def __init__(self, docs: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        self.docs = list(docs)
+        self.k1, self.b = k1, b
+        self.lengths = []
+        self.postings: Dict[str, List[int]] = {}
+        for i, doc in enumerate(self.docs):
+            grams = _gram_list(doc)
+            self.lengths.append(len(grams))
+            for g in set(grams):
+                self.postings.setdefault(g, []).append(i)
+        n = len(self.docs)
+        self.avgdl = (sum(self.lengths) / n) if n else 1.0
+        self.idf = {g: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for g, p in self.postings.items()}
+
+    def matching(self, nq: str) -> List[int]:
+        """nq 를 부분 문자열로 포함하는 문서: 가장 드문 gram 의 포스팅만 훑고 실제 포함 여부 확인"""
+        lists = [self.postings.get(g) for g in set(_gram_list(nq))]
+        if not lists or any(l is None for l in lists):
+            return []
+        return [i for i in min(lists, key=len) if nq in self.docs[i]]
+
+    def score(self, i: int, q_grams: Sequence[str]) -> float:
+        tf = Counter(_gram_list(self.docs[i]))
+        norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / self.avgdl)
+        s = 0.0
+        for g in q_grams:
+            f = tf.get(g, 0)
+            if f:
+                s += self.idf[g] * f * (self.k1 + 1) / (f + norm)
+        return s
+
+
+class BM25Index:
+    def __init__(self, ids: Sequence[bytes], fields: Sequence[Sequence[str]], weights: Sequence[float]):
+        """ids 순서 = 동점일 때 우선순위 (인기순으로 넣음)"""
+        self.ids = list(ids)
+        self.fields = [BM25Field([normalize_name(v) for v in f]) for f in fields]
+        self.weights = list(weights)
+
+    def _matching(self, nq: str) -> set:
+        cand = set()
+        for f in self.fields:
+            cand.update(f.matching(nq))
+        return cand
+
+    def matching_ids(self, q: str) -> List[bytes]:
+        """점수 계산 없이 일치 문서 id 전체"""
+        nq = normalize_name(q)
+        return [self.ids[i] for i in sorted(self._matching(nq))] if nq else []
+
+    def search(self, q: str, limit: int) -> List[Hit]:
+        nq = normalize_name(q)
+        if not nq:
+            return []
+        q_grams = sorted(set(_gram_list(nq)))
+        cand = self._matching(nq)
+        scored = [
+            (sum(w * f.score(i, q_grams) for f, w in zip(self.fields, self.weights)), i)
+            for i in cand
+        ]
+        scored.sort(key=lambda t: (-t[0], t[1]))
+        return [(self.ids[i], s) for s, i in scored[:limit]]
+
+
+def _build_bm25(db: Session) -> Tuple[BM25Index, BM25Index]:
+    perfumes = (
+        db.query(Perfume.id, Perfume.name, Perfume.brand_name)
+        .order_by(Perfume.view_count.desc(), Perfume.id.desc())
+        .all()
+    )
+    brands = db.query(Brand.id, Brand.name).order_by(Brand.name.asc()).all()
+    return (
+        # 이름 일치를 브랜드 일치보다 우선 (기존 relevance 가중치 10:5 와 같은 비율)
+        BM25Index(
+            [p.id for p in perfumes],
+            ([p.name or "" for p in perfumes], [p.brand_name or "" for p in perfumes]),
+            (1.0, 0.5),
+        ),
+        BM25Index([b.id for b in brands], ([b.name or "" for b in brands],), (1.0,)),
+    )
+
+
+_BM25 = CatalogIndex("search_bm25", _build_bm25, ttl_s=CatalogConfig.INDEX_TTL_S)
+
+
+class BM25Backend(SearchBackend):
+    name = "bm25"
+
+    def search_perfumes(self, db: Session, q: str, limit: int) -> List[Hit]:
+        return _BM25.get()[0].search(q, limit)
+
+    def search_brands(self, db: Session, q: str, limit: int) -> List[Hit]:
+        return _BM25.get()[1].search(q, limit)
+
+    def perfume_filter(self, db: Session, q: str):
+        return Perfume.id.in_(_BM25.get()[0].matching_ids(q))
+
+
+_BACKENDS = {"fulltext": FulltextBackend, "bm25": BM25Backend}
+
+
+@lru_cache(maxsize=1)
+def get_search_backend() -> SearchBackend:
+    name = CatalogConfig.SEARCH_BACKEND
+    if name not in _BACKENDS:
+        raise ValueError(f"unknown CATALOG_SEARCH_BACKEND: {name}")
+    return _BACKENDS[name]()
+
+
+class TextMatch(NamedTuple):
+    where: Any  # 일치 향수 WHERE 조건. None = 일치 없음
+    hits: List[Hit]  # 점수 상위 SEARCH_MAX_HITS (relevance 정렬용, with_scores 일 때만)
+    capped: bool  # where 가 상한 있는 id 목록이고 상한에 닿았음 (일치가 더 있음)
+
+
+def match_perfumes(backend: SearchBackend, db: Session, q: str, with_scores: bool) -> TextMatch:
+    limit = CatalogConfig.SEARCH_MAX_HITS
+    cond = backend.perfume_filter(db, q)
+    if cond is not None:
+        hits = backend.search_perfumes(db, q, limit) if with_scores else []
+        return TextMatch(cond, hits, False)
+    hits = backend.search_perfumes(db, q, limit + 1)
+    capped = len(hits) > limit
+    hits = hits[:limit]
+    return TextMatch(Perfume.id.in_([pid for pid, _ in hits]) if hits else None, hits, capped)
+
+
+def relevance_expr(column, hits: Sequence[Hit], scale: float = 10.0):
+    """
+    백엔드 점수를 0~scale 로 정규화한 SQL 식 (id → 점수 CASE). hits 밖의 행은 0.
+    ORDER BY 에서 인기도 보정 항과 더해 쓰기 위함
+    """
+    top = max((s for _, s in hits), default=0.0) or 1.0
+    return case({pid: round(scale * s / top, 4) for pid, s in hits}, value=column, else_=0)
@@ -0,0 +1,258 @@
+# backend/app/services/catalog/similarity.py
+"""
+카탈로그 유사도 엔진 (numpy/scipy 희소 행렬).
+- 특성 행렬 X: 향수 × (어코드 ∪ 역할별 노트) 0/1 CSR. 열은 그룹(accord/top/middle/base/general)별로 이어 붙임
+  "any" = 역할 무시 노트 이름 (역할 열 → 이름 열 매핑 행렬 곱으로 유도)
+- 커널: 질의 하나(또는 블록)를 전체 향수에 대해 한 번의 행렬 연산으로 점수화
+    jaccard_rows / jaccard_terms  : |A∩B| / |A∪B|
+    weighted_overlap              : Σ 가중치(겹친 항목) / Σ 가중치(질의 전체)   (취향 accords 유사도)
+    cosine                        : 가중 질의 벡터 · 0/1 행 / (‖q‖·‖row‖)
+- 라우트용 수치 열: 계절 점수(n×4)/안정성, 상황 점수, 조회/찜/구매 수
+- 유사 향수: 어코드/탑노트/전체노트 Jaccard 가중합 (0.6 / 0.2 / 0.2)
+    rebuild_neighbors(): 오프라인 배치로 향수마다 top-K 를 perfume_neighbor 에 저장
+    (python -m app.scripts.build_perfume_neighbors)
+    similar_on_demand(): perfume_neighbor 에 아직 없는 향수 즉석 계산
+- get_feature_matrix(): 요청 경로용 인메모리 행렬 (index_cache, 카탈로그 바뀌면 백그라운드 재빌드)
+행 순서는 인기순(view_count, created_at) → 점수 동점이면 인기 높은 향수가 앞.
+"""
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import CatalogConfig
+from app.models.perfume import Perfume
+from app.models.perfume_neighbor import PerfumeNeighbor
+from app.services.seasonal_recommendation_service import SEASONS, season_score_map
+from .index_cache import CatalogIndex
+
+NOTE_ROLES = ("top", "middle", "base", "general")
+GROUPS = ("accord",) + NOTE_ROLES
+SIMILAR_WEIGHTS = {"accord": 0.6, "top": 0.2, "any": 0.2}
+
+
+def _note_names(notes: Any) -> List[str]:
+    # [{"name": "...", "imageUrl": "..."}, ...] 에서 name 만
+    return [n.get("name") for n in (notes or []) if isinstance(n, dict) and n.get("name")]
+
+
+def perfume_terms(p) -> Dict[str, set]:
+    """그룹별 항목 집합. p 는 Perfume 또는 같은 컬럼을 가진 Row"""
+    terms = {
+        "accord": {a for a in (p.main_accords or []) if isinstance(a, str)},
+        "top": set(_note_names(p.top_notes)),
+        "middle": set(_note_names(p.middle_notes)),
+        "base": set(_note_names(p.base_notes)),
+        "general": {n for n in (p.general_notes or []) if isinstance(n, str)},
+    }
+    terms["any"] = set().union(*(terms[r] for r in NOTE_ROLES))
+    return terms
+
+
+def _occasion_map(occasion_ranking: Any) -> Dict[str, float]:
+    out = {}
+    for item in occasion_ranking or []:
+        if isinstance(item, dict) and item.get("name"):
+            out[item["name"]] = float(item.get("score") or 0.0)
+    return out
+
+
+def _csr(term_sets: Sequence[Iterable[str]], vocab: Dict[str, int]) -> sparse.csr_matrix:
+    indptr, indices = [0], []
+    for s in term_sets:
+        indices += [vocab.setdefault(t, len(vocab)) for t in s]
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(term_sets), max(1, len(vocab))))
+
+
+class FeatureMatrix:
+    def __init__(self, rows: Sequence[Any]):
+        """rows: 인기순 Perfume Row (id, gender, 카운터, 계절/상황 랭킹, 어코드/노트 JSON)"""
+        n = len(rows)
+        self.ids: List[bytes] = [r.id for r in rows]
+        self.row_of: Dict[bytes, int] = {pid: i for i, pid in enumerate(self.ids)}
+        self.genders = np.array([r.gender or "" for r in rows], dtype=object)
+
+        # 수치 열
+        self.view_count = np.array([r.view_count or 0 for r in rows], dtype=np.float64)
+        self.wish_count = np.array([r.wish_count or 0 for r in rows], dtype=np.float64)
+        self.purchase_count = np.array([r.purchase_count or 0 for r in rows], dtype=np.float64)
+        seasons = [season_score_map(r.season_ranking) for r in rows]
+        self.season = np.array([[s[k] for k in SEASONS] for s in seasons], dtype=np.float64).reshape(n, len(SEASONS))
+        std = self.season.std(axis=1)
+        # calc_stability 와 동일: 1/std (소수 셋째 자리), std == 0 이면 1.0
+        self.stability = np.where(std == 0, 1.0, np.round(1.0 / np.where(std == 0, 1.0, std), 3))
+        occ = [_occasion_map(r.occasion_ranking) for r in rows]
+        self.occasion: Dict[str, np.ndarray] = {
+            name: np.array([o.get(name, 0.0) for o in occ], dtype=np.float64)
+            for name in sorted(set().union(*occ))
+        }
+
+        # 특성 행렬: 그룹별 열 블록을 이어 붙인 X + 그룹별 뷰
+        terms = [perfume_terms(r) for r in rows]
+        self.vocab: Dict[str, Dict[str, int]] = {}
+        self.groups: Dict[str, sparse.csr_matrix] = {}
+        for g in GROUPS:
+            self.vocab[g] = {}
+            self.groups[g] = _csr([t[g] for t in terms], self.vocab[g])
+        self.X = sparse.hstack([self.groups[g] for g in GROUPS], format="csr")
+
+        # any: 역할별 노트 열 → 노트 이름 열 (M) 곱 후 0/1
+        any_vocab: Dict[str, int] = {}
+        blocks = []
+        for r in NOTE_ROLES:
+            cols = sorted(self.vocab[r].items(), key=lambda kv: kv[1])
+            m_rows = [c for _, c in cols]
+            m_cols = [any_vocab.setdefault(name, len(any_vocab)) for name, _ in cols]
+            blocks.append((r, m_rows, m_cols))
+        width = max(1, len(any_vocab))
+        acc = sparse.csr_matrix((n, width), dtype=np.float64)
+        for r, m_rows, m_cols in blocks:
+            M = sparse.csr_matrix(
+                (np.ones(len(m_rows)), (m_rows, m_cols)), shape=(self.groups[r].shape[1], width)
+            )
+            acc = acc + self.groups[r] @ M
+        acc.data[:] = 1.0
+        self.vocab["any"] = any_vocab
+        self.groups["any"] = acc.tocsr()
+
+        self.sizes = {g: np.diff(X.indptr).astype(np.float64) for g, X in self.groups.items()}
+        self._T = {g: X.T.tocsr() for g, X in self.groups.items()}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ---------------------------------------------
+    # 커널
+    # ---------------------------------------------
+    def query_vector(self, group: str, weights: Mapping[str, float]) -> np.ndarray:
+        """{항목: 가중치} → 그룹 어휘 공간 밀집 벡터 (어휘에 없는 항목은 버림)"""
+        vocab = self.vocab[group]
+        q = np.zeros(self.groups[group].shape[1], dtype=np.float64)
+        for t, w in weights.items():
+            j = vocab.get(t)
+            if j is not None:
+                q[j] += float(w)
+        return q
+
+    @staticmethod
+    def _jaccard(inter: np.ndarray, size_q: np.ndarray, size_all: np.ndarray) -> np.ndarray:
+        union = size_q[:, None] + size_all[None, :] - inter
+        return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+    def jaccard_rows(self, group: str, rows: np.ndarray) -> np.ndarray:
+        """카탈로그 향수 rows(b) × 전체(n) Jaccard (b × n)"""
+        inter = (self.groups[group][rows] @ self._T[group]).toarray()
+        return self._jaccard(inter, self.sizes[group][rows], self.sizes[group])
+
+    def jaccard_terms(self, group: str, terms: Iterable[str]) -> np.ndarray:
+        """임의 항목 집합 × 전체(n) Jaccard (n,)"""
+        terms = set(terms)
+        inter = self.groups[group] @ self.query_vector(group, {t: 1.0 for t in terms})
+        return self._jaccard(inter[None, :], np.array([float(len(terms))]), self.sizes[group])[0]
+
+    def weighted_overlap(self, group: str, weights: Mapping[str, float]) -> np.ndarray:
+        """Σ 겹친 항목 가중치 / Σ 질의 가중치 (n,). 분모에는 어휘에 없는 항목 가중치도 포함"""
+        total = sum(float(w) for w in weights.values()) or 1.0
+        return (self.groups[group] @ self.query_vector(group, weights)) / total
+
+    def cosine(self, group: str, weights: Mapping[str, float]) -> np.ndarray:
+        q = self.query_vector(group, weights)
+        qn = float(np.linalg.norm(q))
+        denom = np.sqrt(self.sizes[group]) * qn
+        dot = self.groups[group] @ q
+        return np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0)
+
+    def has_any(self, group: str, terms: Iterable[str]) -> np.ndarray:
+        """항목 중 하나라도 가진 향수 (n,) bool"""
+        return (self.groups[group] @ self.query_vector(group, {t: 1.0 for t in terms})) > 0
+
+    # ---------------------------------------------
+    # 유사 향수
+    # ---------------------------------------------
+    def similar_rows(self, rows: np.ndarray) -> np.ndarray:
+        out = np.zeros((len(rows), len(self)), dtype=np.float64)
+        for g, w in SIMILAR_WEIGHTS.items():
+            out += w * self.jaccard_rows(g, rows)
+        return out
+
+    def similar_terms(self, terms: Mapping[str, set]) -> np.ndarray:
+        out = np.zeros(len(self), dtype=np.float64)
+        for g, w in SIMILAR_WEIGHTS.items():
+            out += w * self.jaccard_terms(g, terms[g])
+        return out
+
+    def similar_top_k(self, scores: np.ndarray, k: int, gender: Optional[str], exclude: Optional[int]):
+        """점수 > 0, (gender 가 있으면) 같은 성별, 자기 자신 제외"""
+        keep = scores > 0
+        if gender:
+            keep &= self.genders == gender
+        if exclude is not None:
+            keep[exclude] = False
+        return self.top_k(scores, k, keep)
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int, keep: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """점수 내림차순 상위 k (동점은 행 순서 = 인기순)"""
+        cand = np.flatnonzero(keep) if keep is not None else np.arange(len(scores))
+        if len(cand) > k:
+            part = np.argpartition(-scores[cand], k - 1)[:k]
+            # argpartition 경계 동점 처리: k 번째 점수 이상은 모두 후보로 두고 정렬
+            cand = cand[scores[cand] >= scores[cand[part]].min()]
+        order = cand[np.lexsort((cand, -scores[cand]))][:k]
+        return [(int(i), float(scores[i])) for i in order]
+
+
+def _load_rows(db: Session):
+    return (
+        db.query(
+            Perfume.id, Perfume.gender, Perfume.view_count, Perfume.wish_count, Perfume.purchase_count,
+            Perfume.season_ranking, Perfume.occasion_ranking, Perfume.main_accords, Perfume.top_notes,
+            Perfume.middle_notes, Perfume.base_notes, Perfume.general_notes,
+        )
+        .order_by(Perfume.view_count.desc(), Perfume.created_at.desc(), Perfume.id.desc())
+        .all()
+    )
+
+
+def build_feature_matrix(db: Session) -> FeatureMatrix:
+    return FeatureMatrix(_load_rows(db))
+
+
+_MATRIX = CatalogIndex("similarity", build_feature_matrix, ttl_s=CatalogConfig.INDEX_TTL_S)
+
+
+def get_feature_matrix() -> FeatureMatrix:
+    return _MATRIX.get()
+
+
+def similar_on_demand(base: Perfume, limit: int) -> List[Tuple[bytes, float]]:
+    """perfume_neighbor 에 아직 없는 향수: 인메모리 행렬로 전체 카탈로그 대비 즉석 계산"""
+    m = get_feature_matrix()
+    row = m.row_of.get(base.id)
+    scores = m.similar_rows(np.array([row]))[0] if row is not None else m.similar_terms(perfume_terms(base))
+    return [(m.ids[i], s) for i, s in m.similar_top_k(scores, limit, base.gender, row)]
+
+
+def rebuild_neighbors(db: Session, k: int, block: int, log=print) -> int:
+    """전체 향수의 top-k 이웃을 block 개씩 계산해 perfume_neighbor 교체. 처리한 향수 수 반환"""
+    t0 = time.perf_counter()
+    m = build_feature_matrix(db)
+    n = len(m)
+    for start in range(0, n, block):
+        rows = np.arange(start, min(start + block, n))
+        scores = m.similar_rows(rows)
+        out = []
+        for r, s in zip(rows, scores):
+            for rank, (j, score) in enumerate(m.similar_top_k(s, k, m.genders[r], int(r)), start=1):
+                out.append({"perfume_id": m.ids[r], "rank": rank, "neighbor_id": m.ids[j], "score": round(score, 6)})
+        db.execute(delete(PerfumeNeighbor).where(PerfumeNeighbor.perfume_id.in_([m.ids[r] for r in rows])))
+        if out:
+            db.execute(insert(PerfumeNeighbor), out)
+        db.commit()
+        log(f"[neighbors] {rows[-1] + 1}/{n} ({time.perf_counter() - t0:.1f}s)")
+    return n
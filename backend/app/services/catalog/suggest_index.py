@@ -0,0 +1,113 @@
+# backend/app/services/catalog/suggest_index.py
+"""
+/catalog/suggest 자동완성용 인메모리 인덱스 (향수명 + 브랜드명).
+- 정규화: 소문자(casefold) + 공백 정리
+- 접두(prefix): 정규화 이름 정렬 배열에서 bisect
+- 부분(infix): 2-gram → 항목 id 포스팅. 가장 드문 2-gram 목록만 훑으며 실제 포함 여부 확인
+- 항목 id 는 인기순으로 부여 → id 오름차순 = 인기순이라 상위 limit 개에서 바로 멈출 수 있음
+"""
+import heapq
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import CatalogConfig
+from app.models.brand import Brand
+from app.models.perfume import Perfume
+from .index_cache import CatalogIndex
+
+PREFIX_SCORE = 1.0
+INFIX_SCORE = 0.6
+
+
+def normalize_name(s: str) -> str:
+    return " ".join((s or "").casefold().split())
+
+
+def _grams(s: str, n: int = 2) -> set:
+    return {s[i : i + n] for i in range(len(s) - n + 1)}
+
+
+class SuggestIndex:
+    def __init__(self, entries: List[Tuple[str, str, int]]):
+        """entries: (type, 표시 이름, 인기도). 같은 (type, 정규화 이름)은 인기도 높은 것 하나만"""
+        best: Dict[Tuple[str, str], Tuple[str, str, int]] = {}
+        for typ, name, pop in entries:
+            norm = normalize_name(name)
+            if not norm:
+                continue
+            key = (typ, norm)
+            if key not in best or pop > best[key][2]:
+                best[key] = (typ, name, pop)
+
+        ordered = sorted(best.items(), key=lambda kv: (-kv[1][2], kv[0][1]))
+        self.types = [v[0] for _, v in ordered]
+        self.names = [v[1] for _, v in ordered]
+        self.norms = [k[1] for k, _ in ordered]
+
+        self._by_norm = sorted(range(len(self.norms)), key=lambda i: self.norms[i])
+        self._norm_keys = [self.norms[i] for i in self._by_norm]
+
+        self._postings: Dict[str, List[int]] = {}
+        for i, norm in enumerate(self.norms):  # i 오름차순으로 넣으므로 각 목록은 인기순 정렬
+            for g in _grams(norm):
+                self._postings.setdefault(g, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.norms)
+
+    def _prefix_ids(self, nq: str, limit: int) -> List[int]:
+        lo = bisect_left(self._norm_keys, nq)
+        hi = bisect_left(self._norm_keys, nq + "\U0010ffff")
+        return heapq.nsmallest(limit, self._by_norm[lo:hi])
+
+    def _infix_ids(self, nq: str, limit: int, exclude: set) -> List[int]:
+        lists = [self._postings.get(g) for g in _grams(nq)]
+        if not lists or any(l is None for l in lists):
+            return []
+        out = []
+        for i in min(lists, key=len):
+            if i in exclude or nq not in self.norms[i]:
+                continue
+            out.append(i)
+            if len(out) >= limit:
+                break
+        return out
+
+    def lookup(self, q: str, limit: int = 8) -> List[Dict[str, object]]:
+        """접두 일치(인기순) → 부분 일치(인기순) 순서로 최대 limit 개"""
+        nq = normalize_name(q)
+        if not nq:
+            return []
+        prefix = self._prefix_ids(nq, limit)
+        hits = [(i, PREFIX_SCORE) for i in prefix]
+        if len(hits) < limit:
+            hits += [(i, INFIX_SCORE) for i in self._infix_ids(nq, limit - len(hits), set(prefix))]
+        return [{"type": self.types[i], "name": self.names[i], "score": score} for i, score in hits]
+
+
+def build_suggest_index(db: Session) -> SuggestIndex:
+    # 향수명: 이름별 최대 조회수 / 브랜드명: 소속 향수 조회수 합
+    perfumes = (
+        db.query(Perfume.name, func.coalesce(func.max(Perfume.view_count), 0))
+        .group_by(Perfume.name)
+        .all()
+    )
+    brands = (
+        db.query(Brand.name, func.coalesce(func.sum(Perfume.view_count), 0))
+        .outerjoin(Perfume, Perfume.brand_id == Brand.id)
+        .group_by(Brand.id, Brand.name)
+        .all()
+    )
+    entries = [("perfume", name, int(pop or 0)) for name, pop in perfumes]
+    entries += [("brand", name, int(pop or 0)) for name, pop in brands]
+    return SuggestIndex(entries)
+
+
+_SUGGEST = CatalogIndex("suggest", build_suggest_index, ttl_s=CatalogConfig.INDEX_TTL_S)
+
+
+def get_suggest_index() -> SuggestIndex:
+    return _SUGGEST.get()
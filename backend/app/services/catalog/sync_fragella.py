@@ -36,6 +36,7 @@ load_dotenv(find_dotenv(), override=False)
 from app.core.db import SessionLocal
 from app.models import Brand, Perfume
 from app.services.catalog.fragella_service import FragellaClient, FragellaError
+from app.services.catalog.taxonomy import TaxonomySync
 
 
 def log(*args):
@@ -117,10 +118,11 @@ def map_fragella_item(it: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def upsert_one(db, brand: Brand, mapped: Dict[str, Any]) -> Tuple[bool, bool]:
+def upsert_one(db, brand: Brand, mapped: Dict[str, Any], taxonomy: TaxonomySync | None = None) -> Tuple[bool, bool]:
     """
     반환: (created, updated)
     - 외부 키는 (external_source, external_id) 로 고정
+    - taxonomy 가 있으면 어코드/노트 정규화 테이블도 같은 트랜잭션에서 갱신
     """
     from sqlalchemy import and_
     created = updated = False
@@ -186,6 +188,9 @@ def upsert_one(db, brand: Brand, mapped: Dict[str, Any]) -> Tuple[bool, bool]:
             p.purchase_url = mapped["purchase_url"] or p.purchase_url
         updated = True
 
+    if taxonomy is not None and not DRY_RUN:
+        taxonomy.sync(p)
+
     return created, updated
 
 
@@ -207,6 +212,7 @@ def sync_top_brands():
     total_updated = 0
 
     with SessionLocal() as db:
+        taxonomy = TaxonomySync(db)
         for brand_name in brands_to_sync:
             try:
                 log(f"  - syncing brand: {brand_name} ...")
@@ -229,13 +235,14 @@ def sync_top_brands():
                     if not mapped["name"] or not mapped["brand_name"]:
                         continue
 
-                    c, u = upsert_one(db, brand, mapped)
+                    c, u = upsert_one(db, brand, mapped, taxonomy)
                     created_cnt += 1 if c else 0
                     updated_cnt += 1 if (u and not c) else 0
 
                     time.sleep(SLEEP_SEC)
 
                 if not DRY_RUN:
+                    taxonomy.flush_counts()
                     db.commit()
 
                 total_created += created_cnt
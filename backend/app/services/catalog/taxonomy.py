@@ -0,0 +1,237 @@
+# backend/app/services/catalog/taxonomy.py
+"""
+향수 어코드/노트 정규화 테이블(accord, perfume_accord, note, perfume_note) 유지 + 필터 조건.
+- Perfume 의 JSON 컬럼(main_accords, top/middle/base/general_notes)이 원본, 테이블은 검색용 파생 데이터
+- TaxonomySync.sync(perfume): 한 향수의 링크를 JSON 과 같게 맞춤 (없는 어코드/노트는 생성, 바뀐 링크만 추가/삭제)
+- backfill_taxonomy(db): 전체 향수를 id 순 배치로 동기화 (python -m app.scripts.backfill_taxonomy)
+- Fragella 동기화(sync_fragella.upsert_one)에서 향수를 저장할 때마다 sync 호출
+- Accord.occurrence / Note.occurrence = 링크 수. sync 가 추가/삭제한 링크만큼 증감을 모았다가
+  flush_counts() 에서 같은 증감끼리 UPDATE 한 번. 어긋나면 reconcile_occurrences() 로 다시 계산
+- 필터: (accord_id, perfume_id) / (note_id, perfume_id) 인덱스로 일치 향수 id 를 모은 뒤
+  GROUP BY perfume_id HAVING COUNT(DISTINCT ..) = 요청 개수 → 여러 어코드 AND 조건도 인덱스 조회 한 번
+"""
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, or_, select, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import CatalogConfig
+from app.models.accord import Accord
+from app.models.note import Note
+from app.models.perfume import Perfume
+from app.models.perfume_accord import PerfumeAccord
+from app.models.perfume_note import NoteRole, PerfumeNote
+
+_ACCORD_NAME_LEN = 50
+_NOTE_NAME_LEN = 100
+
+
+def _unique(names: Iterable[str], max_len: int) -> List[str]:
+    """공백 정리 + 대소문자 무시 중복 제거 (name 컬럼 콜레이션이 대소문자 무시). 순서 유지"""
+    seen: Set[str] = set()
+    out = []
+    for n in names:
+        if not isinstance(n, str):
+            continue
+        n = " ".join(n.split())
+        if not n or len(n) > max_len or n.casefold() in seen:
+            continue
+        seen.add(n.casefold())
+        out.append(n)
+    return out
+
+
+def accord_names(perfume: Perfume) -> List[str]:
+    return _unique(perfume.main_accords or [], _ACCORD_NAME_LEN)
+
+
+def note_roles(perfume: Perfume) -> List[Tuple[NoteRole, str]]:
+    """(역할, 노트명). 상세 노트는 [{"name": ...}], general_notes 는 문자열 배열"""
+    out = []
+    for role, arr in (
+        (NoteRole.top, perfume.top_notes),
+        (NoteRole.middle, perfume.middle_notes),
+        (NoteRole.base, perfume.base_notes),
+        (NoteRole.general, perfume.general_notes),
+    ):
+        names = [(it.get("name") if isinstance(it, dict) else it) for it in (arr or [])]
+        out += [(role, n) for n in _unique(names, _NOTE_NAME_LEN)]
+    return out
+
+
+class TaxonomySync:
+    """한 세션 안에서 여러 향수를 동기화할 때 이름 → id 를 재사용"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._accord_ids: Dict[str, int] = {}
+        self._note_ids: Dict[str, int] = {}
+        self._accord_delta: Counter = Counter()
+        self._note_delta: Counter = Counter()
+
+    def _resolve(self, model, names: Sequence[str], cache: Dict[str, int]) -> Dict[str, int]:
+        missing = [n for n in names if n.casefold() not in cache]
+        if missing:
+            for row_id, name in self.db.query(model.id, model.name).filter(model.name.in_(missing)):
+                cache[name.casefold()] = row_id
+            created = [model(name=n, occurrence=0) for n in missing if n.casefold() not in cache]
+            if created:
+                self.db.add_all(created)
+                self.db.flush()
+                for obj in created:
+                    cache[obj.name.casefold()] = obj.id
+        return {n.casefold(): cache[n.casefold()] for n in names}
+
+    def sync(self, perfume: Perfume) -> None:
+        if perfume.id is None:
+            self.db.flush()  # 새 향수: id(uuid4) 는 flush 때 채워짐
+
+        # 어코드
+        ids = self._resolve(Accord, accord_names(perfume), self._accord_ids)
+        want = set(ids.values())
+        have = {
+            a for (a,) in self.db.query(PerfumeAccord.accord_id).filter(PerfumeAccord.perfume_id == perfume.id)
+        }
+        if have - want:
+            self.db.query(PerfumeAccord).filter(
+                PerfumeAccord.perfume_id == perfume.id,
+                PerfumeAccord.accord_id.in_(have - want),
+            ).delete(synchronize_session=False)
+        self.db.add_all(PerfumeAccord(perfume_id=perfume.id, accord_id=a) for a in want - have)
+        self._accord_delta.update({a: 1 for a in want - have})
+        self._accord_delta.subtract({a: 1 for a in have - want})
+
+        # 노트 (역할별)
+        roles = note_roles(perfume)
+        ids = self._resolve(Note, _unique([n for _, n in roles], _NOTE_NAME_LEN), self._note_ids)
+        want_notes = {(ids[n.casefold()], role) for role, n in roles}
+        rows = self.db.query(PerfumeNote.id, PerfumeNote.note_id, PerfumeNote.role).filter(
+            PerfumeNote.perfume_id == perfume.id
+        )
+        have_notes = {}
+        for row_id, note_id, role in rows:
+            have_notes[(note_id, NoteRole(role))] = row_id
+        stale = [key for key in have_notes if key not in want_notes]
+        if stale:
+            self.db.query(PerfumeNote).filter(
+                PerfumeNote.id.in_([have_notes[key] for key in stale])
+            ).delete(synchronize_session=False)
+        added = [key for key in want_notes if key not in have_notes]
+        self.db.add_all(PerfumeNote(perfume_id=perfume.id, note_id=note_id, role=role) for note_id, role in added)
+        for note_id, _ in added:
+            self._note_delta[note_id] += 1
+        for note_id, _ in stale:
+            self._note_delta[note_id] -= 1
+
+    def flush_counts(self) -> None:
+        """모아 둔 occurrence 증감 반영. 커밋 직전에 호출"""
+        for model, delta in ((Accord, self._accord_delta), (Note, self._note_delta)):
+            by_delta = defaultdict(list)
+            for row_id, d in delta.items():
+                if d:
+                    by_delta[d].append(row_id)
+            for d, ids in by_delta.items():
+                self.db.execute(
+                    update(model)
+                    .where(model.id.in_(ids))
+                    .values(occurrence=func.coalesce(model.occurrence, 0) + d)
+                    .execution_options(synchronize_session=False)
+                )
+            delta.clear()
+
+
+def reconcile_occurrences(db: Session) -> None:
+    """링크 테이블에서 occurrence 를 다시 계산 (동시 동기화 등으로 증감이 어긋났을 때)"""
+    db.execute(text(
+        "UPDATE accord a LEFT JOIN "
+        "(SELECT accord_id, COUNT(*) AS c FROM perfume_accord GROUP BY accord_id) x ON x.accord_id = a.id "
+        "SET a.occurrence = COALESCE(x.c, 0)"
+    ))
+    db.execute(text(
+        "UPDATE note n LEFT JOIN "
+        "(SELECT note_id, COUNT(*) AS c FROM perfume_note GROUP BY note_id) x ON x.note_id = n.id "
+        "SET n.occurrence = COALESCE(x.c, 0)"
+    ))
+    db.commit()
+
+
+def backfill_taxonomy(db: Session, batch_size: int = 500, log=print) -> int:
+    """전체 향수를 id 순으로 batch_size 개씩 동기화하고 배치마다 커밋. 처리한 향수 수 반환"""
+    syncer = TaxonomySync(db)
+    last_id: Optional[bytes] = None
+    done = 0
+    while True:
+        q = db.query(Perfume).order_by(Perfume.id.asc())
+        if last_id is not None:
+            q = q.filter(Perfume.id > last_id)
+        batch = q.limit(batch_size).all()
+        if not batch:
+            break
+        for p in batch:
+            syncer.sync(p)
+        syncer.flush_counts()
+        db.commit()
+        done += len(batch)
+        last_id = batch[-1].id
+        log(f"[taxonomy] synced {done} perfumes")
+        db.expunge_all()
+    return done
+
+
+# -------------------------------------------------
+# 필터 조건
+# -------------------------------------------------
+def _having_all(link_id_col, link_perfume_col, name_col, names: Sequence[str], join):
+    """names 를 모두 가진 향수 id 서브쿼리"""
+    return (
+        select(link_perfume_col)
+        .join(*join)
+        .where(name_col.in_(names))
+        .group_by(link_perfume_col)
+        .having(func.count(func.distinct(link_id_col)) == len(names))
+    )
+
+
+def accord_filters(names: Sequence[str]) -> list:
+    """main_accords 에 names 가 모두 포함된 향수"""
+    names = _unique(names, _ACCORD_NAME_LEN)
+    if not names:
+        return []
+    if not CatalogConfig.TAXONOMY_FILTERS:
+        # 백필 전 배포용: JSON_CONTAINS(main_accords, '["woody"]')
+        return [func.json_contains(Perfume.main_accords, f'["{a}"]') for a in names]
+    sub = _having_all(
+        PerfumeAccord.accord_id,
+        PerfumeAccord.perfume_id,
+        Accord.name,
+        names,
+        (Accord, Accord.id == PerfumeAccord.accord_id),
+    )
+    return [Perfume.id.in_(sub)]
+
+
+def note_filters(names: Sequence[str]) -> list:
+    """노트 각각이 top/middle/base/general 중 어디든 들어 있는 향수"""
+    names = _unique(names, _NOTE_NAME_LEN)
+    if not names:
+        return []
+    if not CatalogConfig.TAXONOMY_FILTERS:
+        # 백필 전 배포용: JSON_SEARCH(path, 'one', 'Bergamot') IS NOT NULL
+        return [
+            or_(
+                func.json_search(Perfume.top_notes, "one", nt) != None,
+                func.json_search(Perfume.middle_notes, "one", nt) != None,
+                func.json_search(Perfume.base_notes, "one", nt) != None,
+                func.json_search(Perfume.general_notes, "one", nt) != None,
+            )
+            for nt in names
+        ]
+    sub = _having_all(
+        PerfumeNote.note_id,
+        PerfumeNote.perfume_id,
+        Note.name,
+        names,
+        (Note, Note.id == PerfumeNote.note_id),
+    )
+    return [Perfume.id.in_(sub)]
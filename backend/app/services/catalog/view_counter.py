@@ -0,0 +1,122 @@
+# backend/app/services/catalog/view_counter.py
+"""
+향수 상세 조회수(view_count) write-behind 버퍼.
+- 요청 경로는 add() 로 메모리 카운터만 올림 (락은 dict 갱신 동안만, DB 행 잠금 없음)
+- 백그라운드 스레드가 flush_interval_s 마다 모인 증분을 UPDATE 한 번으로 반영
+    UPDATE perfume SET view_count = view_count + CASE id WHEN .. THEN n .. END WHERE id IN (..)
+- updated_at 은 그대로 둠 → 조회수만 바뀐 걸로 카탈로그 인메모리 인덱스(index_cache)가 재빌드되지 않음
+- 반영 전 증분은 pending() 으로 응답에 더해서 보여줌 (flush 중인 몫 포함)
+- 반영 실패 시 증분을 버퍼에 되돌려 다음 주기에 재시도. 종료 훅(main.py)에서 close() 로 남은 증분 반영
+- flush_interval_s <= 0 이면 버퍼 없이 요청마다 바로 반영 (기존 동작)
+- 프로세스별 버퍼라 비정상 종료 시 마지막 주기 몫은 유실될 수 있음 (조회수 용도로는 허용)
+"""
+import logging
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import case, func, update
+
+from app.core.config import CatalogConfig
+from app.core.db import SessionLocal
+from app.models.perfume import Perfume
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    def __init__(self, flush_interval_s: float = 5.0, batch_size: int = 500):
+        self.flush_interval_s = flush_interval_s
+        self.batch_size = max(1, batch_size)
+        self._pending: Counter = Counter()
+        self._inflight: Counter = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, perfume_id: bytes, n: int = 1) -> int:
+        """증분 기록. 반환: 호출 전에 읽은 view_count 에 더해 보여줄 조회수 (아직 반영 안 된 몫)"""
+        self._ensure_started()
+        with self._lock:
+            self._pending[perfume_id] += n
+        if self.flush_interval_s <= 0:  # 주기 0: 버퍼 없이 바로 반영
+            self.flush()
+            return n
+        return self.pending(perfume_id)
+
+    def pending(self, perfume_id: bytes) -> int:
+        with self._lock:
+            return self._pending.get(perfume_id, 0) + self._inflight.get(perfume_id, 0)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None or self.flush_interval_s <= 0:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="catalog-view-counter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval_s):
+            self.flush()
+
+    def flush(self) -> int:
+        """모인 증분을 DB 에 반영. 반환: 반영한 향수 수"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._inflight, self._pending = self._pending, Counter()
+            batch = self._inflight
+            try:
+                _apply(batch, self.batch_size)
+            except Exception as e:
+                logger.warning("[VIEW] flush failed, retry next cycle (%d perfumes): %s", len(batch), e)
+                with self._lock:
+                    self._pending.update(batch)
+                    self._inflight = Counter()
+                return 0
+            with self._lock:
+                self._inflight = Counter()
+            return len(batch)
+
+    def close(self) -> None:
+        """종료 시: 스레드 정지 후 남은 증분 반영"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval_s + 5)
+        self.flush()
+
+
+def _apply(counts: Counter, batch_size: int) -> None:
+    ids = list(counts)
+    db = SessionLocal()
+    try:
+        for i in range(0, len(ids), batch_size):
+            chunk = ids[i : i + batch_size]
+            db.execute(
+                update(Perfume)
+                .where(Perfume.id.in_(chunk))
+                .values(
+                    view_count=func.coalesce(Perfume.view_count, 0)
+                    + case({pid: counts[pid] for pid in chunk}, value=Perfume.id, else_=0),
+                    updated_at=Perfume.updated_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@lru_cache(maxsize=1)
+def get_view_counter() -> ViewCounter:
+    return ViewCounter(
+        flush_interval_s=CatalogConfig.VIEW_FLUSH_INTERVAL_S,
+        batch_size=CatalogConfig.VIEW_FLUSH_BATCH,
+    )
@@ -0,0 +1,14 @@
+# backend/app/services/text_normalize.py
+"""
+이름 매칭용 텍스트 정규화 (의존성 없음).
+비전 매처(vision/matcher.py)와 카탈로그 오타 허용 검색(catalog/fuzzy_index.py)이 같은 규칙을 쓰도록 여기 둠.
+"""
+import re
+
+
+def normalize_text(s: str) -> str:
+    s = s.upper()
+    s = s.replace("’", "'").replace("‘", "'").replace("`", "'")
+    s = re.sub(r"[^\w\s]", " ", s)  # 특수문자 제거
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
@@ -0,0 +1,138 @@
+# backend/app/services/vision/budget.py
+"""
+요청 단위 시간 예산(deadline) + 단계별 최근 소요시간 통계.
+- 필수 단계(탐지/OCR/품질/매칭)는 항상 실행하고 소요시간만 기록
+- 선택 단계(회전 OCR, 재탐지, OCR 재실행)는 남은 예산이 최근 p90 소요시간을 못 덮으면 건너뛰거나 한 단계 낮춤
+- 건너뛴 단계는 샘플이 안 쌓여 통계가 굳으므로: 연속 _PROBE_EVERY 번 거절되면 한 번은 실행(probe)하고,
+  _MAX_AGE_S 보다 오래된 샘플은 p90 에서 뺌 (콜드 스타트 때의 느린 샘플이 영구히 단계를 막지 않도록)
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .metrics import observe_stage, inc_path
+
+
+_WINDOW = 200      # 단계별로 최근 몇 개 샘플을 볼지
+_MIN_SAMPLES = 5   # 이보다 적으면 통계 없음으로 보고 실행 허용
+_PROBE_EVERY = 20  # 예산 부족으로 연속 이만큼 거절되면 다음 한 번은 실행해서 통계 갱신
+_MAX_AGE_S = 600.0 # 이보다 오래된 샘플은 p90 계산에서 제외
+
+
+class StageStats:
+    """단계별 최근 소요시간(ms) 링버퍼. 프로세스 전역, 스레드 안전"""
+
+    def __init__(self, window: int = _WINDOW, max_age_s: float = _MAX_AGE_S):
+        self._lock = threading.Lock()
+        # (기록 시각 monotonic, ms)
+        self._samples: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._denied: Dict[str, int] = {}
+        self._window = window
+        self._max_age_s = max_age_s
+
+    def record(self, stage: str, ms: float) -> None:
+        with self._lock:
+            q = self._samples.get(stage)
+            if q is None:
+                q = self._samples[stage] = deque(maxlen=self._window)
+            q.append((time.monotonic(), ms))
+            self._denied[stage] = 0
+
+    def p90(self, stage: str) -> Optional[float]:
+        with self._lock:
+            q = self._samples.get(stage)
+            if not q:
+                return None
+            oldest = time.monotonic() - self._max_age_s
+            while q and q[0][0] < oldest:
+                q.popleft()
+            if len(q) < _MIN_SAMPLES:
+                return None
+            data = sorted(ms for _, ms in q)
+        return data[min(len(data) - 1, int(len(data) * 0.9))]
+
+    def should_probe(self, stage: str) -> bool:
+        """예산 부족 거절 1회 기록. 연속 거절이 _PROBE_EVERY 에 닿으면 True (이번엔 실행해서 통계 갱신)"""
+        with self._lock:
+            n = self._denied.get(stage, 0) + 1
+            if n >= _PROBE_EVERY:
+                self._denied[stage] = 0
+                return True
+            self._denied[stage] = n
+            return False
+
+
+STAGE_STATS = StageStats()
+
+
+class ScanBudget:
+    def __init__(self, deadline_ms: Optional[int], started_at: Optional[float] = None, stats: StageStats = STAGE_STATS):
+        self.deadline_ms = deadline_ms if deadline_ms and deadline_ms > 0 else None
+        self.started_at = started_at if started_at is not None else time.time()
+        self.stats = stats
+        self.skipped: List[str] = []
+        self.downgraded: Dict[str, str] = {}
+        self.stages_ms: Dict[str, float] = {}  # 이번 요청의 단계별 소요시간 (같은 단계 여러 번이면 합산)
+
+    def elapsed_ms(self) -> float:
+        return (time.time() - self.started_at) * 1000.0
+
+    def remaining_ms(self) -> Optional[float]:
+        if self.deadline_ms is None:
+            return None
+        return self.deadline_ms - self.elapsed_ms()
+
+    def allows(self, stage: str) -> bool:
+        """
+        남은 예산이 이 단계의 최근 p90을 덮으면 True. deadline 없음/통계 없음이면 True.
+        못 덮어도 연속 거절이 쌓이면 가끔 실행 허용 (남은 예산이 있을 때) → 통계가 갱신될 기회
+        """
+        remaining = self.remaining_ms()
+        if remaining is None:
+            return True
+        cost = self.stats.p90(stage)
+        if cost is None:
+            return remaining > 0
+        if remaining >= cost:
+            return True
+        if remaining > 0 and self.stats.should_probe(stage):
+            inc_path(f"probe_{stage}")
+            return True
+        return False
+
+    def downgrade(self, stage: str, note: str) -> None:
+        self.downgraded[stage] = note
+        inc_path(f"downgrade_{stage}")
+
+    def skip(self, stage: str) -> None:
+        if stage not in self.skipped:
+            self.skipped.append(stage)
+            inc_path(f"skip_{stage}")
+
+    @contextmanager
+    def stage(self, stage: str):
+        """with budget.stage("ocr"): ... → 소요시간을 통계와 이번 요청 report 에 기록"""
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            sec = time.perf_counter() - t
+            ms = sec * 1000.0
+            self.stats.record(stage, ms)
+            self.stages_ms[stage] = self.stages_ms.get(stage, 0.0) + ms
+            observe_stage(stage, sec)
+
+    def observe_total(self, seconds: float) -> None:
+        observe_stage("total", seconds)
+
+    def report(self) -> Dict[str, object]:
+        remaining = self.remaining_ms()
+        return {
+            "deadline_ms": self.deadline_ms,
+            "remaining_ms": int(remaining) if remaining is not None else None,
+            "skipped": list(self.skipped),
+            "downgraded": dict(self.downgraded),
+            "stages_ms": {k: round(v, 1) for k, v in self.stages_ms.items()},
+        }
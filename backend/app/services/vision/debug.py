@@ -1,28 +1,177 @@
 # backend/app/services/vision/debug.py
+"""
+스캔 디버그 오버레이 캡처.
+- 요청 스레드에서는 이미지 참조와 결과 좌표만 큐에 넣음 (복사/그리기/인코딩/쓰기는 백그라운드 스레드)
+- 샘플링(VISION_DEBUG_SAMPLE_RATE) 또는 요청 헤더(X-Vision-Debug: 1)로 강제
+- DEBUG_DIR 은 파일 수/총 용량 상한이 있는 링버퍼: 넘치면 오래된 캡처부터 삭제
+"""
 import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
 import numpy as np
 from app.core.config import VisionConfig
+from .logs import logger
+from .metrics import inc_path
 from .utils import _load_cv2
 
+_SUFFIX = "_overlay.jpg"
 
-def save_overlay(img, bbox, poly, request_id):
+
+def draw_overlay(img, bbox=None, poly=None, roi=None, texts: Optional[List[Dict[str, Any]]] = None):
+    """원본은 건드리지 않고 복사본에 탐지 bbox/마스크/OCR ROI/텍스트 박스를 그림 (좌표는 모두 0~1 정규화)"""
     cv2 = _load_cv2()
 
     dbg = img.copy()
     h, w = img.shape[:2]
 
+    def _rect(b, color, thickness=2):
+        x, y = int(b["x"] * w), int(b["y"] * h)
+        cv2.rectangle(dbg, (x, y), (x + int(b["w"] * w), y + int(b["h"] * h)), color, thickness)
+
     if poly:
         pts = [[int(x * w), int(y * h)] for x, y in poly]
         cv2.polylines(dbg, [np.array(pts, np.int32)], True, (0, 255, 0), 2)
 
     if bbox:
-        bx = int(bbox["x"] * w)
-        by = int(bbox["y"] * h)
-        bw = int(bbox["w"] * w)
-        bh = int(bbox["h"] * h)
-        cv2.rectangle(dbg, (bx, by), (bx + bw, by + bh), (255, 0, 0), 2)
+        _rect(bbox, (255, 0, 0))
+
+    if roi:
+        _rect(roi, (0, 255, 255))
+
+    for t in texts or []:
+        b = t.get("box")
+        if b:
+            _rect(b, (0, 0, 255), 1)
 
+    return dbg
+
+
+def save_overlay(img, bbox, poly, request_id):
+    """동기 저장 (로컬 디버깅용). 서비스 경로에서는 DebugCapture.submit 사용"""
+    cv2 = _load_cv2()
+
+    dbg = draw_overlay(img, bbox, poly)
     os.makedirs(VisionConfig.DEBUG_DIR, exist_ok=True)
-    path = os.path.join(VisionConfig.DEBUG_DIR, f"{request_id}_overlay.jpg")
+    path = os.path.join(VisionConfig.DEBUG_DIR, f"{_safe_id(request_id)}{_SUFFIX}")
     cv2.imwrite(path, dbg)
     return path
+
+
+def _safe_id(request_id: Optional[str]) -> str:
+    # request_id 는 클라이언트 입력 → 파일명에 쓸 수 있는 문자만
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", request_id or "anon")[:64]
+
+
+class DebugCapture:
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = 0.0,
+        max_files: int = 200,
+        max_bytes: int = 200 * 1024 * 1024,
+        max_queue: int = 16,
+        jpeg_quality: int = 80,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_files = max(1, max_files)
+        self.max_bytes = max(1, max_bytes)
+        self.jpeg_quality = jpeg_quality
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max(1, max_queue))
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # (path, size) 오래된 순
+        self._files: deque = deque()
+        self._total = 0
+
+    def should_capture(self, force: bool = False) -> bool:
+        return force or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def submit(self, img, request_id: Optional[str], **overlay) -> Optional[str]:
+        """
+        캡처 예약. 반환: 저장될 파일 이름 (큐가 가득 차면 None).
+        img 는 복사하지 않으므로 호출 뒤에 수정하지 말 것 (파이프라인은 디코드 이미지를 수정하지 않음)
+        """
+        self._ensure_started()
+        name = f"{int(time.time() * 1000)}_{_safe_id(request_id)}{_SUFFIX}"
+        try:
+            self._queue.put_nowait({"img": img, "name": name, "overlay": overlay})
+        except queue.Full:
+            inc_path("debug_capture_dropped")
+            return None
+        inc_path("debug_capture")
+        return name
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="vision-debug", daemon=True)
+                self._thread.start()
+
+    def _load_existing(self) -> None:
+        """재시작 후에도 상한이 지켜지도록 기존 캡처를 링버퍼에 반영"""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(_SUFFIX):
+                st = entry.stat()
+                found.append((st.st_mtime, entry.path, st.st_size))
+        for _, path, size in sorted(found):
+            self._files.append((path, size))
+            self._total += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._files and (len(self._files) > self.max_files or self._total > self.max_bytes):
+            path, size = self._files.popleft()
+            self._total -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _write(self, job: Dict[str, Any]) -> None:
+        cv2 = _load_cv2()
+        dbg = draw_overlay(job["img"], **job["overlay"])
+        ok, buf = cv2.imencode(".jpg", dbg, [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality])
+        if not ok:
+            raise ValueError("jpeg encode failed")
+        path = os.path.join(self.directory, job["name"])
+        with open(path, "wb") as f:
+            f.write(buf.tobytes())
+        self._files.append((path, buf.nbytes))
+        self._total += buf.nbytes
+        self._evict()
+
+    def _run(self) -> None:
+        try:
+            self._load_existing()
+        except OSError as e:
+            logger.warning("[DEBUG] capture dir unavailable (%s): %s", self.directory, e)
+        while True:
+            job = self._queue.get()
+            try:
+                self._write(job)
+            except Exception as e:
+                logger.warning("[DEBUG] capture failed (%s): %s", job["name"], e)
+                inc_path("debug_capture_failed")
+
+
+@lru_cache(maxsize=1)
+def get_debug_capture() -> DebugCapture:
+    return DebugCapture(
+        directory=VisionConfig.DEBUG_DIR,
+        sample_rate=getattr(VisionConfig, "DEBUG_SAMPLE_RATE", 0.0),
+        max_files=getattr(VisionConfig, "DEBUG_MAX_FILES", 200),
+        max_bytes=int(getattr(VisionConfig, "DEBUG_MAX_MB", 200) * 1024 * 1024),
+        max_queue=getattr(VisionConfig, "DEBUG_QUEUE", 16),
+    )
@@ -5,9 +5,11 @@ import numpy as np
 import onnxruntime as ort
 
 from app.core.config import VisionConfig
-from .preprocess import letterbox
+from .preprocess import letterbox_blob
 from .postprocess import mask_to_polygon
 from .utils import clamp01, _load_cv2
+from .logs import logger, vlog
+from .metrics import inc_path
 
 
 class BottleDetector:
@@ -22,26 +24,26 @@ class BottleDetector:
         try:
             pt_path = getattr(VisionConfig, "BOTTLE_MODEL_PT_PATH", "") or ""
             if pt_path and os.path.exists(pt_path):
-                print("[BottleDetector] try PT:", os.path.abspath(pt_path))
+                logger.info("[BottleDetector] try PT: %s", os.path.abspath(pt_path))
 
                 try:
                     from ultralytics import YOLO  # 여기서만 import
                 except Exception as e:
-                    print("[BottleDetector] ultralytics import fail, skip PT:", e)
+                    logger.warning("[BottleDetector] ultralytics import fail, skip PT: %s", e)
                     YOLO = None
 
                 if YOLO is not None:
                     self.yolo = YOLO(pt_path)
                     self.model_loaded = True
                     try:
-                        print("[BottleDetector] model.names:", getattr(self.yolo.model, "names", None))
+                        logger.info("[BottleDetector] model.names: %s", getattr(self.yolo.model, "names", None))
                     except Exception:
                         pass
-                    print("[BottleDetector] PyTorch model loaded")
+                    logger.info("[BottleDetector] PyTorch model loaded")
             else:
-                print("[BottleDetector] PT file not found:", pt_path)
+                logger.info("[BottleDetector] PT file not found: %s", pt_path)
         except Exception as e:
-            print("YOLO PT load fail:", e)
+            logger.warning("[BottleDetector] YOLO PT load fail: %s", e)
 
         # 2 PT 실패면 ONNX 로드
         if not self.model_loaded:
@@ -49,21 +51,21 @@ class BottleDetector:
                 onnx_path = model_path
                 if onnx_path and os.path.exists(onnx_path):
                     providers = ["CPUExecutionProvider"] if device == "cpu" else ["CUDAExecutionProvider", "CPUExecutionProvider"]
-                    print("[BottleDetector] try ONNX:", os.path.abspath(onnx_path))
+                    logger.info("[BottleDetector] try ONNX: %s", os.path.abspath(onnx_path))
                     self.session = ort.InferenceSession(onnx_path, providers=providers)
                     self.model_loaded = True
-                    print("[BottleDetector] ONNX model loaded")
+                    logger.info("[BottleDetector] ONNX model loaded")
                 else:
-                    print("[BottleDetector] ONNX file not found:", onnx_path)
+                    logger.warning("[BottleDetector] ONNX file not found: %s", onnx_path)
             except Exception as e:
-                print("ONNX load fail:", e)
+                logger.warning("[BottleDetector] ONNX load fail: %s", e)
 
     def ready(self) -> bool:
         return self.model_loaded
 
     def detect(self, img_bgr, guide_box: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         h, w = img_bgr.shape[:2]
-        print(f"[LOG][DETECT] 입력 이미지 크기: {img_bgr.shape}")
+        vlog("[DETECT] 입력 이미지 크기: %s", img_bgr.shape)
 
         if not self.ready():
             return {
@@ -96,8 +98,10 @@ class BottleDetector:
 
                 res = run_pt(imgsz_primary, classes=[39])
                 if res.boxes is None or len(res.boxes) == 0:
+                    inc_path("detect_retry_classes")
                     res = run_pt(imgsz_retry, classes=[39, 40, 41, 75])
                 if res.boxes is None or len(res.boxes) == 0:
+                    inc_path("detect_retry_any")
                     res = run_pt(imgsz_retry, classes=None, conf=0.03)
 
                 if res.boxes is None or len(res.boxes) == 0:
@@ -133,9 +137,9 @@ class BottleDetector:
                 area_ratio = bbox["w"] * bbox["h"]
                 ar = (bbox["h"] + 1e-6) / (bbox["w"] + 1e-6)
                 if area_ratio < 0.02 or bbox["h"] < 0.1 or ar < 0.3:
-                    print(
-                        f"[LOG][DETECT][PT] invalid bbox -> area_ratio={area_ratio:.4f}, "
-                        f"h={bbox['h']:.3f}, ar={ar:.3f}"
+                    vlog(
+                        "[DETECT][PT] invalid bbox -> area_ratio=%.4f, h=%.3f, ar=%.3f",
+                        area_ratio, bbox["h"], ar,
                     )
                     return {
                         "present": False,
@@ -160,15 +164,16 @@ class BottleDetector:
                     "inside_ratio": 1.0,
                 }
             except Exception as e:
-                print("PT inference error:", e)
+                logger.warning("[DETECT] PT inference error: %s", e)
+                inc_path("detect_onnx_fallback")
 
         # ONNX 폴백
         try:
             cv2 = _load_cv2()
 
-            img_resized, scale, dx, dy, (orig_h, orig_w) = letterbox(img_bgr, (640, 640))
-            blob = img_resized[:, :, ::-1].transpose(2, 0, 1)
-            blob = np.expand_dims(blob, 0).astype(np.float32) / 255.0
+            blob, scale, dx, dy, (orig_h, orig_w) = letterbox_blob(
+                img_bgr, (640, 640), interpolation=VisionConfig.LETTERBOX_INTERP
+            )
             out = self.session.run(None, {"images": blob})
             pred_mask = out[0][0]
             mask_bin = (pred_mask > 0.5).astype(np.uint8) * 255
@@ -216,9 +221,9 @@ class BottleDetector:
 
             # 여기서도 bbox 검증
             if area_ratio < 0.02 or bbox["h"] < 0.1 or ar < 0.3:
-                print(
-                    f"[LOG][DETECT][ONNX] invalid bbox -> area_ratio={area_ratio:.4f}, "
-                    f"h={bbox['h']:.3f}, ar={ar:.3f}"
+                vlog(
+                    "[DETECT][ONNX] invalid bbox -> area_ratio=%.4f, h=%.3f, ar=%.3f",
+                    area_ratio, bbox["h"], ar,
                 )
                 return {
                     "present": False,
@@ -238,7 +243,7 @@ class BottleDetector:
                 "inside_ratio": 1.0,
             }
         except Exception as e:
-            print("ONNX inference error:", e)
+            logger.warning("[DETECT] ONNX inference error: %s", e)
 
         return {
             "present": False,
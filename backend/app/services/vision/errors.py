@@ -0,0 +1,12 @@
+# backend/app/services/vision/errors.py
+"""Vision 공통 예외 (무거운 모듈 import 없이 API 프로세스에서도 쓸 수 있게 분리)"""
+
+
+class ScanError(Exception):
+    """파이프라인 실패 → 라우트에서 HTTP 에러 응답으로 변환"""
+
+    def __init__(self, status_code: int, code: str, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.message = message
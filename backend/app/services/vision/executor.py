@@ -0,0 +1,73 @@
+# backend/app/services/vision/executor.py
+"""
+스캔 파이프라인 전용 bounded executor.
+- 워커 수(동시 실행)와 대기열 길이를 제한해서 이벤트 루프와 다른 API 요청을 보호
+- 대기열이 가득 차면 ScanQueueFull → 라우트에서 503 + Retry-After
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Tuple
+
+from app.core.config import VisionConfig
+
+
+class ScanQueueFull(Exception):
+    pass
+
+
+class ScanExecutor:
+    def __init__(self, workers: int = 2, max_queue: int = 8):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="vision-scan")
+        self._lock = threading.Lock()
+        self._pending = 0  # 실행 중 + 대기 중
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                raise ScanQueueFull()
+            self._pending += 1
+
+    def _release(self, _fut=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Tuple[int, Any]:
+        """
+        fn(*args, **kwargs)를 vision 스레드에서 실행.
+        반환: (queue_ms, 결과). queue_ms 는 워커가 잡기까지 기다린 시간
+        """
+        self._acquire()
+        t_enq = time.perf_counter()
+
+        def _call():
+            queue_ms = int((time.perf_counter() - t_enq) * 1000)
+            return queue_ms, fn(*args, **kwargs)
+
+        try:
+            cf = self._pool.submit(_call)
+        except Exception:
+            self._release()
+            raise
+        # 취소(클라이언트 끊김)돼도 슬롯은 작업이 실제로 끝나거나 취소될 때 반환
+        cf.add_done_callback(self._release)
+        return await asyncio.wrap_future(cf)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_scan_executor() -> ScanExecutor:
+    return ScanExecutor(
+        workers=getattr(VisionConfig, "SCAN_WORKERS", 2),
+        max_queue=getattr(VisionConfig, "SCAN_QUEUE", 8),
+    )
@@ -0,0 +1,75 @@
+# backend/app/services/vision/ipc.py
+"""
+API 프로세스 ↔ vision 워커 프로세스 간 로컬 소켓 프레이밍.
+
+프레임: [헤더 길이 u32][페이로드 길이 u32][헤더 JSON][페이로드 바이트]
+- 헤더: 작은 JSON (op, 파라미터, 결과/에러)
+- 페이로드: 업로드 원본 바이트. 보낼 때는 sendmsg 로 헤더와 함께 넘겨서 이어붙이는 복사를 없애고,
+  받을 때는 미리 할당한 버퍼에 recv_into 로 바로 받아 memoryview 로 넘긴다 (np.frombuffer 까지 복사 없음)
+"""
+import json
+import socket
+import struct
+from typing import Any, Dict, Optional, Tuple, Union
+
+_PREFIX = struct.Struct("!II")
+MAX_HEADER = 4 * 1024 * 1024
+MAX_PAYLOAD = 64 * 1024 * 1024
+
+
+class IPCClosed(ConnectionError):
+    """상대가 프레임 도중(또는 프레임 사이) 연결을 닫음"""
+
+
+def _json_default(o: Any):
+    # numpy 스칼라/배열 (float64 는 float 하위 타입이라 여기 안 옴)
+    if hasattr(o, "tolist"):
+        return o.tolist()
+    if hasattr(o, "item"):
+        return o.item()
+    if isinstance(o, (bytes, bytearray, memoryview)):
+        return bytes(o).hex()
+    raise TypeError(f"not JSON serializable: {type(o).__name__}")
+
+
+def send_frame(
+    sock: socket.socket,
+    header: Dict[str, Any],
+    payload: Optional[Union[bytes, bytearray, memoryview]] = None,
+) -> None:
+    head = json.dumps(header, ensure_ascii=False, default=_json_default).encode("utf-8")
+    body = memoryview(payload) if payload is not None else memoryview(b"")
+    bufs = [memoryview(_PREFIX.pack(len(head), body.nbytes) + head), body]
+    # 소켓 버퍼가 차서 일부만 나가면 남은 부분부터 다시 전송
+    while bufs:
+        sent = sock.sendmsg(bufs)
+        while bufs and sent >= bufs[0].nbytes:
+            sent -= bufs[0].nbytes
+            bufs.pop(0)
+        if bufs and sent:
+            bufs[0] = bufs[0][sent:]
+
+
+def _recv_exact(sock: socket.socket, view: memoryview) -> None:
+    n = 0
+    while n < view.nbytes:
+        k = sock.recv_into(view[n:])
+        if k == 0:
+            raise IPCClosed("peer closed")
+        n += k
+
+
+def recv_frame(sock: socket.socket) -> Tuple[Dict[str, Any], memoryview]:
+    """(헤더 dict, 페이로드 memoryview) 반환. 프레임 시작 전에 닫히면 IPCClosed"""
+    prefix = bytearray(_PREFIX.size)
+    _recv_exact(sock, memoryview(prefix))
+    head_len, body_len = _PREFIX.unpack(prefix)
+    if head_len > MAX_HEADER or body_len > MAX_PAYLOAD:
+        raise ValueError(f"frame too large: header={head_len}, payload={body_len}")
+
+    head = bytearray(head_len)
+    _recv_exact(sock, memoryview(head))
+    body = bytearray(body_len)
+    view = memoryview(body)
+    _recv_exact(sock, view)
+    return json.loads(head.decode("utf-8")), view
@@ -0,0 +1,58 @@
+# backend/app/services/vision/lazy.py
+"""
+무거운 vision 모듈(numpy, cv2, onnxruntime, ultralytics, pytesseract, rapidfuzz 를 끌어오는 것들) 지연 로딩.
+라우터/헬스체크는 모듈 상단에서 이것들을 import 하지 말고 여기 프록시를 쓴다.
+→ 카탈로그 트래픽만 받는 워커는 부팅 때 vision 스택을 올리지 않음. 첫 사용 시 한 번만 import 하고 소요시간을 로그로 남김.
+
+    from app.services.vision.lazy import pipeline, detector
+    pipeline.run_scan(...)        # 여기서 처음 import
+"""
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Optional
+
+from .logs import logger
+
+# 지금까지 지연 로딩된 모듈 → import 소요(초)
+LOADED: Dict[str, float] = {}
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    t = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    LOADED[self._name] = time.perf_counter() - t
+                    logger.info("[LAZY] imported %s in %.2fs", self._name, LOADED[self._name])
+                    self._module = module
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self._name} loaded={self.loaded}>"
+
+
+pipeline = LazyModule("app.services.vision.pipeline")
+detector = LazyModule("app.services.vision.detector")
+session = LazyModule("app.services.vision.session")
+matcher = LazyModule("app.services.vision.matcher")
+
+
+def run_scan(*args, **kwargs):
+    """pipeline.run_scan 지연 호출. executor 스레드에서 부르면 첫 import 도 이벤트 루프 밖에서 일어남"""
+    return pipeline.run_scan(*args, **kwargs)
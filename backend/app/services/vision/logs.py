@@ -0,0 +1,41 @@
+# backend/app/services/vision/logs.py
+"""
+Vision 로깅.
+- 에러/경고는 항상 logger 로 남김
+- 요청별 상세 로그(OCR 텍스트, 후보 목록 등)는 vlog(): DEBUG 레벨 + 요청 단위 샘플링일 때만 출력
+  (포맷은 %-스타일 인자로 넘겨서, 꺼져 있으면 문자열을 만들지 않음)
+"""
+import logging
+import random
+from contextvars import ContextVar
+
+from app.core.config import VisionConfig
+
+
+logger = logging.getLogger("app.vision")
+logger.setLevel(getattr(logging, str(VisionConfig.LOG_LEVEL).upper(), logging.INFO))
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("[%(levelname)s][%(name)s] %(message)s"))
+    logger.addHandler(_h)
+    logger.propagate = False
+
+_sampled: ContextVar[bool] = ContextVar("vision_log_sampled", default=False)
+
+
+def begin_request(force: bool = False) -> bool:
+    """요청 시작 시 호출. 이 요청의 상세 로그를 남길지 샘플링해서 결정"""
+    on = force or (
+        logger.isEnabledFor(logging.DEBUG) and random.random() < VisionConfig.LOG_SAMPLE_RATE
+    )
+    _sampled.set(on)
+    return on
+
+
+def verbose() -> bool:
+    return _sampled.get() and logger.isEnabledFor(logging.DEBUG)
+
+
+def vlog(msg: str, *args) -> None:
+    if verbose():
+        logger.debug(msg, *args)
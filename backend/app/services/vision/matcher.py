@@ -1,11 +1,13 @@
 # backend/app/services/vision/matcher.py
 
 from typing import List, Dict, Any, Tuple
-import re
 from functools import lru_cache
 
 from rapidfuzz import fuzz
 from app.core.config import VisionConfig
+from app.services.vision.logs import logger, vlog
+from app.services.vision.metrics import inc_path
+from app.services.text_normalize import normalize_text
 
 from app.core.db import SessionLocal
 from app.models.brand import Brand
@@ -68,10 +70,10 @@ def _load_from_db() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
 
 
 
-        print(f"[LOG][MATCH][INIT] loaded brands={len(brand_dicts)}, perfumes={len(product_dicts)}")
+        logger.info("[MATCH][INIT] loaded brands=%d, perfumes=%d", len(brand_dicts), len(product_dicts))
         return brand_dicts, product_dicts
     except Exception as e:
-        print("[LOG][MATCH][INIT][ERROR] DB load failed:", e)
+        logger.error("[MATCH][INIT] DB load failed: %s", e)
         return [], []
     finally:
         db.close()
@@ -95,14 +97,6 @@ _STOPWORDS = {"EAU", "DE", "THE", "OF"}  # 필요 시 확장
 _CONC_KEYWORDS = {"EDT", "EDP", "INTENSE"}
 
 
-def normalize_text(s: str) -> str:
-    s = s.upper()
-    s = s.replace("’", "'").replace("‘", "'").replace("`", "'")
-    s = re.sub(r"[^\w\s]", " ", s)  # 특수문자 제거
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-
 def tokenize(s: str) -> List[str]:
     toks = normalize_text(s).split()
     out: List[str] = []
@@ -232,7 +226,7 @@ def dedup_candidates(cands):
 # ---------- 엔트리 포인트 ----------
 
 def get_match(texts: List[Dict[str, Any]], user_query: str = "") -> Dict[str, Any]:
-    print(f"[LOG][MATCH] 입력 텍스트={texts}, user_query={user_query}")
+    vlog("[MATCH] 입력 텍스트=%s, user_query=%s", texts, user_query)
 
     # OCR 토큰 합치기
     ocr_tokens: List[str] = []
@@ -240,7 +234,7 @@ def get_match(texts: List[Dict[str, Any]], user_query: str = "") -> Dict[str, An
         ocr_tokens.extend(tokenize(t.get("text", "")))
 
     if not ocr_tokens:
-        print("[LOG][MATCH] no OCR tokens")
+        vlog("[MATCH] no OCR tokens")
         return {"final": None, "candidates": []}
 
     user_tokens = tokenize(user_query) if user_query else []
@@ -267,7 +261,8 @@ def get_match(texts: List[Dict[str, Any]], user_query: str = "") -> Dict[str, An
                 )
     else:
         # 2) 브랜드가 안 잡히면 → 전체 향수에서 fallback 매칭
-        print("[LOG][MATCH] no reliable brand → product-only fallback")
+        inc_path("match_any_brand")
+        vlog("[MATCH] no reliable brand → product-only fallback")
         prods = match_product_any_brand(ocr_tokens, user_tokens)
         for p, pscore in prods:
             bid = p["brand_id"]
@@ -295,7 +290,7 @@ def get_match(texts: List[Dict[str, Any]], user_query: str = "") -> Dict[str, An
         else None
     )
 
-    print(f"[LOG][MATCH] 최종 매칭 결과={final}, 후보군={top_candidates}")
+    vlog("[MATCH] 최종 매칭 결과=%s, 후보군=%s", final, top_candidates)
 
     return {
         "final": final,
@@ -0,0 +1,158 @@
+# backend/app/services/vision/metrics.py
+"""
+Vision 파이프라인 메트릭 (프로세스 내, 의존성 없음).
+- 단계별 지연 히스토그램, 경로 카운터(재탐지/회전 OCR/fallback 등), 캐시 hit/miss
+- GET /api/v1/vision/metrics 에서 Prometheus text format(0.0.4)으로 노출
+- 모든 시리즈에 process="api"|"worker" 라벨. 워커 모드면 워커 시리즈(samples())를 같은 메트릭 블록에 합쳐서
+  # HELP/# TYPE 은 메트릭당 한 번만 나가도록 함
+"""
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+_DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], *extra: str) -> str:
+    parts = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    parts.extend(e for e in extra if e)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _process_label(process: str) -> str:
+    return f'process="{process}"' if process else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+
+    def samples(self, process: str = "") -> List[str]:
+        proc = _process_label(process)
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_fmt_labels(self.labels, lv, proc)} {v:g}" for lv, v in items]
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = _DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label_values -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            s = self._series.get(label_values)
+            if s is None:
+                s = self._series[label_values] = [0.0] * (len(self.buckets) + 2)
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    s[i] += 1
+            s[-2] += 1
+            s[-1] += value
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+
+    def samples(self, process: str = "") -> List[str]:
+        proc = _process_label(process)
+        out = []
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for lv, s in items:
+            for i, b in enumerate(self.buckets):
+                le = 'le="%g"' % b
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labels, lv, proc, le)} {s[i]:g}")
+            le = 'le="+Inf"'
+            out.append(f"{self.name}_bucket{_fmt_labels(self.labels, lv, proc, le)} {s[-2]:g}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labels, lv, proc)} {s[-2]:g}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labels, lv, proc)} {s[-1]:.6f}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[object] = []
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        m = Counter(name, help_text, labels)
+        self._metrics.append(m)
+        return m
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = _DEFAULT_BUCKETS) -> Histogram:
+        m = Histogram(name, help_text, labels, buckets)
+        self._metrics.append(m)
+        return m
+
+    def samples(self, process: str) -> Dict[str, List[str]]:
+        """메트릭 이름 → 시리즈 줄 (헤더 없음). 워커가 API 프로세스에 넘겨줄 때 사용"""
+        return {m.name: m.samples(process) for m in self._metrics}
+
+    def render(self, process: str, extra: Optional[Dict[str, List[str]]] = None) -> str:
+        """extra: 다른 프로세스의 samples() — 같은 메트릭 블록 안에 이어 붙임"""
+        lines: List[str] = []
+        for m in self._metrics:
+            lines.extend(m.header())
+            lines.extend(m.samples(process))
+            lines.extend((extra or {}).get(m.name, ()))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "vision_stage_seconds", "Vision pipeline stage latency in seconds", ("stage",)
+)
+PATHS = REGISTRY.counter(
+    "vision_path_total", "Optional/fallback pipeline paths taken", ("path",)
+)
+CACHE = REGISTRY.counter(
+    "vision_cache_total", "Vision cache lookups by result", ("cache", "result")
+)
+SCANS = REGISTRY.counter(
+    "vision_scans_total", "Scan requests by outcome", ("status",)
+)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage)
+
+
+def inc_path(path: str) -> None:
+    PATHS.inc(path)
+
+
+def cache_result(cache: str, hit: bool) -> None:
+    CACHE.inc(cache, "hit" if hit else "miss")
+
+
+def cache_hit_ratio(cache: str) -> float:
+    hit = CACHE.get(cache, "hit")
+    total = hit + CACHE.get(cache, "miss")
+    return hit / total if total else 0.0
+
+
+def render_prometheus(process: str = "api", extra: Optional[Dict[str, List[str]]] = None) -> str:
+    return REGISTRY.render(process, extra)
+
+
+def metric_samples(process: str = "worker") -> Dict[str, List[str]]:
+    return REGISTRY.samples(process)
@@ -0,0 +1,408 @@
+# backend/app/services/vision/pipeline.py
+"""
+스캔 파이프라인 (디코드 → 병 탐지 → OCR → 재탐지 → 품질 → 매칭).
+CPU 바운드 동기 코드이므로 이벤트 루프가 아닌 vision executor 스레드에서 실행한다.
+"""
+from typing import Optional, Dict, Any, Union
+import time
+
+from app.core.config import VisionConfig
+from app.services.vision.utils import decode_image_reduced, _load_cv2
+from app.services.vision.detector import get_detector
+from app.services.vision.ocr import run_ocr, run_ocr_rotated
+from app.services.vision.quality import calc_quality
+from app.services.vision.matcher import get_match
+from app.services.vision.budget import ScanBudget
+from app.services.vision.redetect import redetect_tiered, reuse_ocr_tokens
+from app.services.vision.debug import get_debug_capture
+from app.services.vision.tokens import dedup_tokens, merge_lines
+from app.services.vision.logs import logger, vlog, begin_request
+from app.services.vision.metrics import inc_path, cache_result, SCANS
+from app.services.vision.errors import ScanError
+
+
+def _roi_from_bbox(bbox, w, h):
+    """
+    탐지 bbox → OCR용 ROI 확보 + 패딩
+    [수정]: 탐지 실패 (무효한 bbox) 시 ROI를 이미지 중앙 전체(90%)로 확장
+    """
+    
+    # 1. 탐지 실패 여부 확인 (w나 h가 0인 경우)
+    if bbox["w"] <= 0.0 or bbox["h"] <= 0.0:
+        # [Fallback 로직 확장] 이미지 중앙 90% 영역을 ROI로 사용 (Full Scan에 가까움)
+        x = int(w * 0.05)
+        y = int(h * 0.05)
+        rw = int(w * 0.9)
+        rh = int(h * 0.9)
+        
+        rw = max(1, rw)
+        rh = max(1, rh)
+        
+        return (x, y, rw, rh)
+        
+    # 2. 탐지 성공 시 기존 로직 실행 (로직 동일)
+    
+    x = int(bbox["x"] * w)
+    y = int(bbox["y"] * h)
+    rw = int(bbox["w"] * w)
+    rh = int(bbox["h"] * h)
+
+    target_h = max(int(0.7 * rh), 100) 
+    y_start = int(y + 0.1 * rh)
+    
+    y = max(0, y_start)
+    rh = min(h - y, target_h)
+    
+    pad_x = max(20, int(0.15 * rw))
+    pad_y = max(10, int(0.15 * rh)) 
+    
+    x = max(0, x - pad_x)
+    y = max(0, y - pad_y)
+    rw = min(w - x, rw + 2 * pad_x)
+    rh = min(h - y, rh + 2 * pad_y)
+
+    rw = max(1, rw)
+    rh = max(1, rh)
+
+    return (x, y, rw, rh)
+
+def _ocr_input(decoded, bbox, budget: ScanBudget):
+    """
+    OCR 입력 이미지 + ROI 선택.
+    축소 디코드된 작업 이미지에서 ROI가 충분히 크면 그대로 쓰고,
+    작으면 원본 해상도(재디코드)에서 같은 정규화 bbox로 ROI를 다시 잡는다.
+    재디코드 비율은 ocr_reduced / ocr_full_decode 경로 카운터, 재디코드 시간은 decode_full 단계로 기록
+    """
+    roi = _roi_from_bbox(bbox, decoded.w, decoded.h)
+    if decoded.factor == 1:
+        return decoded.img, roi
+    if roi[3] >= VisionConfig.OCR_MIN_ROI_PX:
+        inc_path("ocr_reduced")
+        return decoded.img, roi
+
+    inc_path("ocr_full_decode")
+    if decoded.full_loaded:
+        full = decoded.full()
+    else:
+        with budget.stage("decode_full"):
+            full = decoded.full()
+    fh, fw = full.shape[:2]
+    return full, _roi_from_bbox(bbox, fw, fh)
+
+
+def _fallback_roi(w, h):
+    """
+    [수정] _roi_from_bbox 함수의 Fallback 로직이 이 함수를 대체하도록 했습니다. 
+    이 함수는 이제 사용되지 않거나, 내부적으로 _roi_from_bbox에 통합된 로직을 그대로 반환합니다.
+    """
+    # 원본 _fallback_roi를 유지하되, _roi_from_bbox의 Fallback 로직이 더 넓어 사용하지 않습니다.
+    bw2 = int(w * 0.60)
+    bh2 = int(h * 0.60)
+    bx2 = (w - bw2) // 2
+    by2 = int(h * 0.20)
+    bh2 = min(h - by2, bh2)
+    return (bx2, by2, bw2, bh2)
+
+
+def dedup_merge(list1, list2):
+    """정방향/회전 OCR 결과 병합: 겹치는 박스는 높은 confidence 하나만"""
+    return dedup_tokens(list1 + list2, iou_th=VisionConfig.OCR_DEDUP_IOU)
+
+
+def merge_texts_by_line(texts):
+    """
+    y 중심이 비슷한 텍스트들을 한 줄로 묶어서 반환.
+    matcher에는 이 병합 결과를 넘기고,
+    원본 texts는 그대로 응답에 포함시킨다.
+    """
+    merged = merge_lines(texts, y_tol=VisionConfig.OCR_LINE_TOL)
+    vlog("[OCR] merged lines: %s", merged)
+    return merged
+
+
+def _needs_rotated(texts) -> bool:
+    """OCR 결과가 없거나 신뢰도 높은 텍스트가 부족하면 회전 OCR 보강 필요"""
+    return len(texts) == 0 or len([t for t in texts if t.get("confidence", 0) >= 0.80]) < 3
+
+
+def _rotated_merge(texts, ocr_img, roi, budget: ScanBudget):
+    """예산이 허락하면 회전 OCR 실행 후 병합, 아니면 skipped 기록"""
+    if not budget.allows("ocr_rotated"):
+        budget.skip("ocr_rotated")
+        return texts
+    inc_path("ocr_rotated")
+    with budget.stage("ocr_rotated"):
+        rot_texts = run_ocr_rotated(ocr_img, roi=roi)
+    if rot_texts:
+        texts = dedup_merge(texts, rot_texts)
+    return texts
+
+
+def run_scan(
+    content: Union[bytes, memoryview],
+    gb: Optional[Dict[str, float]] = None,
+    user_query: Optional[str] = None,
+    request_id: Optional[str] = None,
+    deadline_ms: Optional[int] = None,
+    started_at: Optional[float] = None,
+    tracker=None,
+    debug: bool = False,
+) -> Dict[str, Any]:
+    """
+    업로드 바이트 한 장에 대해 전체 스캔 파이프라인 실행 (동기, CPU 바운드)
+    - deadline_ms: started_at(기본: 지금) 기준 시간 예산. 선택 단계는 예산에 맞춰 건너뛰거나 낮춤
+    - tracker: 프레임 간 상태(ScanSession). reuse_detection / update_detection / accumulate_texts 제공
+    - debug: 샘플링과 무관하게 이 요청의 상세 로그 + 디버그 오버레이 캡처 (지원 대응용)
+    """
+    t0 = time.time()
+    budget = ScanBudget(deadline_ms, started_at if started_at is not None else t0)
+    begin_request(force=debug)
+
+    # 여기서만 cv2 로드 서버 부팅에서는 절대 로드하지 않음
+    try:
+        _load_cv2()
+    except Exception as e:
+        logger.error("[SCAN] OpenCV import failed: %s", e)
+        SCANS.inc("error")
+        raise ScanError(503, "OPENCV_LOAD_FAIL", str(e))
+
+    # ---------- 디코드 ----------
+    try:
+        with budget.stage("decode"):
+            decoded = decode_image_reduced(content, VisionConfig.DECODE_TARGET_SIDE)
+        img, w, h = decoded.img, decoded.w, decoded.h
+        vlog(
+            "[SCAN] image decoded: shape=%s, reduce=1/%d, request_id=%s",
+            img.shape, decoded.factor, request_id,
+        )
+    except Exception:
+        logger.warning("[SCAN] decode failed, request_id=%s", request_id)
+        SCANS.inc("invalid")
+        raise ScanError(400, "INVALID_FILE", "Decode failed")
+
+    # ---------- 병 탐지 ----------
+    t_det0 = time.time()
+    tracked = False
+    try:
+        detector = get_detector()
+        if not detector.ready():
+            SCANS.inc("error")
+            raise ScanError(503, "MODEL_NOT_READY", "Vision model not ready")
+
+        det = tracker.reuse_detection(img) if tracker is not None else None
+        tracked = det is not None
+        if tracker is not None:
+            cache_result("detect_track", tracked)
+        if det is None:
+            with budget.stage("detect"):
+                det = detector.detect(img, guide_box=gb)
+            if tracker is not None:
+                tracker.update_detection(img, det)
+        vlog(
+            "[DETECT] result: present=%s, score=%.3f, bbox=%s, area_ratio=%.4f",
+            det.get("present"), det.get("score"), det.get("bbox"), det.get("area_ratio"),
+        )
+    except ScanError:
+        raise
+    except Exception as e:
+        logger.exception("[DETECT] detect exception: %s", e)
+        inc_path("detect_error")
+        det = {
+            "present": False,
+            "score": 0.0,
+            "mask_polygon": None,
+            "bbox": {"x": 0.0, "y": 0.0, "w": 0.0, "h": 0.0},
+            "area_ratio": 0.0,
+            "inside_ratio": 0.0,
+        }
+    t_det1 = time.time()
+
+    # ---------- ROI ----------
+    area_ratio = det.get("area_ratio", 0.0)
+    # [수정] area_ratio 임계값을 0.02에서 0.005로 낮춰 저해상도 이미지의 작은 탐지 결과도 허용
+    if det["bbox"]["w"] > 0 and det["bbox"]["h"] > 0 and area_ratio >= 0.005: 
+        ocr_img, roi = _ocr_input(decoded, det["bbox"], budget)
+        vlog("[ROI] from detection bbox → roi=%s, area_ratio=%.4f", roi, area_ratio)
+    else:
+        # _roi_from_bbox의 Fallback 로직(_bbox["w"] <= 0.0)이 이미 넓은 영역을 반환하도록 수정되었으므로,
+        # 탐지 실패 시 여기서도 해당 로직을 실행. _fallback_roi는 사용하지 않음.
+        roi_bbox_dummy = {"x": 0.0, "y": 0.0, "w": 0.0, "h": 0.0}
+        ocr_img, roi = _ocr_input(decoded, roi_bbox_dummy, budget)
+        inc_path("roi_fallback")
+        vlog("[ROI] fallback roi → roi=%s, area_ratio=%.4f", roi, area_ratio)
+
+
+    # ---------- OCR ----------
+    t_ocr0 = time.time()
+    texts = []
+    try:
+        vlog("[OCR] start: roi=%s, img_shape=%s", roi, ocr_img.shape)
+        with budget.stage("ocr"):
+            texts = run_ocr(ocr_img, roi=roi)
+        vlog("[OCR] done: %d tokens", len(texts))
+    except Exception as e:
+        logger.exception("[OCR] error: %s", e)
+        inc_path("ocr_error")
+        texts = []
+    
+    # ---------- 회전 OCR 보강 ----------
+    # [수정] run_ocr이 텍스트를 인식하지 못했거나(len(texts) == 0), 신뢰도 높은 텍스트가 부족하면 run_ocr_rotated 실행
+    if _needs_rotated(texts):
+        texts = _rotated_merge(texts, ocr_img, roi, budget)
+        vlog("[OCR] rotated merge → %d tokens", len(texts))
+
+    t_ocr1 = time.time()
+
+
+    # ---------- 텍스트 기반 재탐지 ----------
+    redetected = False
+    if (
+        not tracked
+        and (not det.get("present", False) or det.get("score", 0.0) < 0.15)
+        and len(texts) >= 2
+        and getattr(detector, "yolo", None)
+    ):
+        # 싼 해상도부터 시도 (기본 640 → 1280), 충분한 점수가 나오면 멈춤
+        try:
+            new_det = redetect_tiered(
+                detector, img, texts, budget,
+                tiers=VisionConfig.REDETECT_TIERS,
+                accept_score=VisionConfig.REDETECT_ACCEPT_SCORE,
+            )
+        except Exception as e:
+            logger.warning("[REDETECT] error: %s", e)
+            new_det = None
+
+        if new_det is not None and new_det["score"] > det.get("score", 0.0):
+            inc_path("redetect_applied")
+            vlog(
+                "[REDETECT] applied: %.3f → %.3f, bbox=%s",
+                det["score"], new_det["score"], new_det["bbox"],
+            )
+            det = new_det
+            redetected = True
+            if tracker is not None:
+                tracker.update_detection(img, det)
+            prev_img, prev_roi = ocr_img, roi
+            ocr_img, roi = _ocr_input(decoded, det["bbox"], budget)
+            reused = reuse_ocr_tokens(
+                texts, prev_roi, prev_img, roi, ocr_img, VisionConfig.REDETECT_REUSE_COVERAGE
+            )
+            if reused is not None:
+                # 새 ROI가 이미 OCR 한 영역 안: 그 안의 기존 토큰만 남기고 OCR 재실행 안 함
+                inc_path("ocr_reuse")
+                texts = reused
+                vlog("[OCR] reused %d tokens after redetect", len(texts))
+            elif not budget.allows("ocr_rerun"):
+                # 예산 부족: 기존 OCR 결과 유지
+                budget.skip("ocr_rerun")
+            else:
+                try:
+                    # [수정] 재탐지 후 OCR 재실행 시에도 회전 OCR을 포함시켜 완전한 재시도를 유도
+                    with budget.stage("ocr_rerun"):
+                        texts = run_ocr(ocr_img, roi=roi)
+                    if _needs_rotated(texts):
+                        texts = _rotated_merge(texts, ocr_img, roi, budget)
+                    inc_path("ocr_rerun")
+                    vlog("[OCR] re-run after redetect: %d tokens", len(texts))
+                except Exception as e:
+                    logger.warning("[OCR] re-run error: %s", e)
+
+    # ---------- 품질 ----------
+    t_q0 = time.time()
+    try:
+        with budget.stage("quality"):
+            # 축소 이미지에서 잰 blur 는 원본 해상도 기준으로 환산 (MIN_BLUR 가 원본 기준)
+            quality = calc_quality(img, decoded.factor, VisionConfig.BLUR_SCALE_EXP)
+    except Exception as e:
+        logger.exception("[QUALITY] error: %s", e)
+        quality = {"blur": 0.0, "brightness": 0.0, "glare_ratio": 0.0}
+    t_q1 = time.time()
+
+    # ---------- 매칭 ----------
+    t_m0 = time.time()
+    try:
+        match_texts = tracker.accumulate_texts(texts) if tracker is not None else texts
+        with budget.stage("match"):
+            merged_texts = merge_texts_by_line(match_texts)
+            match = get_match(merged_texts, user_query or "")
+    except Exception as e:
+        logger.exception("[MATCH] error: %s", e)
+        match = {"final": None, "candidates": []}
+    t_m1 = time.time()
+
+    # ---------- 액션 ----------
+    has_box = (det["bbox"]["w"] > 0) and (det["bbox"]["h"] > 0)
+    min_score = max(0.10, getattr(VisionConfig, "THRESH_BOTTLE_SCORE", 0.2) * 0.5)
+    good_score = det["score"] >= min_score
+    # [수정] good_area 임계값을 0.02에서 0.005로 낮춰 탐지 실패 조건 완화
+    good_area = det["area_ratio"] >= 0.005 
+    max_glare = getattr(VisionConfig, "MAX_GLARE", 0.92)
+    good_quality = (
+        quality["blur"] >= VisionConfig.MIN_BLUR
+        and quality["brightness"] >= VisionConfig.MIN_BRIGHTNESS
+        and quality.get("glare_ratio", 0.0) <= max_glare
+    )
+    auto_ok = has_box and good_score and good_area and (match["final"] is not None) and good_quality
+    action = "auto_advance" if auto_ok else "stay"
+    vlog(
+        "[ACTION] has_box=%s, score=%.3f, area=%.3f, quality_ok=%s, matched=%s → %s",
+        has_box, det["score"], det["area_ratio"], good_quality, match["final"] is not None, action,
+    )
+
+    # ---------- 디버그 캡처 (그리기/인코딩/저장은 백그라운드 스레드) ----------
+    capture = None
+    debug_capture = get_debug_capture()
+    if debug_capture.should_capture(force=debug):
+        oh, ow = ocr_img.shape[:2]
+        capture = debug_capture.submit(
+            img,
+            request_id,
+            bbox=det["bbox"],
+            poly=det["mask_polygon"],
+            roi={"x": roi[0] / ow, "y": roi[1] / oh, "w": roi[2] / ow, "h": roi[3] / oh},
+            texts=texts,
+        )
+
+    # ---------- 타이밍 ----------
+    total_ms = int((time.time() - t0) * 1000)
+    detect_ms = int((t_det1 - t_det0) * 1000)
+    ocr_ms = int((t_ocr1 - t_ocr0) * 1000)
+    match_ms = int((t_m1 - t_m0) * 1000)
+    quality_ms = int((t_q1 - t_q0) * 1000)
+    budget.observe_total(total_ms / 1000.0)
+    SCANS.inc(action)
+    vlog(
+        "[TIME] total=%dms, detect=%dms, ocr=%dms, match=%dms, quality=%dms, redetect=%s, skipped=%s",
+        total_ms, detect_ms, ocr_ms, match_ms, quality_ms, redetected, budget.skipped,
+    )
+
+    # ---------- 응답 ----------
+    return {
+        "bottle": {
+            "present": det["present"],
+            "score": det["score"],
+            "mask_polygon": det["mask_polygon"],
+            "bbox": det["bbox"],
+            "area_ratio": det["area_ratio"],
+            "inside_ratio": det["inside_ratio"],
+        },
+        "texts": texts,
+        "match": match,
+        "quality": quality,
+        "action": action,
+        "timing": {
+            "detect_ms": detect_ms,
+            "ocr_ms": ocr_ms,
+            "match_ms": match_ms,
+            "quality_ms": quality_ms,
+            "total_ms": total_ms,
+        },
+        "request_id": request_id or "",
+        "debug": {
+            "redetect": redetected,
+            "tracked": tracked,
+            "budget": budget.report(),
+            "capture": capture,
+        },
+    }
@@ -1,16 +1,36 @@
 # backend/app/services/vision/preprocess.py
+import threading
 import numpy as np
 from .utils import _load_cv2
 
 
-def letterbox(img, new_shape=(640, 640), color=(114, 114, 114)):
+_INTERP_NAMES = {
+    "nearest": "INTER_NEAREST",
+    "linear": "INTER_LINEAR",
+    "cubic": "INTER_CUBIC",
+    "area": "INTER_AREA",
+}
+
+# 스레드별 재사용 버퍼 (canvas: 리사이즈 결과, blob: NCHW float32 입력 텐서)
+_tls = threading.local()
+
+
+def _interp_flag(cv2, interpolation):
+    """문자열(nearest|linear|cubic|area) 또는 cv2 플래그 → cv2 플래그"""
+    if isinstance(interpolation, int):
+        return interpolation
+    name = _INTERP_NAMES.get(str(interpolation or "").lower(), "INTER_CUBIC")
+    return getattr(cv2, name)
+
+
+def letterbox(img, new_shape=(640, 640), color=(114, 114, 114), interpolation="cubic"):
     cv2 = _load_cv2()
 
     h, w = img.shape[:2]
     scale = min(new_shape[0] / h, new_shape[1] / w)
     nh, nw = int(h * scale), int(w * scale)
 
-    img_resized = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_CUBIC)
+    img_resized = cv2.resize(img, (nw, nh), interpolation=_interp_flag(cv2, interpolation))
 
     top = (new_shape[0] - nh) // 2
     left = (new_shape[1] - nw) // 2
@@ -18,4 +38,50 @@ def letterbox(img, new_shape=(640, 640), color=(114, 114, 114)):
     canvas = np.full((new_shape[0], new_shape[1], 3), color, dtype=np.uint8)
     canvas[top:top + nh, left:left + nw] = img_resized
 
-    return canvas, scale, left, top, (h, w)
\ No newline at end of file
+    return canvas, scale, left, top, (h, w)
+
+
+def _thread_buffers(new_shape):
+    """현재 스레드의 canvas/blob 버퍼. 입력 크기가 바뀔 때만 새로 할당"""
+    bufs = getattr(_tls, "bufs", None)
+    if bufs is None or bufs[0] != tuple(new_shape):
+        H, W = new_shape
+        canvas = np.empty(H * W * 3, dtype=np.uint8)
+        blob = np.empty((1, 3, H, W), dtype=np.float32)
+        bufs = (tuple(new_shape), canvas, blob)
+        _tls.bufs = bufs
+    return bufs[1], bufs[2]
+
+
+def letterbox_blob(img, new_shape=(640, 640), color=(114, 114, 114), interpolation="cubic"):
+    """
+    letterbox + BGR→RGB + HWC→NCHW + /255 를 한 번에 처리.
+    - 스레드별로 미리 할당된 canvas/blob 버퍼를 재사용 (요청마다 새 배열을 만들지 않음)
+    - 반환된 blob은 같은 스레드의 다음 호출에서 덮어써지므로 바로 추론에 넘길 것
+    """
+    cv2 = _load_cv2()
+
+    h, w = img.shape[:2]
+    scale = min(new_shape[0] / h, new_shape[1] / w)
+    nh, nw = max(1, int(h * scale)), max(1, int(w * scale))
+
+    top = (new_shape[0] - nh) // 2
+    left = (new_shape[1] - nw) // 2
+
+    canvas, blob = _thread_buffers(new_shape)
+
+    # 연속 메모리 앞부분을 (nh, nw, 3) 뷰로 사용 → cv2.resize 가 바로 써넣음
+    resized = canvas[: nh * nw * 3].reshape(nh, nw, 3)
+    cv2.resize(img, (nw, nh), dst=resized, interpolation=_interp_flag(cv2, interpolation))
+
+    # 패딩 색(BGR)을 RGB 채널 순서로 채운 뒤 내부 영역만 덮어씀
+    for c in range(3):
+        blob[0, c].fill(color[2 - c] / 255.0)
+        np.multiply(
+            resized[:, :, 2 - c],
+            np.float32(1.0 / 255.0),
+            out=blob[0, c, top:top + nh, left:left + nw],
+            casting="unsafe",
+        )
+
+    return blob, scale, left, top, (h, w)
@@ -1,15 +1,22 @@
 # backend/app/services/vision/quality.py
 import numpy as np
 from .utils import _load_cv2
+from .logs import vlog
 
 
-def calc_quality(img_bgr):
+def calc_quality(img_bgr, reduce_factor: int = 1, blur_scale_exp: float = 2.0):
+    """
+    reduce_factor: img_bgr 이 원본의 1/f 축소 디코드일 때 f.
+    blur 는 원본 해상도 기준 값으로 환산 (측정값 / f^blur_scale_exp) → MIN_BLUR 를 그대로 씀
+    """
     cv2 = _load_cv2()
 
     gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    blur = cv2.Laplacian(gray, cv2.CV_64F).var()
+    blur = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    if reduce_factor > 1:
+        blur /= float(reduce_factor) ** blur_scale_exp
     brightness = float(np.mean(gray) / 255.0)
     glare_ratio = float(np.sum(gray > 240) / gray.size)
 
-    print(f"[LOG][QUALITY] blur={blur:.2f}, brightness={brightness:.3f}, glare={glare_ratio:.3f}")
+    vlog("[QUALITY] blur=%.2f, brightness=%.3f, glare=%.3f", blur, brightness, glare_ratio)
     return {"blur": blur, "brightness": brightness, "glare_ratio": glare_ratio}
@@ -0,0 +1,159 @@
+# backend/app/services/vision/recognition_log.py
+"""
+ImageRecognitionLog 비동기 배치 기록기.
+- 스캔 핸들러는 enqueue() 만 호출 (논블로킹). 큐가 가득 차면 버리고 카운트만 올림
+- 백그라운드 태스크가 batch_size 개 또는 flush_interval_s 마다 모아서 한 번에 INSERT
+- DB 작업은 동기 세션이므로 스레드에서 실행 (이벤트 루프 안 막음)
+- 배치 INSERT 가 실패하면 행 단위로 다시 넣어 문제 행만 버림 (삭제된 사용자 user_id FK 등)
+- 종료: close() 가 큐에 종료 표시를 넣고, _run 은 모으던 배치까지 기록한 뒤 끝남
+"""
+import asyncio
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import VisionConfig
+from app.core.db import SessionLocal
+from app.models.base import try_uuid_hex_to_bytes
+from app.models.image_recognition_log import ImageRecognitionLog
+from .logs import logger
+from .metrics import PATHS, inc_path
+
+
+_STOP = object()  # 큐 종료 표시
+
+
+class RecognitionLogWriter:
+    def __init__(self, batch_size: int = 50, flush_interval_s: float = 2.0, max_queue: int = 1000):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_s = flush_interval_s
+        self.max_queue = max(1, max_queue)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def enqueue(self, record: Dict[str, Any]) -> bool:
+        """이벤트 루프에서 호출. 큐가 가득 차면 False (기록 버림)"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            inc_path("recognition_log_dropped")
+            return False
+
+    async def _run(self) -> None:
+        q = self._queue
+        stopping = False
+        while not stopping:
+            item = await q.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            loop = asyncio.get_running_loop()
+            until = loop.time() + self.flush_interval_s
+            while len(batch) < self.batch_size:
+                timeout = until - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(q.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    # 모으던 배치는 기록하고 종료
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await asyncio.to_thread(_insert_batch, batch)
+            return
+        except Exception as e:
+            logger.warning("[RECOG_LOG] batch insert failed, retrying %d rows one by one: %s", len(batch), e)
+        failed = await asyncio.to_thread(_insert_rows, batch)
+        if failed:
+            logger.warning("[RECOG_LOG] dropped %d/%d rows", failed, len(batch))
+            PATHS.inc("recognition_log_failed", amount=failed)
+
+    async def close(self) -> None:
+        """종료 시: 종료 표시를 넣어 _run 이 모으던 배치까지 기록하게 한 뒤, 그 뒤에 남은 기록도 마저 씀"""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.put(_STOP)
+            await self._task
+        rest: List[Dict[str, Any]] = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                rest.append(item)
+        for i in range(0, len(rest), self.batch_size):
+            await self._flush(rest[i : i + self.batch_size])
+        self._task = None
+
+
+def _insert_batch(rows: List[Dict[str, Any]]) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(insert(ImageRecognitionLog.__table__), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _insert_rows(rows: List[Dict[str, Any]]) -> int:
+    """행 단위 INSERT (행마다 커밋). 반환: 실패한 행 수"""
+    failed = 0
+    db = SessionLocal()
+    try:
+        for row in rows:
+            try:
+                db.execute(insert(ImageRecognitionLog.__table__), [row])
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                failed += 1
+                logger.debug("[RECOG_LOG] row insert failed: %s", e)
+    finally:
+        db.close()
+    return failed
+
+
+def build_record(result: Dict[str, Any], user_id: Optional[bytes] = None) -> Dict[str, Any]:
+    """스캔 응답 dict → image_recognition_log 행"""
+    match = result.get("match") or {}
+    final = match.get("final")
+    cands = match.get("candidates") or []
+    top = final or (cands[0] if cands else None)
+    return {
+        "user_id": user_id,
+        "recognized_perfume_id": try_uuid_hex_to_bytes(final["product_id"]) if final else None,
+        "confidence_score": round(float(top["score"]), 4) if top else None,
+        "candidate_perfumes": [{"perfume_id": c["product_id"], "score": c["score"]} for c in cands],
+        "model_version": VisionConfig.MODEL_VERSION,
+        "processing_time_ms": int((result.get("timing") or {}).get("total_ms", 0)),
+        "user_confirmed": False,
+    }
+
+
+@lru_cache(maxsize=1)
+def get_recognition_log_writer() -> RecognitionLogWriter:
+    return RecognitionLogWriter(
+        batch_size=getattr(VisionConfig, "RECOG_LOG_BATCH", 50),
+        flush_interval_s=getattr(VisionConfig, "RECOG_LOG_FLUSH_S", 2.0),
+        max_queue=getattr(VisionConfig, "RECOG_LOG_QUEUE", 1000),
+    )
@@ -0,0 +1,170 @@
+# backend/app/services/vision/redetect.py
+"""
+텍스트 기반 재탐지 (탐지가 약할 때 OCR 텍스트 주변을 잘라서 다시 탐지).
+- 해상도 tier 를 싼 것부터(기본 640 → 1280) 시도하고, 충분한 점수가 나오면 거기서 멈춤
+- 재탐지 후 새 ROI가 기존 OCR ROI 안에 거의 들어오면 OCR을 다시 돌리지 않고 기존 토큰을 재사용
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .budget import ScanBudget
+from .logs import logger, vlog
+from .metrics import inc_path
+from .utils import clamp01
+
+
+def text_guided_roi(texts, w, h):
+    """신뢰 높은 텍스트들을 묶어 재탐지용 ROI 생성"""
+    good = []
+    for t in texts:
+        txt = (t.get("text") or "").upper()
+        conf = float(t.get("confidence", 0))
+        if conf < 0.80:
+            continue
+        alnum_like = sum(ch.isalnum() or ch in "°" for ch in txt)
+        if alnum_like < 2:
+            continue
+        b = t.get("box") or {}
+        if b.get("w", 0) <= 0.02 or b.get("h", 0) <= 0.01:
+            continue
+        good.append(b)
+
+    if not good:
+        return None
+
+    xs = [int(b["x"] * w) for b in good]
+    ys = [int(b["y"] * h) for b in good]
+    x2 = [int((b["x"] + b["w"]) * w) for b in good]
+    y2 = [int((b["y"] + b["h"]) * h) for b in good]
+    x0, y0 = max(0, min(xs)), max(0, min(ys))
+    x1, y1 = min(w, max(x2)), min(h, max(y2))
+
+    # 패딩 라벨 주변 넉넉히
+    pad_x = int(0.25 * (x1 - x0))
+    pad_y = int(0.20 * (y1 - y0))
+    x0 = max(0, x0 - pad_x)
+    y0 = max(0, y0 - pad_y)
+    x1 = min(w, x1 + pad_x)
+    y1 = min(h, y1 + pad_y)
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def _predict_crop(detector, img, tg_roi, imgsz: int) -> Optional[Dict[str, Any]]:
+    """크롭 한 장을 imgsz 로 탐지 → 원본 정규화 좌표의 det dict (없으면 None)"""
+    h, w = img.shape[:2]
+    tx, ty, tw, th = tg_roi
+    crop = img[ty : ty + th, tx : tx + tw]
+    res = detector.yolo.predict(
+        crop[:, :, ::-1],
+        imgsz=imgsz,
+        conf=0.03,
+        iou=0.45,
+        classes=None,
+        agnostic_nms=True,
+        verbose=False,
+    )[0]
+    if res.boxes is None or len(res.boxes) == 0:
+        return None
+
+    confs = res.boxes.conf.cpu().numpy()
+    xywhn = res.boxes.xywhn.cpu().numpy()
+    best = int(np.argmax(confs))
+    top_conf = float(confs[best])
+    cx, cy, bw, bh = map(float, xywhn[best])
+
+    # 크롭 → 원본 좌표 복원
+    bx = clamp01((tx + (cx - bw / 2) * tw) / w)
+    by = clamp01((ty + (cy - bh / 2) * th) / h)
+    bw = clamp01(bw * (tw / w))
+    bh = clamp01(bh * (th / h))
+
+    return {
+        "present": top_conf >= detector.score_th,
+        "score": top_conf,
+        "mask_polygon": None,
+        "bbox": {"x": bx, "y": by, "w": bw, "h": bh},
+        "area_ratio": bw * bh,
+        "inside_ratio": 1.0,
+    }
+
+
+def redetect_tiered(
+    detector,
+    img,
+    texts: List[Dict[str, Any]],
+    budget: ScanBudget,
+    tiers: Sequence[int] = (640, 1280),
+    accept_score: float = 0.3,
+) -> Optional[Dict[str, Any]]:
+    """
+    tier 순서대로(싼 것부터) 재탐지. accept_score 이상이 나오면 바로 멈추고,
+    예산이 다음 tier 를 못 덮거나 tier 추론이 예외를 내면 거기까지의 최선 결과를 반환.
+    """
+    h, w = img.shape[:2]
+    tg_roi = text_guided_roi(texts, w, h)
+    if tg_roi is None or not tiers:
+        return None
+
+    best: Optional[Dict[str, Any]] = None
+    for i, imgsz in enumerate(tiers):
+        stage = f"redetect@{imgsz}"
+        if not budget.allows(stage):
+            if i == 0:
+                budget.skip("redetect")
+            else:
+                budget.downgrade("redetect", f"{tiers[-1]}→{tiers[i - 1]}")
+            break
+        inc_path(stage)
+        try:
+            with budget.stage(stage):
+                cand = _predict_crop(detector, img, tg_roi, imgsz)
+        except Exception as e:
+            logger.warning("[REDETECT] imgsz=%d failed, keep best so far: %s", imgsz, e)
+            inc_path("redetect_error")
+            break
+        vlog("[REDETECT] imgsz=%d → %s", imgsz, cand and round(cand["score"], 3))
+        if cand is not None and (best is None or cand["score"] > best["score"]):
+            best = cand
+        if best is not None and best["score"] >= accept_score:
+            break
+    return best
+
+
+def _norm_roi(roi: Tuple[int, int, int, int], img) -> Tuple[float, float, float, float]:
+    h, w = img.shape[:2]
+    x, y, rw, rh = roi
+    return (x / w, y / h, rw / w, rh / h)
+
+
+def reuse_ocr_tokens(
+    texts: List[Dict[str, Any]],
+    old_roi,
+    old_img,
+    new_roi,
+    new_img,
+    min_coverage: float = 0.9,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    새 ROI가 기존 OCR ROI에 min_coverage 이상 덮이면, 기존 토큰 중 새 ROI 안(중심 기준)에 있는 것만 반환.
+    덮이지 않으면 None → OCR 재실행 필요.
+    """
+    ox, oy, ow, oh = _norm_roi(old_roi, old_img)
+    nx, ny, nw, nh = _norm_roi(new_roi, new_img)
+    if nw <= 0 or nh <= 0:
+        return None
+
+    ix = max(0.0, min(ox + ow, nx + nw) - max(ox, nx))
+    iy = max(0.0, min(oy + oh, ny + nh) - max(oy, ny))
+    if (ix * iy) / (nw * nh) < min_coverage:
+        return None
+
+    kept = []
+    for t in texts:
+        b = t.get("box") or {}
+        cx = b.get("x", 0.0) + b.get("w", 0.0) / 2.0
+        cy = b.get("y", 0.0) + b.get("h", 0.0) / 2.0
+        if nx <= cx <= nx + nw and ny <= cy <= ny + nh:
+            kept.append(t)
+    return kept
+
@@ -0,0 +1,154 @@
+# backend/app/services/vision/remote.py
+"""
+vision 워커 프로세스(worker.py) 클라이언트.
+- VISION_WORKER_SOCKET 이 설정되면 /vision/scan 은 이 클라이언트로 워커에 스캔을 맡긴다
+  (API 프로세스는 cv2/torch/onnxruntime/pytesseract 를 import 하지 않음)
+- 호출은 동기(블로킹). 라우트에서는 기존과 같이 scan executor 스레드에서 호출 → 동시 요청 수/대기열 제한 그대로 적용
+- 스레드마다 연결 하나를 유지해서 재사용. 연결 오류는 한 번 재연결 후 재시도
+"""
+import socket
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+
+from app.core.config import VisionConfig
+from .errors import ScanError
+from .ipc import IPCClosed, recv_frame, send_frame
+
+
+class VisionWorkerClient:
+    def __init__(self, path: str, timeout_s: float = 10.0):
+        self.path = path
+        self.timeout_s = timeout_s
+        self._tls = threading.local()
+
+    def _conn(self) -> socket.socket:
+        sock = getattr(self._tls, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout_s)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+            self._tls.sock = sock
+        return sock
+
+    def _drop(self) -> None:
+        sock = getattr(self._tls, "sock", None)
+        self._tls.sock = None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def request(self, header: Dict[str, Any], payload=None, timeout_s: Optional[float] = None) -> Dict[str, Any]:
+        for attempt in (0, 1):
+            try:
+                sock = self._conn()
+                sock.settimeout(timeout_s or self.timeout_s)
+                send_frame(sock, header, payload)
+                reply, _ = recv_frame(sock)
+                return reply
+            except socket.timeout:
+                # 응답이 늦게 오면 스트림이 어긋나므로 연결을 버림
+                self._drop()
+                raise ScanError(504, "VISION_WORKER_TIMEOUT", "Vision worker timed out")
+            except (IPCClosed, OSError) as e:
+                self._drop()
+                if attempt == 1:
+                    raise ScanError(503, "VISION_WORKER_UNAVAILABLE", f"Vision worker unavailable: {e}")
+
+    def run_scan(
+        self,
+        content: Union[bytes, memoryview],
+        gb: Optional[Dict[str, float]] = None,
+        user_query: Optional[str] = None,
+        request_id: Optional[str] = None,
+        deadline_ms: Optional[int] = None,
+        started_at: Optional[float] = None,
+        debug: bool = False,
+    ) -> Dict[str, Any]:
+        """pipeline.run_scan 과 같은 인자/결과. 실패는 ScanError 로 전달"""
+        header = {
+            "op": "scan",
+            "guide_box": gb,
+            "user_query": user_query,
+            "request_id": request_id,
+            "deadline_ms": deadline_ms,
+            "started_at": started_at if started_at is not None else time.time(),
+            "debug": debug,
+        }
+        # 시간 예산이 있으면 그보다 조금 더 기다림 (예산은 선택 단계만 줄이므로 필수 단계 시간 여유)
+        timeout_s = self.timeout_s
+        if deadline_ms:
+            timeout_s = max(timeout_s, deadline_ms / 1000.0 * 2)
+        reply = self.request(header, content, timeout_s)
+        if not reply.get("ok"):
+            raise ScanError(
+                int(reply.get("status_code", 500)),
+                reply.get("code", "SCAN_FAILED"),
+                reply.get("message", ""),
+            )
+        return reply["result"]
+
+    def ping(self) -> Dict[str, Any]:
+        return self.request({"op": "ping"})
+
+    def metric_samples(self) -> Dict[str, List[str]]:
+        """워커 메트릭 시리즈 (메트릭 이름 → 줄 목록, process="worker" 라벨 포함)"""
+        reply = self.request({"op": "metrics"})
+        return (reply.get("samples") or {}) if reply.get("ok") else {}
+
+
+@lru_cache(maxsize=1)
+def get_vision_client() -> Optional[VisionWorkerClient]:
+    """VISION_WORKER_SOCKET 이 없으면 None (in-process 모드)"""
+    path = getattr(VisionConfig, "WORKER_SOCKET", "")
+    if not path:
+        return None
+    return VisionWorkerClient(path, timeout_s=getattr(VisionConfig, "WORKER_TIMEOUT_S", 10.0))
+
+
+def local_detector_ready() -> Optional[bool]:
+    """
+    이 프로세스의 탐지기 상태. 로드하지 않고 확인만 함
+    None = 아직 로드 안 됨(지연 로딩 전), True/False = 로드됨 + 모델 준비 여부
+    """
+    # 파이프라인/워커 warmup 은 detector 모듈을 직접 import 하므로 lazy 프록시가 아니라 sys.modules 로 확인
+    module = sys.modules.get("app.services.vision.detector")
+    if module is None or module.get_detector.cache_info().currsize == 0:
+        return None
+    return bool(module.get_detector().ready())
+
+
+def vision_readiness() -> Dict[str, Any]:
+    """
+    헬스체크용 vision 상태 (vision 스택을 새로 올리지 않음).
+    status: ready | not_loaded(in-process, 첫 스캔 전) | not_ready(모델 로드 실패) | unavailable(워커 응답 없음)
+    """
+    client = get_vision_client()
+    if client is None:
+        ready = local_detector_ready()
+        status = "not_loaded" if ready is None else ("ready" if ready else "not_ready")
+        return {"mode": "in_process", "status": status}
+    try:
+        reply = client.ping()
+    except ScanError:
+        return {"mode": "worker", "status": "unavailable"}
+    if not reply.get("ok"):
+        return {"mode": "worker", "status": "unavailable"}
+    return {"mode": "worker", "status": "ready" if reply.get("ready") else "not_ready"}
+
+
+def get_scan_fn():
+    """스캔 실행 함수: 워커 모드면 원격 호출, 아니면 in-process 파이프라인 (필요할 때만 import)"""
+    client = get_vision_client()
+    if client is not None:
+        return client.run_scan
+    from .lazy import run_scan
+    return run_scan
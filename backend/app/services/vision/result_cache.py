@@ -0,0 +1,103 @@
+# backend/app/services/vision/result_cache.py
+"""
+동일 업로드 재전송용 스캔 결과 캐시 + single-flight.
+- 키: 업로드 바이트의 BLAKE2b 해시 + guide_box + user_query
+- TTL 이 있는 LRU. 같은 키가 처리 중이면 다시 계산하지 않고 첫 요청 결과를 기다림
+- cacheable(value) 가 False 인 결과(시간 예산 때문에 단계를 건너뛴 결과 등)는 저장하지 않음
+이벤트 루프 스레드에서만 호출한다 (락 없음).
+"""
+import asyncio
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from app.core.config import VisionConfig
+from .metrics import cache_result
+
+
+class ScanResultCache:
+    def __init__(self, max_entries: int = 256, ttl_s: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def key(content: Union[bytes, memoryview], guide_box: Optional[str], user_query: Optional[str]) -> str:
+        h = hashlib.blake2b(content, digest_size=16)
+        h.update(b"\x00")
+        h.update((guide_box or "").strip().encode("utf-8"))
+        h.update(b"\x00")
+        h.update((user_query or "").strip().encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl_s, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Tuple[str, Any]:
+        """
+        반환: (status, 값의 복사본). status = hit(캐시) | shared(처리 중이던 요청 결과 공유) | miss(직접 계산)
+        계산 실패 시 예외는 기다리던 요청들에도 그대로 전달되고 캐시에는 남지 않는다.
+        """
+        value = self.get(key)
+        if value is not None:
+            cache_result("scan_result", True)
+            return "hit", copy.deepcopy(value)
+
+        fut = self._inflight.get(key)
+        if fut is not None:
+            cache_result("scan_result", True)
+            value = await asyncio.shield(fut)
+            return "shared", copy.deepcopy(value)
+
+        cache_result("scan_result", False)
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # 기다리는 쪽이 없어도 "never retrieved" 경고가 나지 않도록
+            raise
+        else:
+            if cacheable is None or cacheable(value):
+                self.put(key, value)
+            fut.set_result(value)
+            return "miss", copy.deepcopy(value)
+        finally:
+            self._inflight.pop(key, None)
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> ScanResultCache:
+    return ScanResultCache(
+        max_entries=getattr(VisionConfig, "RESULT_CACHE_SIZE", 256),
+        ttl_s=getattr(VisionConfig, "RESULT_CACHE_TTL_S", 60.0),
+    )
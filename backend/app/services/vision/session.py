@@ -0,0 +1,140 @@
+# backend/app/services/vision/session.py
+"""
+WebSocket 스캔 세션 상태 (프레임 간 추적).
+- last bbox + 프레임 썸네일: 병이 거의 안 움직였으면 탐지를 건너뛰고 직전 결과 재사용
+- OCR 토큰 누적: 여러 프레임에서 읽힌 텍스트를 합쳐서 매칭
+- 후보 투표표: 같은 제품이 연속/누적으로 일정 횟수 이상 최종 후보가 되면 합의(consensus)
+한 세션의 프레임은 순서대로 하나씩 처리되므로 별도 락은 두지 않는다.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import VisionConfig
+from .utils import _load_cv2
+
+
+_THUMB = (32, 32)
+
+
+class ScanSession:
+    def __init__(
+        self,
+        consensus_frames: int = 3,
+        motion_th: float = 0.04,
+        max_tokens: int = 200,
+    ):
+        self.consensus_frames = max(1, consensus_frames)
+        self.motion_th = motion_th
+        self.max_tokens = max_tokens
+
+        # 클라이언트 설정 (텍스트 메시지로 갱신)
+        self.guide_box: Optional[Dict[str, float]] = None
+        self.user_query: Optional[str] = None
+        self.deadline_ms: Optional[int] = None
+
+        self.frames = 0
+        self.dropped = 0
+        self.tracked = 0
+
+        self._last_det: Optional[Dict[str, Any]] = None
+        self._last_thumb: Optional[np.ndarray] = None
+        self._pending_thumb: Optional[np.ndarray] = None
+        self._tokens: Dict[str, Dict[str, Any]] = {}
+        self._votes: Dict[str, float] = {}
+        self._hits: Dict[str, int] = {}
+        self._cands: Dict[str, Dict[str, Any]] = {}
+
+    # ---------- 설정 ----------
+
+    def configure(self, msg: Dict[str, Any]) -> None:
+        if "guide_box" in msg:
+            self.guide_box = msg.get("guide_box") or None
+        if "user_query" in msg:
+            self.user_query = msg.get("user_query") or None
+        if "deadline_ms" in msg:
+            try:
+                self.deadline_ms = int(msg["deadline_ms"])
+            except (TypeError, ValueError):
+                self.deadline_ms = None
+
+    # ---------- 탐지 재사용 (pipeline tracker 인터페이스) ----------
+
+    def _thumb(self, img) -> np.ndarray:
+        cv2 = _load_cv2()
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, _THUMB, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def reuse_detection(self, img) -> Optional[Dict[str, Any]]:
+        """직전 프레임과 거의 같은 장면이면 직전 탐지 결과 반환, 아니면 None"""
+        if self._last_det is None or not self._last_det.get("present"):
+            return None
+        thumb = self._thumb(img)
+        self._pending_thumb = thumb
+        if self._last_thumb is None or self._last_thumb.shape != thumb.shape:
+            return None
+        motion = float(np.mean(np.abs(thumb - self._last_thumb))) / 255.0
+        if motion >= self.motion_th:
+            return None
+        self.tracked += 1
+        self._pending_thumb = None
+        return self._last_det
+
+    def update_detection(self, img, det: Dict[str, Any]) -> None:
+        thumb = self._pending_thumb
+        self._last_thumb = thumb if thumb is not None else self._thumb(img)
+        self._pending_thumb = None
+        self._last_det = det
+
+    # ---------- OCR 토큰 누적 ----------
+
+    def accumulate_texts(self, texts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """텍스트별 최고 confidence 토큰만 유지해서 누적 목록 반환 (max_tokens 상한)"""
+        for t in texts:
+            key = (t.get("text") or "").strip().upper()
+            if not key:
+                continue
+            prev = self._tokens.get(key)
+            if prev is None or t.get("confidence", 0) > prev.get("confidence", 0):
+                self._tokens[key] = t
+        if len(self._tokens) > self.max_tokens:
+            keep = sorted(self._tokens.items(), key=lambda kv: -kv[1].get("confidence", 0))
+            self._tokens = dict(keep[: self.max_tokens])
+        return list(self._tokens.values())
+
+    # ---------- 투표 ----------
+
+    def vote(self, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """프레임 결과를 투표표에 반영. 합의되면 최종 후보 dict 반환"""
+        self.frames += 1
+        final = (result.get("match") or {}).get("final")
+        if not final:
+            return None
+
+        pid = final["product_id"]
+        self._votes[pid] = self._votes.get(pid, 0.0) + float(final.get("score", 0.0))
+        self._hits[pid] = self._hits.get(pid, 0) + 1
+        self._cands[pid] = final
+
+        leader = max(self._votes, key=self._votes.get)
+        runner_up = max((v for k, v in self._votes.items() if k != leader), default=0.0)
+        if self._hits[leader] >= self.consensus_frames and self._votes[leader] > runner_up:
+            return self._cands[leader]
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "tracked": self.tracked,
+            "tokens": len(self._tokens),
+            "votes": {pid: round(v, 3) for pid, v in self._votes.items()},
+        }
+
+
+def new_session() -> ScanSession:
+    return ScanSession(
+        consensus_frames=getattr(VisionConfig, "STREAM_CONSENSUS_FRAMES", 3),
+        motion_th=getattr(VisionConfig, "STREAM_MOTION_TH", 0.04),
+        max_tokens=getattr(VisionConfig, "STREAM_MAX_TOKENS", 200),
+    )
@@ -0,0 +1,106 @@
+# backend/app/services/vision/tokens.py
+"""
+OCR 토큰 정리 (공간 격자 해시 기반).
+- dedup_tokens: 박스가 IoU 임계 이상 겹치면 같은 토큰으로 보고 confidence 높은 것만 유지
+  (정방향/회전 OCR 결과처럼 좌표가 조금씩 다른 중복도 제거)
+- merge_lines: y 중심이 허용오차 안인 토큰을 한 줄로 묶음. 이웃 버킷까지 보므로 버킷 경계에서 줄이 갈리지 않음
+좌표는 모두 0~1 정규화 box {x, y, w, h}.
+"""
+from typing import Any, Dict, Iterator, List, Tuple
+
+_Box = Dict[str, float]
+
+
+def _iou(a: _Box, b: _Box) -> float:
+    ix = min(a["x"] + a["w"], b["x"] + b["w"]) - max(a["x"], b["x"])
+    iy = min(a["y"] + a["h"], b["y"] + b["h"]) - max(a["y"], b["y"])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    inter = ix * iy
+    union = a["w"] * a["h"] + b["w"] * b["h"] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _cells(box: _Box, cell: float) -> Iterator[Tuple[int, int]]:
+    x0, y0 = int(box["x"] / cell), int(box["y"] / cell)
+    x1, y1 = int((box["x"] + box["w"]) / cell), int((box["y"] + box["h"]) / cell)
+    for gx in range(x0, x1 + 1):
+        for gy in range(y0, y1 + 1):
+            yield gx, gy
+
+
+def dedup_tokens(texts: List[Dict[str, Any]], iou_th: float = 0.5, cell: float = 0.05) -> List[Dict[str, Any]]:
+    """겹치는(IoU >= iou_th) 박스 중 confidence 최고 토큰만 남김. 박스 없는 토큰은 그대로 유지"""
+    ordered = sorted(texts, key=lambda t: -float(t.get("confidence", 0.0)))
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    kept: List[Dict[str, Any]] = []
+    for t in ordered:
+        box = t.get("box")
+        if not box or box.get("w", 0) <= 0 or box.get("h", 0) <= 0:
+            kept.append(t)
+            continue
+        cells = list(_cells(box, cell))
+        seen = set()
+        dup = False
+        for c in cells:
+            for i in grid.get(c, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                if _iou(box, kept[i]["box"]) >= iou_th:
+                    dup = True
+                    break
+            if dup:
+                break
+        if dup:
+            continue
+        idx = len(kept)
+        kept.append(t)
+        for c in cells:
+            grid.setdefault(c, []).append(idx)
+    return kept
+
+
+def merge_lines(texts: List[Dict[str, Any]], y_tol: float = 0.02) -> List[Dict[str, Any]]:
+    """
+    y 중심이 y_tol 안인 토큰들을 한 줄로 묶어 {text, confidence(최대), box(합집합)} 목록 반환 (위→아래).
+    토큰을 x 순으로 한 번 정렬한 뒤 한 번만 훑으므로 줄 안의 순서는 따로 정렬하지 않음.
+    """
+    if not texts:
+        return []
+
+    lines: List[Dict[str, Any]] = []           # {cy, items}
+    buckets: Dict[int, List[int]] = {}         # int(cy / y_tol) → lines 인덱스
+    for t in sorted(texts, key=lambda r: r.get("box", {}).get("x", 0.0)):
+        b = t.get("box", {})
+        cy = b.get("y", 0.0) + b.get("h", 0.0) / 2.0
+        k = int(cy / y_tol)
+
+        best, best_d = -1, y_tol
+        for nk in (k - 1, k, k + 1):
+            for li in buckets.get(nk, ()):
+                d = abs(lines[li]["cy"] - cy)
+                if d <= best_d:
+                    best, best_d = li, d
+        if best < 0:
+            best = len(lines)
+            lines.append({"cy": cy, "items": []})
+            buckets.setdefault(k, []).append(best)
+        lines[best]["items"].append(t)
+
+    merged = []
+    for line in sorted(lines, key=lambda l: l["cy"]):
+        items = line["items"]
+        boxes = [r["box"] for r in items]
+        x0 = min(bx["x"] for bx in boxes)
+        y0 = min(bx["y"] for bx in boxes)
+        x1 = max(bx["x"] + bx["w"] for bx in boxes)
+        y1 = max(bx["y"] + bx["h"] for bx in boxes)
+        merged.append(
+            {
+                "text": " ".join(r["text"] for r in items),
+                "confidence": max(r["confidence"] for r in items),
+                "box": {"x": x0, "y": y0, "w": x1 - x0, "h": y1 - y0},
+            }
+        )
+    return merged
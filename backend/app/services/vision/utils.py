@@ -1,6 +1,7 @@
 # backend/app/services/vision/utils.py
+import struct
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple, Union
 
 
 def _load_cv2():
@@ -11,7 +12,7 @@ def _load_cv2():
         raise RuntimeError(f"OpenCV load failed: {e}")
 
 
-def decode_image(file_bytes: bytes) -> Tuple[np.ndarray, int, int]:
+def decode_image(file_bytes: Union[bytes, memoryview]) -> Tuple[np.ndarray, int, int]:
     cv2 = _load_cv2()
 
     arr = np.frombuffer(file_bytes, np.uint8)
@@ -23,5 +24,90 @@ def decode_image(file_bytes: bytes) -> Tuple[np.ndarray, int, int]:
     return img, w, h
 
 
+# JPEG SOFn 마커 (DHT=C4, JPG=C8, DAC=CC 제외)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def probe_jpeg_size(file_bytes: Union[bytes, memoryview]) -> Optional[Tuple[int, int]]:
+    """JPEG 헤더(SOF)만 읽어서 (w, h) 반환. 디코드하지 않음. JPEG가 아니면 None"""
+    n = len(file_bytes)
+    if n < 4 or file_bytes[0] != 0xFF or file_bytes[1] != 0xD8:
+        return None
+
+    i = 2
+    while i + 9 < n:
+        if file_bytes[i] != 0xFF:
+            i += 1
+            continue
+        marker = file_bytes[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:  # 길이 없는 마커
+            i += 2
+            continue
+        seg_len = struct.unpack(">H", file_bytes[i + 2 : i + 4])[0]
+        if marker in _JPEG_SOF:
+            h, w = struct.unpack(">HH", file_bytes[i + 5 : i + 9])
+            return w, h
+        i += 2 + seg_len
+    return None
+
+
+def _reduce_factor(long_side: int, target_side: int) -> int:
+    """long_side / factor >= target_side 를 만족하는 가장 큰 factor(1, 2, 4, 8)"""
+    if target_side <= 0:
+        return 1
+    for f in (8, 4, 2):
+        if long_side // f >= target_side:
+            return f
+    return 1
+
+
+class DecodedImage:
+    """
+    업로드 원본 바이트 + 작업용 이미지.
+    - img: 탐지/품질용 (JPEG면 IMREAD_REDUCED_COLOR_2/4/8 로 DCT 단계에서 축소 디코드)
+    - full(): OCR ROI 용 원본 해상도. 필요할 때 한 번만 다시 디코드
+    """
+
+    def __init__(self, file_bytes: Union[bytes, memoryview], img: np.ndarray, factor: int = 1):
+        self.bytes = file_bytes
+        self.img = img
+        self.h, self.w = img.shape[:2]
+        self.factor = factor
+        self._full: Optional[np.ndarray] = img if factor == 1 else None
+
+    @property
+    def full_loaded(self) -> bool:
+        return self._full is not None
+
+    def full(self) -> np.ndarray:
+        if self._full is None:
+            self._full, _, _ = decode_image(self.bytes)
+        return self._full
+
+
+def decode_image_reduced(file_bytes: Union[bytes, memoryview], target_side: int) -> DecodedImage:
+    """
+    긴 변이 target_side 이상으로 남는 선에서 가장 작게 디코드.
+    JPEG가 아니거나(PNG 등) 축소할 필요가 없으면 원본 해상도로 디코드.
+    """
+    cv2 = _load_cv2()
+
+    size = probe_jpeg_size(file_bytes)
+    factor = _reduce_factor(max(size), target_side) if size else 1
+    if factor == 1:
+        img, _, _ = decode_image(file_bytes)
+        return DecodedImage(file_bytes, img, 1)
+
+    flag = getattr(cv2, f"IMREAD_REDUCED_COLOR_{factor}")
+    arr = np.frombuffer(file_bytes, np.uint8)
+    img = cv2.imdecode(arr, flag)
+    if img is None:
+        raise ValueError("INVALID_FILE")
+    return DecodedImage(file_bytes, img, factor)
+
+
 def clamp01(x: float) -> float:
     return max(0.0, min(1.0, float(x)))
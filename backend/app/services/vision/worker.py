@@ -0,0 +1,125 @@
+# backend/app/services/vision/worker.py
+"""
+독립 vision 워커 프로세스 (선택).
+torch/ultralytics, onnxruntime, Tesseract 를 이 프로세스에만 올리고,
+API 워커는 VISION_WORKER_SOCKET 으로 로컬 Unix 소켓을 통해 스캔을 요청한다 (remote.py).
+
+실행 (backend/ 에서):
+    python -m app.services.vision.worker [--socket /tmp/nozify-vision.sock] [--threads 2]
+
+요청 op:
+- scan    : 헤더 = run_scan 인자(guide_box, user_query, request_id, deadline_ms, started_at, debug), 페이로드 = 업로드 바이트
+- metrics : 이 프로세스의 vision 메트릭 시리즈 (process="worker" 라벨, 메트릭 이름별 줄 목록)
+- ping    : 헬스체크 (ready = 탐지 모델 준비 여부, 로드는 하지 않음)
+"""
+import argparse
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from app.core.config import VisionConfig
+from .errors import ScanError
+from .ipc import IPCClosed, recv_frame, send_frame
+from .logs import logger
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """연결 하나 = API 워커 스레드 하나. 연결을 유지한 채 요청/응답을 반복"""
+
+    def handle(self) -> None:
+        sock: socket.socket = self.request
+        while True:
+            try:
+                header, payload = recv_frame(sock)
+            except (IPCClosed, ConnectionError):
+                return
+            except ValueError as e:
+                logger.warning("[WORKER] bad frame: %s", e)
+                return
+            send_frame(sock, self.server.dispatch(header, payload))
+
+
+class VisionWorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, path: str, threads: int = 2):
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o660)
+        # 연결 수와 무관하게 동시에 파이프라인을 돌리는 스레드 수 제한
+        self._slots = threading.BoundedSemaphore(max(1, threads))
+
+    def dispatch(self, header, payload):
+        op = header.get("op")
+        if op == "scan":
+            return self._scan(header, payload)
+        if op == "metrics":
+            from .metrics import metric_samples
+            return {"ok": True, "samples": metric_samples("worker")}
+        if op == "ping":
+            from .remote import local_detector_ready
+            return {"ok": True, "pid": os.getpid(), "ready": bool(local_detector_ready())}
+        return {"ok": False, "status_code": 400, "code": "BAD_OP", "message": f"unknown op: {op}"}
+
+    def _scan(self, header, payload):
+        from .pipeline import run_scan
+
+        t_wait = time.perf_counter()
+        with self._slots:
+            worker_queue_ms = int((time.perf_counter() - t_wait) * 1000)
+            try:
+                result = run_scan(
+                    payload,
+                    header.get("guide_box"),
+                    header.get("user_query"),
+                    header.get("request_id"),
+                    header.get("deadline_ms"),
+                    header.get("started_at"),
+                    debug=bool(header.get("debug")),
+                )
+            except ScanError as e:
+                return {"ok": False, "status_code": e.status_code, "code": e.code, "message": e.message}
+            except Exception as e:
+                logger.exception("[WORKER] scan failed: %s", e)
+                return {"ok": False, "status_code": 500, "code": "SCAN_FAILED", "message": str(e)}
+        return {"ok": True, "result": result, "worker_queue_ms": worker_queue_ms}
+
+
+def _warmup() -> None:
+    """모델/사전을 첫 요청 전에 올려둠"""
+    from .detector import get_detector
+    from .matcher import _load_from_db
+
+    t = time.perf_counter()
+    ready = get_detector().ready()
+    try:
+        _load_from_db()
+    except Exception as e:
+        logger.warning("[WORKER] matcher warmup failed: %s", e)
+    logger.info("[WORKER] warmup done in %.1fs (detector ready=%s)", time.perf_counter() - t, ready)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Standalone vision worker (detect + OCR + match over a Unix socket)")
+    ap.add_argument("--socket", default=VisionConfig.WORKER_SOCKET or "/tmp/nozify-vision.sock")
+    ap.add_argument("--threads", type=int, default=VisionConfig.WORKER_THREADS, help="동시 스캔 수")
+    args = ap.parse_args(argv)
+
+    _warmup()
+    with VisionWorkerServer(args.socket, args.threads) as server:
+        logger.info("[WORKER] listening on %s (threads=%d, pid=%d)", args.socket, args.threads, os.getpid())
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(args.socket):
+                os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
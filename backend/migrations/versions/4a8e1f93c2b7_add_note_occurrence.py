@@ -0,0 +1,41 @@
+"""add note.occurrence and occurrence indexes
+
+Revision ID: 4a8e1f93c2b7
+Revises: e2b7c5d81f36
+Create Date: 2026-10-19 16:02:44.118930
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4a8e1f93c2b7'
+down_revision = 'e2b7c5d81f36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('note', sa.Column('occurrence', sa.Integer(), server_default='0', nullable=False))
+    # /catalog/notes, /catalog/accords, /catalog/filters/summary: ORDER BY occurrence DESC LIMIT k
+    op.create_index('ix_note_occurrence', 'note', ['occurrence'])
+    op.create_index('ix_accord_occurrence', 'accord', ['occurrence'])
+
+    # 현재 링크 기준 초기값 (이후 taxonomy 동기화가 증감, 어긋나면 backfill_taxonomy --counts-only)
+    op.execute(
+        "UPDATE accord a LEFT JOIN "
+        "(SELECT accord_id, COUNT(*) AS c FROM perfume_accord GROUP BY accord_id) x ON x.accord_id = a.id "
+        "SET a.occurrence = COALESCE(x.c, 0)"
+    )
+    op.execute(
+        "UPDATE note n LEFT JOIN "
+        "(SELECT note_id, COUNT(*) AS c FROM perfume_note GROUP BY note_id) x ON x.note_id = n.id "
+        "SET n.occurrence = COALESCE(x.c, 0)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_accord_occurrence', table_name='accord')
+    op.drop_index('ix_note_occurrence', table_name='note')
+    op.drop_column('note', 'occurrence')
@@ -0,0 +1,28 @@
+"""add ngram FULLTEXT indexes for catalog search
+
+Revision ID: 7c3e91b0a4d2
+Revises: add_purchase_history
+Create Date: 2026-10-19 10:12:41.203518
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7c3e91b0a4d2'
+down_revision = 'add_purchase_history'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CATALOG_SEARCH_BACKEND=fulltext 용. ngram 파서(ngram_token_size 기본 2)로 한글/부분 문자열 검색 지원
+    op.execute(
+        "ALTER TABLE perfume ADD FULLTEXT INDEX ft_perfume_name_brand (name, brand_name) WITH PARSER ngram"
+    )
+    op.execute("ALTER TABLE brand ADD FULLTEXT INDEX ft_brand_name (name) WITH PARSER ngram")
+
+
+def downgrade() -> None:
+    op.drop_index('ft_brand_name', table_name='brand')
+    op.drop_index('ft_perfume_name_brand', table_name='perfume')
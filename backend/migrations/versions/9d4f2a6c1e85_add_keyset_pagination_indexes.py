@@ -0,0 +1,42 @@
+"""add composite indexes for keyset pagination
+
+Revision ID: 9d4f2a6c1e85
+Revises: 7c3e91b0a4d2
+Create Date: 2026-10-19 14:03:27.518204
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '9d4f2a6c1e85'
+down_revision = '7c3e91b0a4d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 커서 비교 (view_count, wish_count, id) < (...) 는 NULL 이면 항상 거짓 → 기존 NULL 카운터를 0 으로
+    op.execute(
+        "UPDATE perfume SET view_count = COALESCE(view_count, 0), "
+        "wish_count = COALESCE(wish_count, 0), purchase_count = COALESCE(purchase_count, 0) "
+        "WHERE view_count IS NULL OR wish_count IS NULL OR purchase_count IS NULL"
+    )
+    op.execute("UPDATE perfume SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+
+    # ORDER BY 와 같은 컬럼 순서 (MySQL 8 은 DESC 정렬에 역방향 인덱스 스캔 사용)
+    op.create_index('ix_perfume_popular', 'perfume', ['view_count', 'wish_count', 'id'])
+    op.create_index('ix_perfume_recent', 'perfume', ['created_at', 'id'])
+    op.create_index('ix_perfume_brand_popular', 'perfume', ['brand_id', 'view_count', 'wish_count', 'id'])
+    op.create_index('ix_perfume_brand_recent', 'perfume', ['brand_id', 'created_at', 'id'])
+    op.create_index('ix_wishlist_user_created', 'wishlist', ['user_id', 'created_at', 'id'])
+    op.create_index('ix_purchase_user_created', 'purchase_history', ['user_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_purchase_user_created', table_name='purchase_history')
+    op.drop_index('ix_wishlist_user_created', table_name='wishlist')
+    op.drop_index('ix_perfume_brand_recent', table_name='perfume')
+    op.drop_index('ix_perfume_brand_popular', table_name='perfume')
+    op.drop_index('ix_perfume_recent', table_name='perfume')
+    op.drop_index('ix_perfume_popular', table_name='perfume')
@@ -0,0 +1,36 @@
+"""add perfume_neighbor table
+
+Revision ID: b61d0e47a9f2
+Revises: 4a8e1f93c2b7
+Create Date: 2026-10-19 16:48:13.905512
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b61d0e47a9f2'
+down_revision = '4a8e1f93c2b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 채우기: python -m app.scripts.build_perfume_neighbors
+    op.create_table('perfume_neighbor',
+    sa.Column('perfume_id', sa.BINARY(length=16), nullable=False),
+    sa.Column('rank', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('neighbor_id', sa.BINARY(length=16), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['perfume_id'], ['perfume.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['neighbor_id'], ['perfume.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('perfume_id', 'rank')
+    )
+    op.create_index(op.f('ix_perfume_neighbor_neighbor_id'), 'perfume_neighbor', ['neighbor_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_perfume_neighbor_neighbor_id'), table_name='perfume_neighbor')
+    op.drop_table('perfume_neighbor')
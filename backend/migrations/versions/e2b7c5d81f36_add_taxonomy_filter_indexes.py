@@ -0,0 +1,37 @@
+"""add taxonomy filter indexes and general note role
+
+Revision ID: e2b7c5d81f36
+Revises: 9d4f2a6c1e85
+Create Date: 2026-10-19 15:21:09.642177
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7c5d81f36'
+down_revision = '9d4f2a6c1e85'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # general_notes 도 perfume_note 에 넣기 위한 역할 추가
+    op.execute(
+        "ALTER TABLE perfume_note MODIFY role ENUM('top','middle','base','general') NOT NULL"
+    )
+    # 필터는 이름 → id → (id, perfume_id) 범위 조회. 기존 유니크 키는 perfume_id 가 앞이라 못 씀
+    op.create_index('ix_perfume_accord_accord_perfume', 'perfume_accord', ['accord_id', 'perfume_id'])
+    op.create_index('ix_perfume_note_note_perfume', 'perfume_note', ['note_id', 'perfume_id'])
+    # 데이터 채우기: python -m app.scripts.backfill_taxonomy
+
+
+def downgrade() -> None:
+    op.drop_index('ix_perfume_note_note_perfume', table_name='perfume_note')
+    # accord_id FK 가 쓸 인덱스를 먼저 만들어야 복합 인덱스를 지울 수 있음
+    op.create_index('ix_perfume_accord_accord_id', 'perfume_accord', ['accord_id'])
+    op.drop_index('ix_perfume_accord_accord_perfume', table_name='perfume_accord')
+    op.execute("DELETE FROM perfume_note WHERE role = 'general'")
+    op.execute(
+        "ALTER TABLE perfume_note MODIFY role ENUM('top','middle','base') NOT NULL"
+    )